@@ -18,15 +18,27 @@ def create_app():
     env = os.getenv('FLASK_ENV', 'development')
     app.config.from_object(config[env])
     
+    # Fast JSON encoding
+    from .json_provider import init_json
+    init_json(app)
+    
     # Configure CORS
     CORS(app, origins=[app.config['CORS_ORIGIN']], supports_credentials=True)
     
+    # Request and SQL metrics; registered first so sizes are measured after compression
+    from .metrics import init_metrics
+    init_metrics(app)
+    from .profiling import init_profiling
+    init_profiling(app)
+    
     # Initialize compression
     from flask_compress import Compress
     Compress(app)
     
     # Initialize database and oauth
     init_db(app)
+    from .replicas import init_replicas
+    init_replicas(app)
     from .extensions import oauth
     oauth.init_app(app)
     
@@ -35,6 +47,10 @@ def create_app():
     from .auth import auth
     app.register_blueprint(auth)
     
+    # `flask --app app migrate`
+    from .migrate import migrate_command
+    app.cli.add_command(migrate_command)
+    
     return app
 
 
@@ -2,6 +2,8 @@ from flask import Blueprint, url_for, session, redirect, jsonify, current_app, r
 from .extensions import oauth
 from .models import User
 from .database import db
+from .users import get_user_dict, invalidate_user
+from .replicas import read_replica
 
 auth = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -51,6 +53,7 @@ def callback():
             user.avatar_url = user_info.get('picture', user.avatar_url)
         
         db.session.commit()
+        invalidate_user(user.id)
         
         # Set session
         session['user_id'] = user.id
@@ -67,17 +70,18 @@ def logout():
     return jsonify({'message': 'Logged out successfully'})
 
 @auth.route('/me')
+@read_replica
 def me():
     user_id = session.get('user_id')
     if not user_id:
         return jsonify({'authenticated': False}), 200
         
-    user = User.query.get(user_id)
+    user = get_user_dict(user_id)
     if not user:
         session.pop('user_id', None)
         return jsonify({'authenticated': False}), 200
         
     return jsonify({
         'authenticated': True,
-        'user': user.to_dict()
+        'user': user
     })
@@ -0,0 +1,82 @@
+from datetime import datetime
+from sqlalchemy import delete, insert, literal, select, update
+
+from .database import db
+from .models import JobApplication, ApplicationStatusEvent, DeletedApplication
+from .stats import invalidate_stats
+from .documents import DOC_TYPES, release_slot, collect_blobs_later
+from .events import publish_change
+
+
+def _owned(user_id, ids):
+    """WHERE clause restricting a statement to the user's own rows among `ids`."""
+    return (JobApplication.user_id == user_id) & JobApplication.id.in_(ids)
+
+
+def batch_update(user_id, ids, values):
+    """Apply `values` to the user's applications in `ids` in one transaction.
+
+    Returns the ids that were updated; ids the user does not own are skipped.
+    """
+    now = datetime.utcnow()
+
+    if 'status' in values:
+        # Record transitions set-wise from the pre-update statuses
+        changed = select(
+            JobApplication.id, JobApplication.user_id, JobApplication.status,
+            literal(values['status']), literal(now)
+        ).where(_owned(user_id, ids), JobApplication.status != values['status'])
+        db.session.execute(insert(ApplicationStatusEvent).from_select(
+            ['application_id', 'user_id', 'from_status', 'to_status', 'occurred_at'], changed
+        ))
+
+    updated = db.session.execute(
+        update(JobApplication)
+        .where(_owned(user_id, ids))
+        .values(updated_at=now, **values)
+        .returning(JobApplication.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    invalidate_stats(user_id)
+    publish_change(user_id, 'updated', updated)
+    db.session.commit()
+    return updated
+
+
+def batch_delete(user_id, ids):
+    """Delete the user's applications in `ids` in one transaction.
+
+    Returns the deleted ids; released files are queued for removal.
+    """
+    deleted = db.session.execute(
+        delete(JobApplication)
+        .where(_owned(user_id, ids))
+        .returning(
+            JobApplication.id,
+            JobApplication.resume_document_id, JobApplication.resume_path,
+            JobApplication.cover_letter_document_id, JobApplication.cover_letter_path
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    # Release document references; blobs reaching zero are returned for cleanup
+    paths = []
+    for row in deleted:
+        for doc_type in DOC_TYPES:
+            paths += release_slot(row._mapping[f'{doc_type}_document_id'], row._mapping[f'{doc_type}_path'])
+
+    deleted_ids = [row.id for row in deleted]
+    if deleted_ids:
+        # Tombstones for delta sync; merge-by-id semantics as in delete_application
+        db.session.execute(delete(DeletedApplication).where(DeletedApplication.id.in_(deleted_ids)))
+        now = datetime.utcnow()
+        db.session.execute(insert(DeletedApplication), [
+            {'id': app_id, 'user_id': user_id, 'deleted_at': now} for app_id in deleted_ids
+        ])
+
+    collect_blobs_later(paths)
+    invalidate_stats(user_id)
+    publish_change(user_id, 'deleted', deleted_ids)
+    db.session.commit()
+    return deleted_ids
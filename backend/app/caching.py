@@ -0,0 +1,65 @@
+import hashlib
+from flask import request, current_app
+from sqlalchemy import func
+
+from .database import db
+from .models import JobApplication, DeletedApplication
+
+
+def _digest(*parts):
+    """Hash the given parts into a short hex validator."""
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def collection_validators(user_id, variant=''):
+    """Return (etag, last_modified) for a user's applications from one aggregate query.
+
+    `variant` distinguishes representations of the same data, e.g. the query string.
+    Last-Modified covers the latest tombstone too, since a delete leaves every
+    remaining row's updated_at unchanged.
+    """
+    max_deleted = db.session.query(func.max(DeletedApplication.deleted_at)).filter(
+        DeletedApplication.user_id == user_id
+    ).scalar_subquery()
+    max_updated, count, max_id, deleted_at = db.session.query(
+        func.max(JobApplication.updated_at),
+        func.count(JobApplication.id),
+        func.max(JobApplication.id),
+        max_deleted
+    ).filter(JobApplication.user_id == user_id).one()
+    last_modified = max(filter(None, (max_updated, deleted_at)), default=None)
+    return _digest(user_id, max_updated, count, max_id, deleted_at, variant), last_modified
+
+
+def row_validators(app_id, updated_at, variant=''):
+    """Return (etag, last_modified) for a single application."""
+    return _digest(app_id, updated_at, variant), updated_at
+
+
+def is_not_modified(etag, last_modified):
+    """Check the request's conditional headers against the current validators."""
+    if request.if_none_match:
+        # Flask-Compress suffixes the tag with ":gzip"/":br"; compare the base value
+        tags = {tag.split(':', 1)[0] for tag in request.if_none_match.as_set()}
+        return etag in tags or request.if_none_match.star_tag
+    if request.if_modified_since and last_modified:
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def not_modified_response(etag, last_modified):
+    """Build an empty 304 response carrying the validators."""
+    response = current_app.response_class(status=304)
+    return with_validators(response, etag, last_modified)
+
+
+def with_validators(response, etag, last_modified):
+    """Attach ETag/Last-Modified and require revalidation on every use."""
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -21,10 +21,64 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         f"postgresql://{os.environ.get('POSTGRES_USER')}:{os.environ.get('POSTGRES_PASSWORD')}@{os.environ.get('POSTGRES_HOST')}:{os.environ.get('POSTGRES_PORT')}/{os.environ.get('POSTGRES_DB')}"
     
+    # Connection pool, per worker process. With gthread, DB_POOL_SIZE should cover
+    # GUNICORN_THREADS; with gevent, requests beyond the pool wait up to
+    # DB_POOL_TIMEOUT for a connection instead of opening more.
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', os.environ.get('GUNICORN_THREADS', 8)))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 4))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10)) # Seconds
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800)) # Seconds
+    DB_STATEMENT_TIMEOUT = int(os.environ.get('DB_STATEMENT_TIMEOUT', 15000)) # Milliseconds, 0 disables
+    DB_LOCK_TIMEOUT = int(os.environ.get('DB_LOCK_TIMEOUT', 5000)) # Milliseconds, 0 disables
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_recycle': DB_POOL_RECYCLE,
+    }
+    if SQLALCHEMY_DATABASE_URI.startswith('postgresql'):
+        SQLALCHEMY_ENGINE_OPTIONS.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            connect_args={
+                'options': f'-c statement_timeout={DB_STATEMENT_TIMEOUT} -c lock_timeout={DB_LOCK_TIMEOUT}'
+            },
+        )
+    
+    # Optional read replica for GET handlers marked @read_replica (see replicas.py);
+    # a user's reads stay on the primary for REPLICA_STICKY_SECONDS after they write
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL', '')
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+    
     # File Uploads
     UPLOAD_FOLDER = os.environ.get('UPLOAD_DIR', '/app/uploads')
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_UPLOAD_SIZE', 10 * 1024 * 1024)) # Default 10MB
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
+    # Internal nginx location mapped to UPLOAD_FOLDER; when set, downloads are
+    # handed to nginx with X-Accel-Redirect instead of streamed by a worker
+    DOWNLOAD_ACCEL_PREFIX = os.environ.get('DOWNLOAD_ACCEL_PREFIX', '')
+    
+    # Resumable uploads
+    UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 1024 * 1024)) # Default 1MB
+    UPLOAD_SESSION_TTL_HOURS = int(os.environ.get('UPLOAD_SESSION_TTL_HOURS', 24))
+    
+    # Background tasks (see app/worker.py)
+    TASK_MAX_ATTEMPTS = int(os.environ.get('TASK_MAX_ATTEMPTS', 5))
+    TASK_RETRY_DELAY = int(os.environ.get('TASK_RETRY_DELAY', 10)) # Seconds, doubled per attempt
+    WORKER_POLL_INTERVAL = float(os.environ.get('WORKER_POLL_INTERVAL', 2)) # Seconds
+    ORPHAN_SWEEP_INTERVAL = int(os.environ.get('ORPHAN_SWEEP_INTERVAL', 3600)) # Seconds
+    ORPHAN_GRACE_PERIOD = int(os.environ.get('ORPHAN_GRACE_PERIOD', 3600)) # Seconds
+    
+    # Document text extraction (runs in the worker)
+    EXTRACT_PROCESSES = int(os.environ.get('EXTRACT_PROCESSES', 2))
+    EXTRACT_TIMEOUT = int(os.environ.get('EXTRACT_TIMEOUT', 120)) # Seconds per document
+    
+    # Bulk import
+    IMPORT_MAX_SIZE = int(os.environ.get('IMPORT_MAX_SIZE', 100 * 1024 * 1024)) # Default 100MB
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+    
+    # Delta sync: tombstones older than this are pruned and force a full reload
+    SYNC_TOMBSTONE_TTL_DAYS = int(os.environ.get('SYNC_TOMBSTONE_TTL_DAYS', 30))
     
     # Google OAuth
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
@@ -37,6 +91,39 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = FLASK_ENV == 'development'
     
+    # Per-request profiling (app/profiling.py); disabled while PROFILE_DIR is empty
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', '')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0)) # Fraction of requests, e.g. 0.01
+    PROFILE_ADMIN_EMAILS = {
+        email.strip().lower() for email in os.environ.get('PROFILE_ADMIN_EMAILS', '').split(',') if email.strip()
+    }
+    
+    # Server-Sent Events change feed (/api/events)
+    # Long-lived streams need gevent workers; gunicorn.conf.py sets SERVER_WORKER_CLASS,
+    # which is unset under the (threaded) development server
+    EVENTS_ENABLED = os.environ.get(
+        'EVENTS_ENABLED', '1' if os.environ.get('SERVER_WORKER_CLASS', 'gevent') == 'gevent' else '0'
+    ) == '1'
+    EVENTS_HEARTBEAT_SECONDS = int(os.environ.get('EVENTS_HEARTBEAT_SECONDS', 20))
+    EVENTS_MAX_SECONDS = int(os.environ.get('EVENTS_MAX_SECONDS', 600)) # Stream lifetime before the client reconnects
+    EVENTS_RETRY_SECONDS = int(os.environ.get('EVENTS_RETRY_SECONDS', 5))
+    
+    # Per-worker cache of /api/auth/me profiles
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60)) # Seconds; 0 disables
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    
+    # JSON encoding: "orjson" (falls back to "default" if not installed) or "default"
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+    
+    # Compression: Flask-Compress buffers a whole streamed body before compressing,
+    # which would defeat streaming exports
+    COMPRESS_STREAMS = False
+    # Preferred encodings in order of preference; see scripts/bench_json.py for level trade-offs
+    COMPRESS_ALGORITHM = [a.strip() for a in os.environ.get('COMPRESS_ALGORITHM', 'br,gzip').split(',') if a.strip()]
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL', 4))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6)) # gzip
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024)) # Bytes
+    
     # CORS
     CORS_ORIGIN = os.getenv('BACKEND_CORS_ORIGIN', 'http://localhost:8080')
 
@@ -1,13 +1,47 @@
+from flask import g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+# Bind key of the optional read replica (see replicas.py)
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """Session sending a request's reads to the replica when replicas.read_replica allowed it.
+
+    Flushes and INSERT/UPDATE/DELETE statements always use the primary and are
+    noted on `g`, so the user's next requests can read their own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or isinstance(clause, UpdateBase):
+                g.wrote_primary = True
+            elif g.get('use_replica'):
+                replica = self._db.engines.get(REPLICA_BIND)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
 
 # Initialize SQLAlchemy instance
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+def dialect_insert():
+    """INSERT construct for the bound dialect, supporting ON CONFLICT clauses."""
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
 
 
 def init_db(app):
-    """Initialize database with Flask app."""
+    """Initialize database with Flask app.
+
+    The schema is managed by app.migrate, run once per deploy rather than on
+    every worker boot.
+    """
     db.init_app(app)
-    
-    with app.app_context():
-        # Create all tables
-        db.create_all()
@@ -0,0 +1,253 @@
+import hashlib
+import os
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import quote
+from flask import current_app
+from sqlalchemy import case, delete, func, or_, text, update
+
+from .database import db, dialect_insert
+from .models import Document, JobApplication
+from .tasks import enqueue, handler
+from .extraction import needs_extraction
+
+# Bytes read per iteration when streaming an upload to disk
+CHUNK_SIZE = 64 * 1024
+
+# Column prefix on JobApplication for each document type
+DOC_TYPES = ('resume', 'cover_letter')
+
+# First key of the per-blob advisory locks; negative so it never equals a user id
+# used as the first key by duplicates.lock_fingerprint
+BLOB_LOCK_NAMESPACE = -1
+
+
+def blob_path(sha256):
+    """Sharded on-disk location of a blob: blobs/ab/cd/abcd..."""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'blobs', sha256[:2], sha256[2:4], sha256)
+
+
+def temp_dir():
+    """Scratch directory on the same filesystem as the blobs, so renames are atomic."""
+    path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'tmp')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def lock_blob(sha256):
+    """Serialize use and removal of one blob for the rest of the transaction (PostgreSQL only).
+
+    Placing a blob and upserting its row happen under this lock, and so do
+    collect_blobs' check for the row and its unlink, so a blob is never
+    removed under a row that is about to commit.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(
+            text('SELECT pg_advisory_xact_lock(:namespace, hashtext(:sha256))'),
+            {'namespace': BLOB_LOCK_NAMESPACE, 'sha256': sha256}
+        )
+
+
+def commit_blob(temp_path, sha256):
+    """Move a fully written temp file into the blob store; return the blob path.
+
+    Takes the blob's lock; the caller acquires the document in the same transaction.
+    """
+    lock_blob(sha256)
+    path = blob_path(sha256)
+    if os.path.exists(path):
+        # Identical content is already stored
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+    return path
+
+
+def store_stream(stream):
+    """Stream a file to the blob store while hashing it; return (sha256, size, path)."""
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=temp_dir())
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    sha256 = digest.hexdigest()
+    return sha256, size, commit_blob(temp_path, sha256)
+
+
+def acquire_document(sha256, size, path):
+    """Add one reference to the document for `sha256`, creating it if needed."""
+    lock_blob(sha256)
+    statement = dialect_insert()(Document).values(
+        sha256=sha256, size=size, path=path, ref_count=1
+    ).on_conflict_do_update(
+        index_elements=['sha256'],
+        set_={'ref_count': Document.ref_count + 1}
+    ).returning(Document.id)
+    document_id = db.session.execute(statement).scalar_one()
+    if needs_extraction(sha256):
+        enqueue('extract_text', sha256=sha256)
+    return db.session.get(Document, document_id, populate_existing=True)
+
+
+def reference_document(document):
+    """Add one reference to an existing document."""
+    db.session.execute(
+        update(Document).where(Document.id == document.id)
+        .values(ref_count=Document.ref_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_document(document_id):
+    """Drop one reference; delete the row at zero and return its blob path for cleanup."""
+    row = db.session.execute(
+        update(Document).where(Document.id == document_id)
+        .values(ref_count=Document.ref_count - 1)
+        .returning(Document.ref_count, Document.path)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row and row.ref_count <= 0:
+        db.session.execute(
+            delete(Document).where(Document.id == document_id, Document.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+        return row.path
+    return None
+
+
+@handler('collect_blobs')
+def collect_blobs(paths):
+    """Remove released blobs, unless re-created by a concurrent upload."""
+    # Sorted so two collections of overlapping paths take the locks in the same order
+    for path in sorted(paths):
+        # Blob files are named by their hash
+        lock_blob(os.path.basename(path))
+        if db.session.query(Document.id).filter_by(path=path).first():
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def collect_blobs_later(paths):
+    """Queue released files for removal once the current transaction commits."""
+    if paths:
+        enqueue('collect_blobs', paths=paths)
+
+
+def sweep_blobs(grace_seconds):
+    """Remove blobs and scratch files left behind by crashed requests.
+
+    Only files older than `grace_seconds` are considered, so a blob written by
+    an upload whose document row is not committed yet is left alone.
+    """
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    for dirpath, _, filenames in os.walk(os.path.join(current_app.config['UPLOAD_FOLDER'], 'blobs')):
+        candidates = {
+            os.path.join(dirpath, name) for name in filenames
+            if os.path.getmtime(os.path.join(dirpath, name)) < cutoff
+        }
+        if not candidates:
+            continue
+        known = {row.path for row in db.session.query(Document.path).filter(Document.path.in_(candidates))}
+        for path in candidates - known:
+            os.remove(path)
+            removed += 1
+
+    # Partial resumable uploads are expired with their sessions instead
+    with os.scandir(temp_dir()) as entries:
+        for entry in entries:
+            if not entry.name.startswith('upload-') and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+
+def attach_document(application, doc_type, document, filename):
+    """Point an application's document slot at `document`.
+
+    The caller must already hold a reference for the new document. Returns the
+    file paths to clean up after commit: a released blob, or a legacy file that
+    predates the document store.
+    """
+    old_id = getattr(application, f'{doc_type}_document_id')
+    old_path = getattr(application, f'{doc_type}_path')
+
+    setattr(application, f'{doc_type}_document_id', document.id if document else None)
+    setattr(application, f'{doc_type}_path', document.path if document else None)
+    setattr(application, f'{doc_type}_filename', filename)
+    # Invalidates the row's ETag and includes it in delta syncs
+    application.updated_at = datetime.utcnow()
+    return release_slot(old_id, old_path)
+
+
+def release_slot(document_id, path):
+    """Release whatever an application slot referenced; return paths to clean up."""
+    if document_id:
+        released = release_document(document_id)
+        return [released] if released else []
+    return [path] if path else []
+
+
+def accel_redirect_uri(path):
+    """Internal nginx URI serving `path`, or None if offloading is off or the file is outside UPLOAD_FOLDER."""
+    prefix = current_app.config['DOWNLOAD_ACCEL_PREFIX']
+    if not prefix:
+        return None
+    relative = os.path.relpath(os.path.realpath(path), os.path.realpath(current_app.config['UPLOAD_FOLDER']))
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return None
+    return prefix.rstrip('/') + '/' + quote(relative.replace(os.sep, '/'))
+
+
+def find_user_document(user_id, sha256):
+    """Return (document, filename) for `sha256` if one of the user's applications uses it.
+
+    `filename` is the name of the user's most recent attachment of the document.
+    """
+    is_resume = JobApplication.resume_document_id == Document.id
+    filename = case((is_resume, JobApplication.resume_filename), else_=JobApplication.cover_letter_filename)
+    return db.session.query(Document, filename).join(
+        JobApplication,
+        or_(is_resume, JobApplication.cover_letter_document_id == Document.id)
+    ).filter(
+        Document.sha256 == sha256,
+        JobApplication.user_id == user_id
+    ).order_by(JobApplication.updated_at.desc()).first()
+
+
+def list_user_documents(user_id):
+    """The user's distinct documents, most recently used first."""
+    is_resume = JobApplication.resume_document_id == Document.id
+    filename = func.max(case((is_resume, JobApplication.resume_filename), else_=JobApplication.cover_letter_filename))
+    doc_type = func.max(case((is_resume, 'resume'), else_='cover_letter'))
+    last_used = func.max(JobApplication.updated_at)
+    rows = db.session.query(
+        Document, filename, doc_type, last_used, func.count(JobApplication.id)
+    ).join(
+        JobApplication,
+        or_(is_resume, JobApplication.cover_letter_document_id == Document.id)
+    ).filter(
+        JobApplication.user_id == user_id
+    ).group_by(Document.id).order_by(last_used.desc()).all()
+
+    documents = []
+    for document, name, kind, used_at, count in rows:
+        item = document.to_dict()
+        item.update(filename=name, doc_type=kind, last_used=used_at.isoformat(), applications=count)
+        documents.append(item)
+    return documents
@@ -0,0 +1,171 @@
+"""Duplicate application detection.
+
+Every application stores a normalized "company | position" fingerprint. Exact
+fingerprint matches back upserts through the (user_id, fingerprint) index. On
+PostgreSQL, likely duplicates are found by trigram similarity through a GIN
+index on (user_id, fingerprint), so each row's candidates come from an index
+probe rather than a comparison with every other row. Other databases fall back
+to exact matches.
+"""
+import re
+import unicodedata
+from sqlalchemy import DDL, and_, bindparam, event, func, literal, text, update
+from sqlalchemy.orm import aliased
+
+from .database import db
+from .models import JobApplication
+from .tasks import enqueue, handler
+
+# Per-user trigram index; mirrors migrations/v13_add_fingerprints.sql for fresh databases
+FINGERPRINT_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    """CREATE INDEX IF NOT EXISTS ix_job_applications_user_fingerprint_trgm
+        ON job_applications USING GIN (user_id, fingerprint gin_trgm_ops)""",
+]
+
+for statement in FINGERPRINT_DDL:
+    event.listen(JobApplication.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+# Legal-form suffixes that do not distinguish companies
+COMPANY_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'bv', 'nv', 'pty', 'srl'
+}
+
+# Common title abbreviations, expanded so "Sr. SWE" matches "Senior Software Engineer"
+POSITION_ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'eng': 'engineer', 'engr': 'engineer',
+    'dev': 'developer', 'mgr': 'manager', 'swe': 'software engineer', 'sde': 'software engineer',
+    'sre': 'site reliability engineer', 'pm': 'product manager', 'ml': 'machine learning',
+}
+
+DEFAULT_THRESHOLD = 0.6
+
+# Candidate pairs considered per report, best scores first
+MAX_PAIRS = 1000
+
+# Rows fingerprinted per backfill task
+BACKFILL_BATCH = 5000
+
+
+def _words(value):
+    """Lowercase words of `value` with accents and punctuation removed."""
+    decomposed = unicodedata.normalize('NFKD', (value or '').casefold())
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return re.findall(r'[^\W_]+', stripped)
+
+
+def fingerprint(company_name, position_title):
+    """Normalized duplicate key for a company and position."""
+    company = _words(company_name)
+    company = [word for word in company if word not in COMPANY_SUFFIXES] or company
+    position = [POSITION_ABBREVIATIONS.get(word, word) for word in _words(position_title)]
+    return f"{' '.join(company)} | {' '.join(position)}"[:400]
+
+
+def lock_fingerprint(user_id, key):
+    """Serialize upserts of one key for the rest of the transaction (PostgreSQL only)."""
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(
+            text('SELECT pg_advisory_xact_lock(:user_id, hashtext(:key))'),
+            {'user_id': user_id, 'key': key}
+        )
+
+
+def find_exact(user_id, key):
+    """The user's most recently updated application with fingerprint `key`, or None."""
+    return JobApplication.query.filter_by(user_id=user_id, fingerprint=key).order_by(
+        JobApplication.updated_at.desc(), JobApplication.id.desc()
+    ).first()
+
+
+def _group(pairs):
+    """Merge (id, id, score) pairs into groups of ids, best-scoring groups first."""
+    parent = {}
+
+    def root(node):
+        while parent.setdefault(node, node) != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for left, right, _ in pairs:
+        parent[root(right)] = root(left)
+
+    groups = {}
+    for left, _, score in pairs:
+        group = groups.setdefault(root(left), {'score': 0.0, 'ids': set()})
+        group['score'] = max(group['score'], float(score))
+    for node in parent:
+        groups[root(node)]['ids'].add(node)
+    return sorted(
+        ({'score': round(group['score'], 3), 'ids': sorted(group['ids'])} for group in groups.values()),
+        key=lambda group: (-group['score'], group['ids'][0])
+    )
+
+
+def find_duplicates(user_id, threshold=DEFAULT_THRESHOLD, app_id=None):
+    """Groups of the user's likely duplicate applications as [{'score', 'ids'}].
+
+    With `app_id`, only applications resembling that one are returned (as one
+    group including it). Returns None if `app_id` is not the user's.
+    """
+    trigram = db.engine.dialect.name == 'postgresql'
+    if trigram:
+        # `%` uses the GIN index with this threshold
+        db.session.execute(
+            text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+            {'threshold': str(threshold)}
+        )
+
+    candidate = aliased(JobApplication)
+    if app_id is not None:
+        key = db.session.query(JobApplication.fingerprint).filter_by(id=app_id, user_id=user_id).first()
+        if key is None:
+            return None
+        if key.fingerprint is None:
+            return []
+        if trigram:
+            match = candidate.fingerprint.op('%')(key.fingerprint)
+            score = func.similarity(candidate.fingerprint, key.fingerprint)
+        else:
+            match = candidate.fingerprint == key.fingerprint
+            score = literal(1.0)
+        rows = db.session.query(candidate.id, score.label('score')).filter(
+            candidate.user_id == user_id, candidate.id != app_id, match
+        ).order_by(score.desc(), candidate.id).limit(MAX_PAIRS).all()
+        return _group([(app_id, row.id, row.score) for row in rows])
+
+    application = aliased(JobApplication)
+    if trigram:
+        match = candidate.fingerprint.op('%')(application.fingerprint)
+        score = func.similarity(application.fingerprint, candidate.fingerprint)
+    else:
+        match = candidate.fingerprint == application.fingerprint
+        score = literal(1.0)
+    pairs = db.session.query(application.id, candidate.id, score.label('score')).join(
+        candidate, and_(candidate.user_id == application.user_id, candidate.id > application.id, match)
+    ).filter(
+        application.user_id == user_id
+    ).order_by(score.desc(), application.id, candidate.id).limit(MAX_PAIRS).all()
+    return _group(pairs)
+
+
+@handler('backfill_fingerprints')
+def backfill_fingerprints():
+    """Fingerprint a batch of applications that predate the column; re-enqueue until done."""
+    rows = db.session.query(
+        JobApplication.id, JobApplication.company_name, JobApplication.position_title
+    ).filter(JobApplication.fingerprint.is_(None)).order_by(JobApplication.id).limit(BACKFILL_BATCH).all()
+    if rows:
+        table = JobApplication.__table__
+        # Keep updated_at: a backfill is not a change clients need to sync
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('row_id')).values(
+                fingerprint=bindparam('key'), updated_at=table.c.updated_at
+            ),
+            [{'row_id': row.id, 'key': fingerprint(row.company_name, row.position_title)} for row in rows]
+        )
+    if len(rows) == BACKFILL_BATCH:
+        enqueue('backfill_fingerprints')
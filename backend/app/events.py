@@ -0,0 +1,162 @@
+"""Per-user change events for the Server-Sent Events feed.
+
+Mutations call publish_change() inside their transaction. On PostgreSQL this
+is a NOTIFY, which is delivered only if the transaction commits; one LISTEN
+connection per worker process fans notifications out to that process's open
+streams, so an event reaches every gunicorn worker. Elsewhere (SQLite in
+development) events are delivered in-process after commit.
+
+Events only say what changed; clients fetch the rows with the delta sync
+endpoint. A `reset` event means events may have been missed.
+"""
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections import defaultdict
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from .database import db
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'application_changes'
+
+# NOTIFY payloads are limited to 8000 bytes; larger changes are sent without ids
+MAX_EVENT_IDS = 500
+
+# Undelivered events per stream before it is told to resync instead
+STREAM_BUFFER = 100
+
+_subscribers = defaultdict(set)  # user_id -> {queue.Queue}
+_lock = threading.Lock()
+_listener = None
+
+
+def publish_change(user_id, action, ids):
+    """Announce that `ids` were 'created', 'updated' or 'deleted'; call before commit."""
+    ids = list(ids)
+    if not ids:
+        return
+    payload = {'user_id': user_id, 'type': action, 'ids': ids if len(ids) <= MAX_EVENT_IDS else None}
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(
+            text('SELECT pg_notify(:channel, :payload)'),
+            {'channel': CHANNEL, 'payload': json.dumps(payload)}
+        )
+    else:
+        db.session.info.setdefault('pending_events', []).append(payload)
+
+
+@event.listens_for(Session, 'after_commit')
+def _deliver_pending(session):
+    for payload in session.info.pop('pending_events', []):
+        _deliver(payload)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop('pending_events', None)
+
+
+def _put(stream, payload):
+    try:
+        stream.put_nowait(payload)
+    except queue.Full:
+        # A stalled client: drop what it has not read and make it resync
+        while not stream.empty():
+            stream.get_nowait()
+        stream.put_nowait({'type': 'reset'})
+
+
+def _deliver(payload):
+    with _lock:
+        for stream in _subscribers.get(payload['user_id'], ()):
+            _put(stream, payload)
+
+
+def _broadcast_reset():
+    with _lock:
+        for streams in _subscribers.values():
+            for stream in streams:
+                _put(stream, {'type': 'reset'})
+
+
+def _listen(engine, reconnect_delay):
+    """Relay NOTIFY payloads to local streams, reconnecting on failure."""
+    connected_before = False
+    while True:
+        connection = None
+        try:
+            connection = engine.raw_connection()
+            connection.detach()  # Held for the life of the process, outside the pool
+            dbapi_connection = connection.driver_connection
+            dbapi_connection.rollback()
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL}')
+            if connected_before:
+                # Notifications sent while disconnected were lost
+                _broadcast_reset()
+            connected_before = True
+
+            while True:
+                if select.select([dbapi_connection], [], [], 60) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    _deliver(json.loads(dbapi_connection.notifies.pop(0).payload))
+        except Exception:
+            logger.exception('Change listener failed; reconnecting')
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+        time.sleep(reconnect_delay)
+
+
+def _ensure_listener(engine, reconnect_delay):
+    global _listener
+    if engine.dialect.name != 'postgresql':
+        return
+    with _lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(
+                target=_listen, args=(engine, reconnect_delay), name='change-listener', daemon=True
+            )
+            _listener.start()
+
+
+def stream_events(engine, user_id, heartbeat, max_seconds, retry):
+    """Yield Server-Sent Events for `user_id` for up to `max_seconds`.
+
+    The first event, `ready`, tells the client to catch up with a delta sync;
+    comments are sent every `heartbeat` seconds so proxies keep the connection
+    open and dead clients are noticed. The browser reconnects `retry` seconds
+    after the stream ends, which re-checks the session.
+    """
+    _ensure_listener(engine, retry)
+    stream = queue.Queue(maxsize=STREAM_BUFFER)
+    with _lock:
+        _subscribers[user_id].add(stream)
+    try:
+        yield f'retry: {retry * 1000}\nevent: ready\ndata: {{}}\n\n'
+        deadline = time.monotonic() + max_seconds
+        while time.monotonic() < deadline:
+            try:
+                payload = stream.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            data = {key: value for key, value in payload.items() if key != 'user_id'}
+            yield f"event: {payload['type']}\ndata: {json.dumps(data)}\n\n"
+    finally:
+        with _lock:
+            _subscribers[user_id].discard(stream)
+            if not _subscribers[user_id]:
+                del _subscribers[user_id]
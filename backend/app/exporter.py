@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+# Buffered output is flushed to the client once it exceeds this many characters
+FLUSH_SIZE = 64 * 1024
+
+# Exported columns match the import format, so an export can be re-imported
+EXPORT_FIELDS = (
+    'id', 'company_name', 'position_title', 'location', 'job_type', 'job_level',
+    'application_date', 'status', 'job_description', 'notes', 'created_at', 'updated_at'
+)
+DOCUMENT_FIELDS = ('resume_filename', 'cover_letter_filename')
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def export_fields(include_documents):
+    """Columns included in an export."""
+    return EXPORT_FIELDS + DOCUMENT_FIELDS if include_documents else EXPORT_FIELDS
+
+
+def stream_rows(query):
+    """Iterate a query through a server-side cursor, EXPORT_BATCH_SIZE rows at a time."""
+    return query.yield_per(EXPORT_BATCH_SIZE)
+
+
+def generate_export(query, fmt, fields):
+    """Yield the export body in chunks; only one buffer of rows is held at a time."""
+    buffer = io.StringIO()
+    writer = None
+    if fmt == 'csv':
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        # Send the header before running the query so the response starts at once
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    for application in stream_rows(query):
+        row = application.to_dict(fields)
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row) + '\n')
+
+        if buffer.tell() >= FLUSH_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
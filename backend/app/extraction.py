@@ -0,0 +1,123 @@
+import atexit
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from sqlalchemy import delete
+
+from .database import db, dialect_insert
+from .models import Document, DocumentText
+from .tasks import handler
+
+# Stored text is capped; longer documents are truncated
+MAX_TEXT_LENGTH = 1_000_000
+
+# Leading bytes identifying each supported format; .docx is a zip container
+SIGNATURES = {
+    b'%PDF': 'pdf',
+    b'PK\x03\x04': 'docx',
+}
+
+_pool = None
+
+
+def detect_format(path):
+    """Sniff the file format from its content; None for unsupported files (e.g. legacy .doc)."""
+    with open(path, 'rb') as f:
+        head = f.read(8)
+    for signature, fmt in SIGNATURES.items():
+        if head.startswith(signature):
+            return fmt
+    return None
+
+
+def _pdf_text(path):
+    from pypdf import PdfReader
+    return '\n'.join(page.extract_text() or '' for page in PdfReader(path).pages)
+
+
+def _docx_text(path):
+    import docx
+    return '\n'.join(paragraph.text for paragraph in docx.Document(path).paragraphs)
+
+
+def extract_file(path):
+    """Return (status, text) for a file. Runs in a pool process.
+
+    Parse errors are a property of the content, so they are reported as a
+    'failed' result to be cached; a missing parser library raises instead.
+    """
+    fmt = detect_format(path)
+    if fmt is None:
+        return 'unsupported', ''
+    parse = _pdf_text if fmt == 'pdf' else _docx_text
+    try:
+        text = parse(path)
+    except ImportError:
+        raise
+    except Exception:
+        return 'failed', ''
+    return 'extracted', text[:MAX_TEXT_LENGTH]
+
+
+def get_pool():
+    """Process pool for CPU-bound parsing, created on first use in the worker."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=current_app.config['EXTRACT_PROCESSES'])
+        atexit.register(_pool.shutdown)
+    return _pool
+
+
+def reset_pool():
+    """Kill the pool's processes, including any stuck parse; get_pool() starts a new one."""
+    global _pool
+    if _pool is None:
+        return
+    pool, _pool = _pool, None
+    atexit.unregister(pool.shutdown)
+    # The executor has no public way to stop a running call
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+def needs_extraction(sha256):
+    """Whether text for this content hash has not been extracted yet."""
+    return db.session.get(DocumentText, sha256) is None
+
+
+@handler('extract_text')
+def extract_document_text(sha256):
+    """Extract and store the text of the document with `sha256`, unless already cached."""
+    if not needs_extraction(sha256):
+        return
+    document = Document.query.filter_by(sha256=sha256).first()
+    if document is None:
+        # Released before the worker got to it
+        return
+
+    try:
+        status, text = get_pool().submit(extract_file, document.path).result(
+            timeout=current_app.config['EXTRACT_TIMEOUT']
+        )
+    except TimeoutError:
+        # The parse keeps running after the wait ends; retrying would only stall
+        # another process on the same file, so the timeout is cached like a failure
+        reset_pool()
+        status, text = 'timeout', ''
+    db.session.execute(
+        dialect_insert()(DocumentText)
+        .values(sha256=sha256, status=status, content=text)
+        .on_conflict_do_nothing()
+    )
+
+
+def prune_texts(grace_seconds):
+    """Drop cached text whose document is gone, once older than `grace_seconds`."""
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    return db.session.execute(
+        delete(DocumentText).where(
+            DocumentText.extracted_at < cutoff,
+            ~db.session.query(Document.id).filter(Document.sha256 == DocumentText.sha256).exists()
+        ).execution_options(synchronize_session=False)
+    ).rowcount
@@ -0,0 +1,66 @@
+from datetime import datetime
+from sqlalchemy import func
+
+from .database import db
+from .models import ApplicationStatusEvent
+from .stats import days_between, events_with_end
+
+
+def record_status_change(application, from_status):
+    """Append a status event for `application`; call before the mutating commit."""
+    if from_status == application.status:
+        return
+    db.session.add(ApplicationStatusEvent(
+        application=application,
+        user_id=application.user_id,
+        from_status=from_status,
+        to_status=application.status
+    ))
+
+
+def get_timeline(application_id):
+    """Return an application's transitions, each with the days spent in that stage."""
+    now = datetime.utcnow()
+    events = events_with_end(ApplicationStatusEvent.application_id == application_id)
+    ended_at = func.coalesce(events.c.ended_at, now)
+    rows = db.session.query(
+        events, days_between(events.c.occurred_at, ended_at).label('days')
+    ).order_by(events.c.occurred_at, events.c.id).all()
+    return [
+        {
+            'id': row.id,
+            'from_status': row.from_status,
+            'to_status': row.to_status,
+            'occurred_at': row.occurred_at.isoformat(),
+            'ended_at': row.ended_at.isoformat() if row.ended_at else None,
+            'days': round(float(row.days or 0), 2)
+        }
+        for row in rows
+    ]
+
+
+def stage_durations(user_id):
+    """Average, max and count of days spent in each status across a user's applications.
+
+    `completed` counts stages that have been left; open stages run until now.
+    """
+    now = datetime.utcnow()
+    events = events_with_end(ApplicationStatusEvent.user_id == user_id)
+    days = days_between(events.c.occurred_at, func.coalesce(events.c.ended_at, now))
+    rows = db.session.query(
+        events.c.to_status,
+        func.avg(days),
+        func.max(days),
+        func.count(),
+        func.count(events.c.ended_at)
+    ).group_by(events.c.to_status).all()
+    return [
+        {
+            'status': status,
+            'avg_days': round(float(avg_days or 0), 2),
+            'max_days': round(float(max_days or 0), 2),
+            'count': count,
+            'completed': completed
+        }
+        for status, avg_days, max_days, count, completed in rows
+    ]
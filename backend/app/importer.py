@@ -0,0 +1,157 @@
+import codecs
+import csv
+import io
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import insert
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from .database import db
+from .models import JobApplication, ApplicationStatusEvent
+from .stats import invalidate_stats
+from .events import publish_change
+from .validation import application_values
+
+# Per-row errors kept in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportStreamError(Exception):
+    """The body could not be read past `row`; rows before it were imported.
+
+    `report` is set to the partial report once earlier rows have been saved.
+    """
+
+    def __init__(self, row, error, status=400):
+        super().__init__(error)
+        self.row = row
+        self.error = error
+        self.status = status
+        self.report = None
+
+
+@contextmanager
+def _reading(number):
+    """Turn a failure to read row `number` from the body into ImportStreamError."""
+    try:
+        yield
+    except RequestEntityTooLarge:
+        raise ImportStreamError(number, 'Import file too large', 413)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportStreamError(number, str(e))
+
+
+def _read(rows, first):
+    """Yield (row_number, row) for rows numbered from `first`."""
+    iterator = iter(rows)
+    number = first
+    while True:
+        with _reading(number):
+            row = next(iterator, None)
+        if row is None:
+            return
+        yield number, row
+        number += 1
+
+
+def _lines(stream):
+    """Decode the body line by line, so a bad byte fails the row it is in."""
+    # utf-8-sig drops the byte order mark Excel writes at the start of CSV files
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    for line in io.BufferedReader(stream):
+        yield decoder.decode(line)
+    decoder.decode(b'', final=True)
+
+
+def iter_records(stream, fmt):
+    """Yield (row_number, record) pairs from a CSV or NDJSON byte stream.
+
+    `record` is a dict, or a ValueError when the row itself cannot be parsed.
+    Rows are read one at a time so memory stays flat regardless of body size.
+    A body that cannot be decoded raises ImportStreamError naming the row.
+    """
+    text = _lines(stream)
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        # Row 1 is the header, read on first access
+        with _reading(1):
+            reader.fieldnames
+        for number, row in _read(reader, 2):
+            # Blank cells are treated as missing so defaults apply
+            yield number, {key: value for key, value in row.items() if key and value not in (None, '')}
+    elif fmt == 'ndjson':
+        for number, line in _read(text, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, ValueError(f'Invalid JSON: {e.msg}')
+    else:
+        raise ValueError('format must be csv or ndjson')
+
+
+def _flush(user_id, batch):
+    """Insert one batch plus its initial status events in a single transaction."""
+    now = datetime.utcnow()
+    for values in batch:
+        values.update(user_id=user_id, created_at=now, updated_at=now)
+    inserted = db.session.execute(
+        insert(JobApplication).returning(JobApplication.id, JobApplication.status),
+        batch
+    ).all()
+    db.session.execute(insert(ApplicationStatusEvent), [
+        {'application_id': app_id, 'user_id': user_id, 'from_status': None,
+         'to_status': status, 'occurred_at': now}
+        for app_id, status in inserted
+    ])
+    invalidate_stats(user_id)
+    publish_change(user_id, 'created', [app_id for app_id, _ in inserted])
+    db.session.commit()
+
+
+def _add_record(user_id, report, batch, batch_size, number, record):
+    """Validate one record into `batch`, flushing when full; return the pending batch."""
+    try:
+        if isinstance(record, ValueError):
+            raise record
+        batch.append(application_values(record))
+    except ValueError as e:
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': number, 'error': str(e)})
+        else:
+            report['errors_truncated'] = True
+        return batch
+
+    if len(batch) >= batch_size:
+        _flush(user_id, batch)
+        report['imported'] += len(batch)
+        batch = []
+    return batch
+
+
+def import_applications(user_id, records, batch_size):
+    """Validate and insert records in batches; return the per-row report.
+
+    If the body breaks off (ImportStreamError), the rows read before it are
+    still saved and the partial report is attached to the re-raised error.
+    """
+    report = {'imported': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+    batch = []
+
+    try:
+        for number, record in records:
+            batch = _add_record(user_id, report, batch, batch_size, number, record)
+    except ImportStreamError as e:
+        if batch:
+            _flush(user_id, batch)
+            report['imported'] += len(batch)
+        e.report = report
+        raise
+
+    if batch:
+        _flush(user_id, batch)
+        report['imported'] += len(batch)
+    return report
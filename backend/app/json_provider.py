@@ -0,0 +1,53 @@
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """Standard library encoder that writes dates as ISO 8601, matching to_dict()."""
+
+    def default(self, o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return super().default(o)
+
+
+class OrjsonProvider(IsoJSONProvider):
+    """orjson-backed provider; dates and datetimes are encoded natively as ISO 8601."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Options such as indent or sort_keys are only supported by the stdlib path
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Skip the str round trip: orjson produces the UTF-8 body directly
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+PROVIDERS = {
+    'default': IsoJSONProvider,
+    'orjson': OrjsonProvider,
+}
+
+
+def init_json(app):
+    """Install the JSON provider named by JSON_PROVIDER, falling back if orjson is missing."""
+    name = app.config['JSON_PROVIDER']
+    if name not in PROVIDERS:
+        raise ValueError(f"JSON_PROVIDER must be one of: {', '.join(PROVIDERS)}")
+    if name == 'orjson' and orjson is None:
+        name = 'default'
+    app.json = PROVIDERS[name](app)
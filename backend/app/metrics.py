@@ -0,0 +1,91 @@
+"""Prometheus metrics for requests, SQL queries and document transfer.
+
+Under gunicorn, PROMETHEUS_MULTIPROC_DIR (set in gunicorn.conf.py) makes every
+worker write its samples to a shared directory, and /api/metrics aggregates
+them; otherwise the in-process registry is served.
+"""
+import os
+import time
+from flask import g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency', ['method', 'endpoint', 'status']
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Response body size (when known)', ['endpoint'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+)
+QUERIES_PER_REQUEST = Histogram(
+    'http_request_sql_queries', 'SQL statements executed per request', ['endpoint'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+SQL_DURATION = Histogram(
+    'sql_query_duration_seconds', 'SQL statement latency', ['endpoint'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+DOCUMENT_BYTES = Counter(
+    'document_transfer_bytes', 'Document bytes uploaded or downloaded', ['direction']
+)
+
+
+def endpoint_label():
+    """The matched URL rule, keeping label cardinality bounded."""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+
+def record_document_bytes(direction, size):
+    """Count document bytes; `direction` is 'upload' or 'download'."""
+    if size:
+        DOCUMENT_BYTES.labels(direction).inc(size)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    if has_request_context() and 'sql_queries' in g:
+        g.sql_queries += 1
+        g.sql_seconds += elapsed
+        SQL_DURATION.labels(endpoint_label()).observe(elapsed)
+
+
+def init_metrics(app):
+    """Time every request; register before Compress so sizes are as sent."""
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+        g.sql_queries = 0
+        g.sql_seconds = 0.0
+
+    @app.after_request
+    def record_request(response):
+        if 'request_started' not in g:
+            return response
+        endpoint = endpoint_label()
+        REQUEST_LATENCY.labels(request.method, endpoint, response.status_code).observe(
+            time.perf_counter() - g.request_started
+        )
+        QUERIES_PER_REQUEST.labels(endpoint).observe(g.sql_queries)
+        if response.content_length is not None:
+            RESPONSE_SIZE.labels(endpoint).observe(response.content_length)
+        return response
+
+
+def render_metrics():
+    """Return (body, content type) in Prometheus text format."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,123 @@
+"""Versioned schema migrations.
+
+Applies backend/migrations/vN_*.sql in order and records each in the
+schema_version table. Runs once per deploy: from gunicorn's on_starting hook
+before workers fork, from the task worker, or with `flask --app app migrate`.
+A PostgreSQL advisory lock serialises concurrent runners.
+"""
+import logging
+import os
+import re
+from datetime import datetime
+import click
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
+
+from .database import db
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_ID = 4_173_021
+
+# Per-connection limits set from config.py that migrations must not run under
+TIMEOUT_SETTINGS = ('statement_timeout', 'lock_timeout')
+
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('name', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+def available_migrations():
+    """(version, name, path) for every migration file, in version order."""
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = re.fullmatch(r'v(\d+)_(\w+)\.sql', filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return sorted(migrations)
+
+
+def _stamp(conn, migrations):
+    if migrations:
+        conn.execute(schema_version.insert(), [
+            {'version': version, 'name': name, 'applied_at': datetime.utcnow()}
+            for version, name, _ in migrations
+        ])
+
+
+def _apply(conn, migration):
+    """Run one migration file and record it, in a single transaction."""
+    version, name, path = migration
+    with open(path) as f:
+        sql = f.read()
+    logger.info('Applying migration v%s_%s', version, name)
+    with conn.begin():
+        # The raw cursor runs the whole multi-statement script without parameter parsing
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+        _stamp(conn, [migration])
+
+
+def run_migrations():
+    """Bring the database schema up to date; return the versions applied.
+
+    A fresh database gets the current models via create_all and every
+    migration is recorded as applied; PostgreSQL-only columns and indexes
+    the models cannot express come from after_create hooks. A database
+    created before schema_version existed gets every migration replayed
+    (they are idempotent). Otherwise only pending migrations run. Migration
+    SQL is PostgreSQL-specific, so other databases only get create_all.
+
+    The request timeouts from DB_STATEMENT_TIMEOUT/DB_LOCK_TIMEOUT are lifted
+    on the migration connection: table rewrites, index builds and waiting for
+    another runner's lock can all take longer.
+    """
+    migrations = available_migrations()
+    is_postgres = db.engine.dialect.name == 'postgresql'
+
+    with db.engine.connect() as conn:
+        if is_postgres:
+            for setting in TIMEOUT_SETTINGS:
+                conn.exec_driver_sql(f'SET {setting} = 0')
+            conn.exec_driver_sql(f'SELECT pg_advisory_lock({MIGRATION_LOCK_ID})')
+            conn.commit()
+        try:
+            tables = set(inspect(conn).get_table_names())
+            schema_version.create(conn, checkfirst=True)
+            applied = set(conn.execute(select(schema_version.c.version)).scalars())
+
+            if not is_postgres or 'job_applications' not in tables:
+                db.metadata.create_all(conn)
+                pending = [m for m in migrations if m[0] not in applied]
+                _stamp(conn, pending)
+                conn.commit()
+                return [version for version, _, _ in pending]
+
+            pending = [m for m in migrations if m[0] not in applied]
+            conn.commit()
+            for migration in pending:
+                _apply(conn, migration)
+            return [version for version, _, _ in pending]
+        finally:
+            if is_postgres:
+                conn.rollback()
+                conn.exec_driver_sql(f'SELECT pg_advisory_unlock({MIGRATION_LOCK_ID})')
+                # Back to the connect options before the connection returns to the pool
+                for setting in TIMEOUT_SETTINGS:
+                    conn.exec_driver_sql(f'RESET {setting}')
+                conn.commit()
+
+
+@click.command('migrate')
+def migrate_command():
+    """Apply pending database migrations."""
+    applied = run_migrations()
+    click.echo(f"Applied migrations: {', '.join(map(str, applied))}" if applied else 'Schema is up to date')
@@ -12,6 +12,8 @@ class User(db.Model):
     name = db.Column(db.String(100), nullable=False)
     avatar_url = db.Column(db.String(500))
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Bumped by every write that changes the user's pipeline stats (see stats.py)
+    stats_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationship
     applications = db.relationship('JobApplication', backref='user', lazy=True)
@@ -25,10 +27,52 @@ class User(db.Model):
         }
 
 
+class Document(db.Model):
+    """Content-addressed file blob, shared by every application that attaches it."""
+    
+    __tablename__ = 'documents'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    path = db.Column(db.String(500), nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)  # Application attachments
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'sha256': self.sha256,
+            'size': self.size,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+
+class DocumentText(db.Model):
+    """Plain text extracted from a document, cached by content hash."""
+    
+    __tablename__ = 'document_texts'
+    
+    sha256 = db.Column(db.String(64), primary_key=True)
+    status = db.Column(db.String(20), nullable=False) # extracted | unsupported | failed | timeout
+    content = db.Column(db.Text, nullable=False, default='')
+    extracted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
 class JobApplication(db.Model):
     """Job Application model."""
     
     __tablename__ = 'job_applications'
+    __table_args__ = (
+        # Composite indexes backing keyset pagination on (sort column, id)
+        db.Index('ix_job_applications_user_date_id', 'user_id', 'application_date', 'id'),
+        db.Index('ix_job_applications_user_status_date_id', 'user_id', 'status', 'application_date', 'id'),
+        db.Index('ix_job_applications_user_updated_id', 'user_id', 'updated_at', 'id'),
+        db.Index('ix_job_applications_user_company_id', 'user_id', 'company_name', 'id'),
+        db.Index('ix_job_applications_user_fingerprint', 'user_id', 'fingerprint'),
+        db.Index('ix_job_applications_resume_document', 'resume_document_id'),
+        db.Index('ix_job_applications_cover_letter_document', 'cover_letter_document_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True) # Nullable for transition
@@ -41,37 +85,147 @@ class JobApplication(db.Model):
     status = db.Column(db.String(50), nullable=False, default='Applied')
     job_description = db.Column(db.Text)
     notes = db.Column(db.Text)
+    # Normalized "company | position" key for duplicate detection (see duplicates.py)
+    fingerprint = db.Column(db.String(400))
     
     # File Uploads (Phase 2)
     resume_path = db.Column(db.String(500))
     resume_filename = db.Column(db.String(200))
     cover_letter_path = db.Column(db.String(500))
     cover_letter_filename = db.Column(db.String(200))
+    resume_document_id = db.Column(db.Integer, db.ForeignKey('documents.id'), nullable=True)
+    cover_letter_document_id = db.Column(db.Integer, db.ForeignKey('documents.id'), nullable=True)
 
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Serializable columns, in response order
+    FIELDS = (
+        'id', 'user_id', 'company_name', 'position_title', 'location',
+        'job_type', 'job_level', 'application_date', 'status',
+        'job_description', 'notes', 'resume_path', 'resume_filename',
+        'cover_letter_path', 'cover_letter_filename', 'created_at', 'updated_at'
+    )
+
+    # Compact representation for list views; skips the unbounded Text columns
+    SUMMARY_FIELDS = (
+        'id', 'company_name', 'position_title', 'location', 'job_type',
+        'job_level', 'application_date', 'status', 'resume_filename',
+        'cover_letter_filename', 'updated_at'
+    )
+    
+    def to_dict(self, fields=None):
+        """Convert model instance to dictionary, limited to `fields` if given."""
+        data = {}
+        for name in fields or self.FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            data[name] = value
+        return data
+    
+    def __repr__(self):
+        return f'<JobApplication {self.id}: {self.position_title} at {self.company_name}>'
+
+
+class DeletedApplication(db.Model):
+    """Tombstone recorded when a job application is deleted, for delta sync."""
+    
+    __tablename__ = 'deleted_applications'
+    __table_args__ = (
+        db.Index('ix_deleted_applications_user_deleted_at', 'user_id', 'deleted_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # The deleted application's id
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class UserStatsCache(db.Model):
+    """Materialized pipeline summary per user; deleted whenever their applications change."""
+    
+    __tablename__ = 'user_stats_cache'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    payload = db.Column(db.JSON, nullable=False)
+    version = db.Column(db.Integer, nullable=True)  # User.stats_version the payload was computed at
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class ApplicationStatusEvent(db.Model):
+    """Append-only record of a job application's status transitions."""
+    
+    __tablename__ = 'application_status_events'
+    __table_args__ = (
+        db.Index('ix_application_status_events_user_occurred', 'user_id', 'occurred_at'),
+        db.Index('ix_application_status_events_application', 'application_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('job_applications.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    from_status = db.Column(db.String(50), nullable=True)  # None for the initial status
+    to_status = db.Column(db.String(50), nullable=False)
+    occurred_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # One-way so deleting an application leaves event cleanup to ON DELETE CASCADE
+    application = db.relationship('JobApplication')
+    
     def to_dict(self):
-        """Convert model instance to dictionary."""
         return {
             'id': self.id,
-            'user_id': self.user_id,
-            'company_name': self.company_name,
-            'position_title': self.position_title,
-            'location': self.location,
-            'job_type': self.job_type,
-            'job_level': self.job_level,
-            'application_date': self.application_date.isoformat() if self.application_date else None,
-            'status': self.status,
-            'job_description': self.job_description,
-            'notes': self.notes,
-            'resume_path': self.resume_path,
-            'resume_filename': self.resume_filename,
-            'cover_letter_path': self.cover_letter_path,
-            'cover_letter_filename': self.cover_letter_filename,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'application_id': self.application_id,
+            'from_status': self.from_status,
+            'to_status': self.to_status,
+            'occurred_at': self.occurred_at.isoformat() if self.occurred_at else None
         }
+
+
+class UploadSession(db.Model):
+    """In-progress resumable upload of a document for an application."""
+    
+    __tablename__ = 'upload_sessions'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    application_id = db.Column(db.Integer, db.ForeignKey('job_applications.id', ondelete='CASCADE'), nullable=False)
+    doc_type = db.Column(db.String(20), nullable=False)
+    filename = db.Column(db.String(200), nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    chunk_size = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    @property
+    def chunk_count(self):
+        return max(1, -(-self.size // self.chunk_size))
+
+
+class UploadChunk(db.Model):
+    """A chunk received for an upload session."""
+    
+    __tablename__ = 'upload_chunks'
+    
+    upload_id = db.Column(db.String(32), db.ForeignKey('upload_sessions.id', ondelete='CASCADE'), primary_key=True)
+    chunk_index = db.Column(db.Integer, primary_key=True, autoincrement=False)
+
+
+class Task(db.Model):
+    """Durable background job, claimed by workers with FOR UPDATE SKIP LOCKED."""
+    
+    __tablename__ = 'tasks'
+    __table_args__ = (
+        db.Index('ix_tasks_status_run_at', 'status', 'run_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default='pending') # pending | failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     def __repr__(self):
-        return f'<JobApplication {self.id}: {self.position_title} at {self.company_name}>'
+        return f'<Task {self.id}: {self.kind} ({self.status})>'
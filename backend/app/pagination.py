@@ -0,0 +1,147 @@
+import base64
+import json
+from datetime import datetime, date
+
+from sqlalchemy import DDL, event, func, tuple_
+
+from .models import JobApplication
+
+# Expression index for the company prefix filter; mirrors migrations/v4_add_list_indexes.sql
+# for fresh databases, which get the plain indexes from the model
+COMPANY_PREFIX_DDL = DDL(
+    'CREATE INDEX IF NOT EXISTS ix_job_applications_user_company_prefix '
+    'ON job_applications (user_id, lower(company_name) text_pattern_ops)'
+)
+
+event.listen(JobApplication.__table__, 'after_create', COMPANY_PREFIX_DDL.execute_if(dialect='postgresql'))
+
+# Default and maximum page sizes for list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Sortable columns; every sort is keyset-paginated on (column, id)
+SORT_COLUMNS = {
+    'application_date': JobApplication.application_date,
+    'updated_at': JobApplication.updated_at,
+    'company_name': JobApplication.company_name,
+}
+
+
+def parse_date(value, name):
+    """Parse a YYYY-MM-DD query parameter."""
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        raise ValueError(f'Invalid {name}. Use YYYY-MM-DD')
+
+
+def apply_filters(query, args):
+    """Apply the server-side list filters from the query string."""
+    status = args.get('status')
+    if status:
+        query = query.filter(JobApplication.status.in_(status.split(',')))
+
+    job_type = args.get('job_type')
+    if job_type:
+        query = query.filter(JobApplication.job_type.in_(job_type.split(',')))
+
+    job_level = args.get('job_level')
+    if job_level:
+        query = query.filter(JobApplication.job_level.in_(job_level.split(',')))
+
+    if args.get('date_from'):
+        query = query.filter(JobApplication.application_date >= parse_date(args['date_from'], 'date_from'))
+    if args.get('date_to'):
+        query = query.filter(JobApplication.application_date <= parse_date(args['date_to'], 'date_to'))
+
+    company = args.get('company')
+    if company:
+        # Escape LIKE wildcards so the prefix is matched literally
+        prefix = company.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query = query.filter(
+            func.lower(JobApplication.company_name).like(prefix + '%', escape='\\')
+        )
+
+    return query
+
+
+def parse_sort(args):
+    """Return (column_name, descending) from ?sort=, e.g. '-application_date'."""
+    sort = args.get('sort', '-application_date')
+    descending = sort.startswith('-')
+    name = sort.lstrip('-+')
+    if name not in SORT_COLUMNS:
+        raise ValueError(f"Invalid sort. Use one of: {', '.join(SORT_COLUMNS)}")
+    return name, descending
+
+
+def parse_limit(args):
+    """Return the requested page size, clamped to MAX_PAGE_SIZE."""
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def parse_offset(args):
+    """Return the ?offset= row offset for ranked (non-keyset) result lists."""
+    try:
+        offset = int(args.get('offset', 0))
+    except ValueError:
+        raise ValueError('offset must be an integer')
+    return max(0, offset)
+
+
+def encode_cursor(sort_name, row):
+    """Encode the keyset position of the last row on a page."""
+    value = getattr(row, sort_name)
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    raw = json.dumps([sort_name, value, row.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort_name):
+    """Decode a cursor produced by encode_cursor for the given sort."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        name, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        if name != sort_name:
+            raise ValueError
+        if sort_name == 'application_date':
+            value = date.fromisoformat(value)
+        elif sort_name == 'updated_at':
+            value = datetime.fromisoformat(value)
+        return value, int(last_id)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def paginate(query, args):
+    """Return (rows, next_cursor) for one keyset page of the query."""
+    sort_name, descending = parse_sort(args)
+    limit = parse_limit(args)
+    column = SORT_COLUMNS[sort_name]
+
+    if args.get('cursor'):
+        value, last_id = decode_cursor(args['cursor'], sort_name)
+        # Row-value comparison lets PostgreSQL seek straight into the index
+        position = tuple_(column, JobApplication.id)
+        if descending:
+            query = query.filter(position < tuple_(value, last_id))
+        else:
+            query = query.filter(position > tuple_(value, last_id))
+
+    if descending:
+        query = query.order_by(column.desc(), JobApplication.id.desc())
+    else:
+        query = query.order_by(column.asc(), JobApplication.id.asc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort_name, rows[-1])
+    return rows, next_cursor
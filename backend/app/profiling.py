@@ -0,0 +1,108 @@
+"""Opt-in per-request cProfile profiling.
+
+A request is profiled when an admin (PROFILE_ADMIN_EMAILS) sends the
+`X-Profile: 1` header or `?profile=1`, or when it is picked by
+PROFILE_SAMPLE_RATE. Each profile is written to PROFILE_DIR as a .pstats file
+(open with snakeviz, or flameprof for a flamegraph) next to a .json file with
+the endpoint, status, duration and SQL timings.
+"""
+import cProfile
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from flask import g, request, session
+
+from .metrics import endpoint_label
+from .users import get_user_dict
+
+# cProfile allows one active profiler per process (Python 3.12+); concurrent
+# requests are simply not profiled
+_profiler_lock = threading.Lock()
+
+
+def _requested_by_admin(app):
+    if request.headers.get('X-Profile') != '1' and request.args.get('profile') != '1':
+        return False
+    admins = app.config['PROFILE_ADMIN_EMAILS']
+    user_id = session.get('user_id')
+    if not admins or not user_id:
+        return False
+    user = get_user_dict(user_id)
+    return user is not None and user['email'].lower() in admins
+
+
+def _should_profile(app):
+    rate = app.config['PROFILE_SAMPLE_RATE']
+    if rate and random.random() < rate:
+        return 'sampled'
+    if _requested_by_admin(app):
+        return 'requested'
+    return None
+
+
+def _write_profile(app, profiler, response, reason):
+    """Dump the profile and its metadata; return the file name stem."""
+    duration = time.perf_counter() - g.profile_started
+    endpoint = endpoint_label()
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', endpoint).strip('_') or 'root'
+    stem = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{request.method}-{slug}-{int(duration * 1000)}ms"
+
+    directory = app.config['PROFILE_DIR']
+    os.makedirs(directory, exist_ok=True)
+    profiler.dump_stats(os.path.join(directory, f'{stem}.pstats'))
+    with open(os.path.join(directory, f'{stem}.json'), 'w') as f:
+        json.dump({
+            'endpoint': endpoint,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'reason': reason,
+            'user_id': session.get('user_id'),
+            'duration_ms': round(duration * 1000, 3),
+            'sql_queries': g.get('sql_queries', 0) - g.profile_sql_queries,
+            'sql_ms': round((g.get('sql_seconds', 0.0) - g.profile_sql_seconds) * 1000, 3),
+            'pid': os.getpid(),
+        }, f, indent=2)
+    return stem
+
+
+def init_profiling(app):
+    """Register the profiling hooks; a no-op unless PROFILE_DIR is set."""
+    if not app.config['PROFILE_DIR']:
+        return
+
+    @app.before_request
+    def start_profile():
+        reason = _should_profile(app)
+        if not reason or not _profiler_lock.acquire(blocking=False):
+            return
+        g.profile_reason = reason
+        g.profile_started = time.perf_counter()
+        g.profile_sql_queries = g.get('sql_queries', 0)
+        g.profile_sql_seconds = g.get('sql_seconds', 0.0)
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+    @app.after_request
+    def finish_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        try:
+            response.headers['X-Profile-Id'] = _write_profile(app, profiler, response, g.profile_reason)
+        finally:
+            _profiler_lock.release()
+        return response
+
+    @app.teardown_request
+    def abandon_profile(exc):
+        # after_request is skipped when a view raises
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
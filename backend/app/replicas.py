@@ -0,0 +1,51 @@
+"""Read-replica routing with read-your-writes stickiness.
+
+With DATABASE_REPLICA_URL set, GET handlers decorated with @read_replica read
+from the replica bind; everything else, and every write, uses the primary.
+After a request writes to the primary, the user's session records a deadline
+REPLICA_STICKY_SECONDS ahead, and until then their reads stay on the primary
+so they see their own changes despite replication lag.
+"""
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, session
+from sqlalchemy import text
+
+from .database import db, REPLICA_BIND
+
+# Flask session key holding the time (epoch seconds) until which reads use the primary
+STICKY_KEY = 'read_primary_until'
+
+
+def read_replica(f):
+    """Let a read-only handler use the replica unless the user wrote recently."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.use_replica = session.get(STICKY_KEY, 0) <= time.time()
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def replica_horizon():
+    """UTC time up to which the replica serving this request has replayed commits.
+
+    None when reads come from the primary, or the replica is not a PostgreSQL
+    standby (e.g. a SQLite stand-in).
+    """
+    if not has_request_context() or not g.get('use_replica') or REPLICA_BIND not in db.engines:
+        return None
+    if db.engines[REPLICA_BIND].dialect.name != 'postgresql':
+        return None
+    return db.session.execute(
+        text("SELECT pg_last_xact_replay_timestamp() AT TIME ZONE 'utc'")
+    ).scalar()
+
+
+def init_replicas(app):
+    """Record read-your-writes deadlines after requests that wrote to the primary."""
+
+    @app.after_request
+    def stick_to_primary(response):
+        if g.get('wrote_primary') and 'user_id' in session:
+            session[STICKY_KEY] = time.time() + current_app.config['REPLICA_STICKY_SECONDS']
+        return response
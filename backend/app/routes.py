@@ -1,11 +1,35 @@
-from flask import Blueprint, request, jsonify, session, current_app, send_file
-from datetime import datetime, date
+from flask import Blueprint, request, jsonify, session, current_app, send_file, Response, stream_with_context
+from datetime import datetime, date, timedelta
 from functools import wraps
 from werkzeug.utils import secure_filename
+from werkzeug.wsgi import get_input_stream
+from werkzeug.exceptions import RequestEntityTooLarge, RequestedRangeNotSatisfiable
+from urllib.parse import quote
+from sqlalchemy.orm import load_only
+import mimetypes
 import os
 
 from .database import db
-from .models import JobApplication
+from .models import JobApplication, DeletedApplication, Document, UploadSession
+from .pagination import apply_filters, paginate, parse_sort, parse_limit, parse_offset
+from .caching import collection_validators, row_validators, is_not_modified, not_modified_response, with_validators
+from .sync import new_sync_token, changes_window_start
+from .search import apply_search
+from .stats import get_stats, invalidate_stats
+from .history import record_status_change, get_timeline, stage_durations
+from .validation import application_values, batch_ids, batch_patch_values
+from .batch import batch_update, batch_delete
+from .documents import (
+    DOC_TYPES, store_stream, acquire_document, reference_document, attach_document,
+    release_slot, collect_blobs_later, find_user_document, list_user_documents, accel_redirect_uri
+)
+from .importer import ImportStreamError, iter_records, import_applications
+from .exporter import export_fields, generate_export, MIMETYPES
+from .metrics import record_document_bytes, render_metrics
+from .events import publish_change, stream_events
+from .replicas import read_replica
+from .duplicates import DEFAULT_THRESHOLD, fingerprint, lock_fingerprint, find_exact, find_duplicates
+from .uploads import create_upload, write_chunk, received_chunks, finalize_upload, abort_upload
 
 # Create blueprint for API routes
 api = Blueprint('api', __name__, url_prefix='/api')
@@ -18,6 +42,54 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def owned_application_query(app_id):
+    """Query for application `app_id`, scoped to the current user."""
+    return JobApplication.query.filter_by(id=app_id, user_id=session['user_id'])
+
+def get_owned_application(app_id):
+    """The current user's application in one query; None if missing or someone else's."""
+    return owned_application_query(app_id).first()
+
+def parse_fields(args):
+    """Resolve ?fields=a,b or ?view=summary into column names (None means all)."""
+    if args.get('fields'):
+        fields = [f.strip() for f in args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in JobApplication.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+        return tuple(fields)
+    if args.get('view') == 'summary':
+        return JobApplication.SUMMARY_FIELDS
+    return None
+
+
+def project(query, fields, *extra):
+    """Defer every column not in `fields` (plus `extra`) at the SQL level."""
+    if fields is None:
+        return query
+    columns = set(fields) | set(extra)
+    return query.options(load_only(*[getattr(JobApplication, name) for name in columns]))
+
+
+def select_rows(query, fields, *extra):
+    """Select just the needed columns as plain rows, skipping ORM object construction.
+
+    Rows hold `fields` (all columns if None) followed by any `extra` columns;
+    row_dict() turns one into a response item. Dates are left for the JSON
+    provider to encode.
+    """
+    names = tuple(fields or JobApplication.FIELDS)
+    names += tuple(name for name in extra if name not in names)
+    return query.with_entities(*[getattr(JobApplication, name) for name in names])
+
+
+def row_dict(row, fields):
+    """Response item for a row from select_rows()."""
+    return dict(zip(fields or JobApplication.FIELDS, row))
+
+
 # --- Health Check (Public) ---
 
 @api.route('/health', methods=['GET'])
@@ -26,34 +98,212 @@ def health_check():
     return jsonify({'status': 'healthy', 'timestamp': datetime.utcnow().isoformat()}), 200
 
 
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics, aggregated across gunicorn workers."""
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
+
+
 # --- Application Routes (Protected) ---
 
 @api.route('/applications', methods=['GET'])
 @login_required
+@read_replica
 def get_applications():
-    """Get all job applications for the current user."""
+    """Get one keyset-paginated page of the current user's job applications."""
+    try:
+        user_id = session['user_id']
+        # Issued before reading so changes made mid-request are re-sent by the next sync
+        sync_token = new_sync_token()
+
+        # Answer unchanged polls from a single aggregate query
+        etag, last_modified = collection_validators(user_id, request.query_string.decode())
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        query = JobApplication.query.filter_by(user_id=user_id)
+        try:
+            fields = parse_fields(request.args)
+            # The sort column is needed to build the next cursor
+            sort_name, _ = parse_sort(request.args)
+            query = select_rows(apply_filters(query, request.args), fields, sort_name)
+            rows, next_cursor = paginate(query, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        response = jsonify({
+            'items': [row_dict(row, fields) for row in rows],
+            'next_cursor': next_cursor,
+            'sync_token': sync_token
+        })
+        return with_validators(response, etag, last_modified), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/applications/changes', methods=['GET'])
+@login_required
+@read_replica
+def get_application_changes():
+    """Get applications changed and ids deleted since a sync token."""
     try:
         user_id = session['user_id']
-        applications = JobApplication.query.filter_by(user_id=user_id).order_by(JobApplication.application_date.desc()).all()
-        return jsonify([app.to_dict() for app in applications]), 200
+        if not request.args.get('since'):
+            return jsonify({'error': 'since is required'}), 400
+        try:
+            fields = parse_fields(request.args)
+            since = changes_window_start(request.args['since'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        sync_token = new_sync_token()
+
+        # Tombstones past the retention window are gone; the client must reload
+        retention = timedelta(days=current_app.config['SYNC_TOMBSTONE_TTL_DAYS'])
+        if since < datetime.utcnow() - retention:
+            return jsonify({'reset': True, 'sync_token': sync_token}), 200
+
+        changed = select_rows(JobApplication.query, fields).filter(
+            JobApplication.user_id == user_id,
+            JobApplication.updated_at > since
+        ).order_by(JobApplication.updated_at, JobApplication.id).all()
+        deleted = db.session.query(DeletedApplication.id).filter(
+            DeletedApplication.user_id == user_id,
+            DeletedApplication.deleted_at > since
+        ).all()
+
+        return jsonify({
+            'reset': False,
+            'changed': [row_dict(row, fields) for row in changed],
+            'deleted': [row.id for row in deleted],
+            'sync_token': sync_token
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/applications/search', methods=['GET'])
+@login_required
+@read_replica
+def search_applications():
+    """Ranked full-text search over the current user's job applications."""
+    try:
+        q = request.args.get('q', '').strip()
+        if not q:
+            return jsonify({'error': 'q is required'}), 400
+        try:
+            # Results are summaries unless other fields are asked for
+            fields = parse_fields(request.args) or JobApplication.SUMMARY_FIELDS
+            limit = parse_limit(request.args)
+            offset = parse_offset(request.args)
+            query = apply_filters(JobApplication.query.filter_by(user_id=session['user_id']), request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        rows = apply_search(select_rows(query, fields), q).offset(offset).limit(limit + 1).all()
+        has_more = len(rows) > limit
+
+        items = []
+        for row in rows[:limit]:
+            item = row_dict(row, fields)
+            item['rank'] = round(float(row.rank), 4)
+            items.append(item)
+
+        return jsonify({
+            'items': items,
+            'next_offset': offset + limit if has_more else None
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/events', methods=['GET'])
+@login_required
+def application_events():
+    """Server-Sent Events stream of the current user's application changes."""
+    config = current_app.config
+    if not config['EVENTS_ENABLED']:
+        # EventSource does not reconnect after an error status; clients keep working without live updates
+        return jsonify({'error': 'Change feed is disabled on this server'}), 503
+    return Response(
+        stream_events(
+            db.engine, session['user_id'],
+            config['EVENTS_HEARTBEAT_SECONDS'], config['EVENTS_MAX_SECONDS'], config['EVENTS_RETRY_SECONDS']
+        ),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@api.route('/applications/duplicates', methods=['GET'])
+@login_required
+def get_duplicate_applications():
+    """Groups of the current user's likely duplicate applications.
+
+    ?threshold= sets the minimum similarity (0-1); ?id= limits the report to
+    applications resembling that one.
+    """
+    try:
+        try:
+            threshold = float(request.args.get('threshold', DEFAULT_THRESHOLD))
+            if not 0 < threshold <= 1:
+                raise ValueError
+        except ValueError:
+            return jsonify({'error': 'threshold must be a number between 0 and 1'}), 400
+        try:
+            limit = parse_limit(request.args)
+            app_id = request.args.get('id')
+            if app_id is not None:
+                try:
+                    app_id = int(app_id)
+                except ValueError:
+                    raise ValueError('id must be an integer')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        groups = find_duplicates(session['user_id'], threshold, app_id)
+        if groups is None:
+            return jsonify({'error': 'Application not found'}), 404
+        groups = groups[:limit]
+
+        fields = JobApplication.SUMMARY_FIELDS
+        ids = {member for group in groups for member in group['ids']}
+        rows = select_rows(JobApplication.query, fields).filter(JobApplication.id.in_(ids)).all() if ids else []
+        items = {row.id: row_dict(row, fields) for row in rows}
+        return jsonify({'groups': [
+            {'score': group['score'], 'items': [items[member] for member in group['ids'] if member in items]}
+            for group in groups
+        ]}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @api.route('/applications/<int:app_id>', methods=['GET'])
 @login_required
+@read_replica
 def get_application(app_id):
     """Get a single job application by ID."""
     try:
-        application = JobApplication.query.get(app_id)
+        try:
+            fields = parse_fields(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Check ownership and freshness before loading the row itself
+        updated_at = owned_application_query(app_id).with_entities(JobApplication.updated_at).scalar()
+        if not updated_at:
+            return jsonify({'error': 'Application not found'}), 404
+
+        etag, last_modified = row_validators(app_id, updated_at, request.query_string.decode())
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        application = project(JobApplication.query, fields).filter_by(id=app_id).first()
         if not application:
             return jsonify({'error': 'Application not found'}), 404
-        
-        # Verify ownership
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
             
-        return jsonify(application.to_dict()), 200
+        return with_validators(jsonify(application.to_dict(fields)), etag, last_modified), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -61,39 +311,41 @@ def get_application(app_id):
 @api.route('/applications', methods=['POST'])
 @login_required
 def create_application():
-    """Create a new job application."""
+    """Create a new job application.
+
+    With ?upsert=1, an existing application for the same company and position
+    (by fingerprint) is updated with the given fields instead, answering 200.
+    """
     try:
         data = request.get_json()
-        
-        # Validate required fields
-        if not data.get('company_name'):
-            return jsonify({'error': 'company_name is required'}), 400
-        if not data.get('position_title'):
-            return jsonify({'error': 'position_title is required'}), 400
-        
-        # Parse application_date if provided
-        application_date = date.today()
-        if data.get('application_date'):
-            try:
-                application_date = datetime.fromisoformat(data['application_date']).date()
-            except ValueError:
-                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        try:
+            values = application_values(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if request.args.get('upsert') in ('1', 'true'):
+            lock_fingerprint(session['user_id'], values['fingerprint'])
+            application = find_exact(session['user_id'], values['fingerprint'])
+            if application:
+                previous_status = application.status
+                for name, value in values.items():
+                    if name in data:
+                        setattr(application, name, value)
+                application.updated_at = datetime.utcnow()
+                record_status_change(application, previous_status)
+                invalidate_stats(application.user_id)
+                publish_change(application.user_id, 'updated', [application.id])
+                db.session.commit()
+                return jsonify(application.to_dict()), 200
         
         # Create new application
-        application = JobApplication(
-            user_id=session['user_id'],
-            company_name=data['company_name'],
-            position_title=data['position_title'],
-            location=data.get('location'),
-            job_type=data.get('job_type'),
-            job_level=data.get('job_level'),
-            application_date=application_date,
-            status=data.get('status', 'Applied'),
-            job_description=data.get('job_description'),
-            notes=data.get('notes')
-        )
+        application = JobApplication(user_id=session['user_id'], **values)
         
         db.session.add(application)
+        record_status_change(application, None)
+        db.session.flush()
+        invalidate_stats(application.user_id)
+        publish_change(application.user_id, 'created', [application.id])
         db.session.commit()
         
         return jsonify(application.to_dict()), 201
@@ -102,26 +354,121 @@ def create_application():
         return jsonify({'error': str(e)}), 500
 
 
+@api.route('/applications/import', methods=['POST'])
+@login_required
+def bulk_import_applications():
+    """Stream a CSV or NDJSON body into job applications, reporting per-row errors."""
+    try:
+        fmt = request.args.get('format')
+        if not fmt:
+            fmt = 'ndjson' if 'json' in (request.mimetype or '') else 'csv'
+
+        if fmt not in ('csv', 'ndjson'):
+            return jsonify({'error': 'format must be csv or ndjson'}), 400
+
+        try:
+            # Read the raw body under the import limit rather than MAX_CONTENT_LENGTH
+            stream = get_input_stream(
+                request.environ,
+                safe_fallback=False,
+                max_content_length=current_app.config['IMPORT_MAX_SIZE']
+            )
+            report = import_applications(
+                session['user_id'],
+                iter_records(stream, fmt),
+                current_app.config['IMPORT_BATCH_SIZE']
+            )
+        except ImportStreamError as e:
+            # Rows before the failing one were saved; say how far the import got
+            db.session.rollback()
+            return jsonify({**e.report, 'error': e.error, 'row': e.row}), e.status
+        except RequestEntityTooLarge:
+            db.session.rollback()
+            return jsonify({'error': 'Import file too large'}), 413
+
+        return jsonify(report), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/applications/export', methods=['GET'])
+@login_required
+def export_applications():
+    """Stream the current user's (filtered) job applications as CSV or NDJSON."""
+    try:
+        fmt = request.args.get('format', 'csv')
+        if fmt not in MIMETYPES:
+            return jsonify({'error': 'format must be csv or ndjson'}), 400
+
+        fields = export_fields(request.args.get('include_documents') in ('1', 'true'))
+        query = JobApplication.query.filter_by(user_id=session['user_id'])
+        try:
+            query = apply_filters(query, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        query = project(query, fields).order_by(JobApplication.application_date, JobApplication.id)
+
+        filename = f"applications-{date.today().isoformat()}.{fmt}"
+        return Response(
+            stream_with_context(generate_export(query, fmt, fields)),
+            mimetype=MIMETYPES[fmt],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/applications/batch', methods=['POST'])
+@login_required
+def batch_applications():
+    """Update or delete many of the current user's job applications at once.
+
+    Body: {"ids": [...], "patch": {...}} or {"ids": [...], "action": "delete"}.
+    """
+    try:
+        data = request.get_json()
+        try:
+            ids = batch_ids(data)
+            if data.get('action') == 'delete':
+                values = None
+            else:
+                values = batch_patch_values(data.get('patch'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if values is None:
+            done = batch_delete(session['user_id'], ids)
+        else:
+            done = batch_update(session['user_id'], ids, values)
+
+        missing = sorted(set(ids) - set(done))
+        return jsonify({'ids': sorted(done), 'missing': missing}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @api.route('/applications/<int:app_id>', methods=['PUT'])
 @login_required
 def update_application(app_id):
     """Update an existing job application."""
     try:
-        application = JobApplication.query.get(app_id)
+        application = get_owned_application(app_id)
         if not application:
             return jsonify({'error': 'Application not found'}), 404
-            
-        # Verify ownership
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
         
         data = request.get_json()
+        previous_status = application.status
         
         # Validate required fields if provided
         if 'company_name' in data and not data['company_name']:
             return jsonify({'error': 'company_name cannot be empty'}), 400
         if 'position_title' in data and not data['position_title']:
             return jsonify({'error': 'position_title cannot be empty'}), 400
+        for name in ('company_name', 'position_title'):
+            if name in data and not isinstance(data[name], str):
+                return jsonify({'error': f'{name} must be a string'}), 400
         
         # Update fields
         if 'company_name' in data:
@@ -146,7 +493,11 @@ def update_application(app_id):
             except ValueError:
                 return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
         
+        application.fingerprint = fingerprint(application.company_name, application.position_title)
         application.updated_at = datetime.utcnow()
+        record_status_change(application, previous_status)
+        invalidate_stats(application.user_id)
+        publish_change(application.user_id, 'updated', [application.id])
         db.session.commit()
         
         return jsonify(application.to_dict()), 200
@@ -160,28 +511,32 @@ def update_application(app_id):
 def delete_application(app_id):
     """Delete a job application."""
     try:
-        application = JobApplication.query.get(app_id)
+        application = get_owned_application(app_id)
         if not application:
             return jsonify({'error': 'Application not found'}), 404
-            
-        # Verify ownership
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
-        
-        # Delete associated files if they exist
-        if application.resume_path and os.path.exists(application.resume_path):
-            try:
-                os.remove(application.resume_path)
-            except OSError:
-                pass 
-                
-        if application.cover_letter_path and os.path.exists(application.cover_letter_path):
-            try:
-                os.remove(application.cover_letter_path)
-            except OSError:
-                pass 
         
         db.session.delete(application)
+        db.session.flush()
+
+        # Release attached documents; files are removed by the worker after commit
+        stale_paths = []
+        for doc_type in DOC_TYPES:
+            stale_paths += release_slot(
+                getattr(application, f'{doc_type}_document_id'),
+                getattr(application, f'{doc_type}_path')
+            )
+
+        # Record a tombstone for delta sync and prune expired ones
+        db.session.merge(DeletedApplication(id=application.id, user_id=application.user_id))
+        cutoff = datetime.utcnow() - timedelta(days=current_app.config['SYNC_TOMBSTONE_TTL_DAYS'])
+        DeletedApplication.query.filter(
+            DeletedApplication.user_id == application.user_id,
+            DeletedApplication.deleted_at < cutoff
+        ).delete(synchronize_session=False)
+
+        invalidate_stats(application.user_id)
+        publish_change(application.user_id, 'deleted', [application.id])
+        collect_blobs_later(stale_paths)
         db.session.commit()
         
         return jsonify({'message': 'Application deleted successfully'}), 200
@@ -190,6 +545,44 @@ def delete_application(app_id):
         return jsonify({'error': str(e)}), 500
 
 
+# --- Stats Routes (Protected) ---
+
+@api.route('/stats', methods=['GET'])
+@login_required
+def get_pipeline_stats():
+    """Get the current user's pipeline summary, served from cache when unchanged."""
+    try:
+        return jsonify(get_stats(session['user_id'])), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/stats/stages', methods=['GET'])
+@login_required
+@read_replica
+def get_stage_durations():
+    """Get time spent in each status across the current user's applications."""
+    try:
+        return jsonify(stage_durations(session['user_id'])), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/applications/<int:app_id>/timeline', methods=['GET'])
+@login_required
+@read_replica
+def get_application_timeline(app_id):
+    """Get the status transition timeline of a job application."""
+    try:
+        if not owned_application_query(app_id).with_entities(JobApplication.id).scalar():
+            return jsonify({'error': 'Application not found'}), 404
+            
+        return jsonify(get_timeline(app_id)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 # --- File Upload Utilities ---
 
 def allowed_file(filename):
@@ -197,8 +590,11 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
-def save_document(file, app_id, doc_type):
-    """Common logic to save a document."""
+def save_document(file):
+    """Common logic to save a document into the content-addressed store.
+
+    Returns (document, filename); the document already counts this reference.
+    """
     if file.filename == '':
         raise ValueError('No selected file')
         
@@ -206,78 +602,290 @@ def save_document(file, app_id, doc_type):
         raise ValueError('File type not allowed')
         
     filename = secure_filename(file.filename)
-    # Create unique filename: {app_id}_{timestamp}_{filename}
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    unique_filename = f"{app_id}_{timestamp}_{doc_type}_{filename}"
-    
-    upload_folder = current_app.config['UPLOAD_FOLDER']
-    if not os.path.exists(upload_folder):
-        os.makedirs(upload_folder)
+    sha256, size, path = store_stream(file.stream)
+    record_document_bytes('upload', size)
+    return acquire_document(sha256, size, path), filename
+
+def upload_document(app_id, doc_type):
+    """Upload a document into an application's resume or cover letter slot."""
+    application = get_owned_application(app_id)
+    if not application:
+        return jsonify({'error': 'Application not found'}), 404
         
-    file_path = os.path.join(upload_folder, unique_filename)
-    file.save(file_path)
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file part'}), 400
+        
+    file = request.files['file']
     
-    return file_path, filename
+    try:
+        document, filename = save_document(file)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-# --- Resume Endpoints ---
+    # Old file is removed by the worker only once the new reference is committed
+    stale_paths = attach_document(application, doc_type, document, filename)
+    publish_change(application.user_id, 'updated', [application.id])
+    collect_blobs_later(stale_paths)
+    db.session.commit()
+    
+    return jsonify(application.to_dict()), 200
 
-@api.route('/applications/<int:app_id>/resume', methods=['POST'])
+def reuse_document(app_id, doc_type):
+    """Attach one of the user's existing documents by SHA-256, without re-uploading."""
+    application = get_owned_application(app_id)
+    if not application:
+        return jsonify({'error': 'Application not found'}), 404
+
+    data = request.get_json() or {}
+    found = find_user_document(session['user_id'], str(data.get('sha256', '')).lower())
+    if not found:
+        return jsonify({'error': 'Document not found'}), 404
+    document, previous_filename = found
+
+    # Without a filename, keep the one the user last attached it under
+    filename = secure_filename(str(data.get('filename') or '')) or previous_filename
+    if not allowed_file(filename):
+        return jsonify({'error': 'File type not allowed'}), 400
+
+    reference_document(document)
+    stale_paths = attach_document(application, doc_type, document, filename)
+    publish_change(application.user_id, 'updated', [application.id])
+    collect_blobs_later(stale_paths)
+    db.session.commit()
+
+    return jsonify(application.to_dict()), 200
+
+def download_document(app_id, doc_type, label):
+    """Serve an application's resume or cover letter after checking ownership.
+
+    Stored documents are validated by their SHA-256, so repeat downloads are
+    answered with 304. With DOWNLOAD_ACCEL_PREFIX set, nginx sends the bytes
+    (including Range requests); otherwise send_file does.
+    """
+    application = get_owned_application(app_id)
+    path = getattr(application, f'{doc_type}_path') if application else None
+    if not path:
+        return jsonify({'error': f'{label} not found'}), 404
+
+    document_id = getattr(application, f'{doc_type}_document_id')
+    document = db.session.get(Document, document_id) if document_id else None
+    etag = document.sha256 if document else None
+    # Not document.created_at: re-attaching an older blob must not move Last-Modified back
+    last_modified = application.updated_at if document else None
+    if etag and is_not_modified(etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    if not os.path.exists(path):
+        return jsonify({'error': 'File not found on server'}), 404
+
+    filename = getattr(application, f'{doc_type}_filename')
+    accel_uri = accel_redirect_uri(path)
+    if accel_uri:
+        response = current_app.response_class(
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        )
+        response.headers['X-Accel-Redirect'] = accel_uri
+        response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+        # nginx may serve a range; count the whole file
+        record_document_bytes('download', os.path.getsize(path))
+    else:
+        try:
+            response = send_file(
+                path,
+                as_attachment=True,
+                download_name=filename,
+                conditional=True,
+                etag=etag or True,
+                last_modified=last_modified
+            )
+        except RequestedRangeNotSatisfiable as e:
+            response = jsonify({'error': 'Requested range not satisfiable'})
+            response.status_code = 416
+            response.headers['Content-Range'] = f'bytes */{e.length}'
+            return response
+        record_document_bytes('download', response.content_length)
+    if etag:
+        response = with_validators(response, etag, last_modified)
+    return response
+
+def remove_document(app_id, doc_type):
+    """Detach an application's resume or cover letter."""
+    application = get_owned_application(app_id)
+    if not application:
+        return jsonify({'error': 'Application not found'}), 404
+
+    stale_paths = attach_document(application, doc_type, None, None)
+    publish_change(application.user_id, 'updated', [application.id])
+    collect_blobs_later(stale_paths)
+    db.session.commit()
+    return None
+
+# --- Document Library ---
+
+@api.route('/documents', methods=['GET'])
 @login_required
-def upload_resume(app_id):
-    """Upload a resume for an application."""
+@read_replica
+def list_documents():
+    """List the current user's stored documents, most recently used first."""
     try:
-        application = JobApplication.query.get(app_id)
+        return jsonify(list_user_documents(session['user_id'])), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# --- Resumable Uploads ---
+
+def get_upload(upload_id):
+    """The current user's upload session, or None."""
+    return UploadSession.query.filter_by(id=upload_id, user_id=session['user_id']).first()
+
+def upload_progress(upload):
+    """Chunk layout and what has arrived, so a client can resume."""
+    received = received_chunks(upload)
+    return {
+        'upload_id': upload.id,
+        'size': upload.size,
+        'chunk_size': upload.chunk_size,
+        'chunks': upload.chunk_count,
+        'received': received,
+        'missing': sorted(set(range(upload.chunk_count)) - set(received)),
+        'expires_at': upload.expires_at.isoformat()
+    }
+
+@api.route('/uploads', methods=['POST'])
+@login_required
+def start_upload():
+    """Start a chunked, resumable document upload."""
+    try:
+        data = request.get_json() or {}
+        doc_type = data.get('doc_type')
+        if doc_type not in DOC_TYPES:
+            return jsonify({'error': f"doc_type must be one of: {', '.join(DOC_TYPES)}"}), 400
+
+        application = get_owned_application(data.get('application_id'))
         if not application:
             return jsonify({'error': 'Application not found'}), 404
-        
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
-            
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file part'}), 400
-            
-        file = request.files['file']
-        
+
+        filename = secure_filename(data.get('filename') or '')
+        if not filename or not allowed_file(filename):
+            return jsonify({'error': 'File type not allowed'}), 400
+
         try:
-            file_path, filename = save_document(file, app_id, 'resume')
+            upload = create_upload(session['user_id'], application.id, doc_type, filename, data.get('size'))
         except ValueError as e:
             return jsonify({'error': str(e)}), 400
-            
-        # Delete old file
-        if application.resume_path and os.path.exists(application.resume_path):
-            try:
-                os.remove(application.resume_path)
-            except OSError:
-                pass
+        return jsonify(upload_progress(upload)), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/uploads/<upload_id>', methods=['GET'])
+@login_required
+def get_upload_status(upload_id):
+    """Report which chunks of an upload have been received."""
+    try:
+        upload = get_upload(upload_id)
+        if not upload:
+            return jsonify({'error': 'Upload not found'}), 404
+        return jsonify(upload_progress(upload)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/uploads/<upload_id>', methods=['PUT'])
+@login_required
+def put_upload_chunk(upload_id):
+    """Write one chunk (raw body) at ?offset=N; retries of a chunk are idempotent."""
+    try:
+        upload = get_upload(upload_id)
+        if not upload:
+            return jsonify({'error': 'Upload not found'}), 404
+        offset = request.args.get('offset', type=int)
+        if offset is None:
+            return jsonify({'error': 'offset must be an integer'}), 400
+        try:
+            write_chunk(
+                upload, offset, request.stream, request.content_length,
+                request.headers.get('X-Chunk-SHA256')
+            )
+            record_document_bytes('upload', request.content_length)
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 400
+        return jsonify({'received': offset // upload.chunk_size}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/uploads/<upload_id>/finalize', methods=['POST'])
+@login_required
+def finalize_upload_session(upload_id):
+    """Assemble a completed upload into the document store and attach it."""
+    try:
+        upload = get_upload(upload_id)
+        if not upload:
+            return jsonify({'error': 'Upload not found'}), 404
+        application = get_owned_application(upload.application_id)
+        if not application:
+            return jsonify({'error': 'Application not found'}), 404
+        doc_type, filename = upload.doc_type, upload.filename
+
+        try:
+            document = finalize_upload(upload)
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 409
 
-        application.resume_path = file_path
-        application.resume_filename = filename
+        stale_paths = attach_document(application, doc_type, document, filename)
+        publish_change(application.user_id, 'updated', [application.id])
+        collect_blobs_later(stale_paths)
         db.session.commit()
-        
         return jsonify(application.to_dict()), 200
     except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/uploads/<upload_id>', methods=['DELETE'])
+@login_required
+def cancel_upload(upload_id):
+    """Abandon an upload and discard its partial file."""
+    try:
+        upload = get_upload(upload_id)
+        if not upload:
+            return jsonify({'error': 'Upload not found'}), 404
+        abort_upload(upload)
+        return jsonify({'message': 'Upload cancelled'}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# --- Resume Endpoints ---
+
+@api.route('/applications/<int:app_id>/resume', methods=['POST'])
+@login_required
+def upload_resume(app_id):
+    """Upload a resume for an application."""
+    try:
+        return upload_document(app_id, 'resume')
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/applications/<int:app_id>/resume/reuse', methods=['POST'])
+@login_required
+def reuse_resume(app_id):
+    """Attach an already stored document as the resume."""
+    try:
+        return reuse_document(app_id, 'resume')
+    except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @api.route('/applications/<int:app_id>/resume', methods=['GET'])
 @login_required
+@read_replica
 def download_resume(app_id):
     """Download the resume."""
     try:
-        application = JobApplication.query.get(app_id)
-        if not application or not application.resume_path:
-            return jsonify({'error': 'Resume not found'}), 404
-        
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
-            
-        if not os.path.exists(application.resume_path):
-            return jsonify({'error': 'File not found on server'}), 404
-            
-        return send_file(
-            application.resume_path,
-            as_attachment=True,
-            download_name=application.resume_filename
-        )
+        return download_document(app_id, 'resume', 'Resume')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -286,25 +894,12 @@ def download_resume(app_id):
 def delete_resume(app_id):
     """Delete the resume."""
     try:
-        application = JobApplication.query.get(app_id)
-        if not application:
-            return jsonify({'error': 'Application not found'}), 404
-        
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
-            
-        if application.resume_path and os.path.exists(application.resume_path):
-            try:
-                os.remove(application.resume_path)
-            except OSError:
-                pass
-                
-        application.resume_path = None
-        application.resume_filename = None
-        db.session.commit()
-        
+        error = remove_document(app_id, 'resume')
+        if error:
+            return error
         return jsonify({'message': 'Resume deleted'}), 200
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
@@ -315,58 +910,28 @@ def delete_resume(app_id):
 def upload_cover_letter(app_id):
     """Upload a cover letter."""
     try:
-        application = JobApplication.query.get(app_id)
-        if not application:
-            return jsonify({'error': 'Application not found'}), 404
-        
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
-            
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file part'}), 400
-            
-        file = request.files['file']
-        
-        try:
-            file_path, filename = save_document(file, app_id, 'cover_letter')
-        except ValueError as e:
-            return jsonify({'error': str(e)}), 400
-            
-        # Delete old file
-        if application.cover_letter_path and os.path.exists(application.cover_letter_path):
-            try:
-                os.remove(application.cover_letter_path)
-            except OSError:
-                pass
+        return upload_document(app_id, 'cover_letter')
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
 
-        application.cover_letter_path = file_path
-        application.cover_letter_filename = filename
-        db.session.commit()
-        
-        return jsonify(application.to_dict()), 200
+@api.route('/applications/<int:app_id>/cover-letter/reuse', methods=['POST'])
+@login_required
+def reuse_cover_letter(app_id):
+    """Attach an already stored document as the cover letter."""
+    try:
+        return reuse_document(app_id, 'cover_letter')
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @api.route('/applications/<int:app_id>/cover-letter', methods=['GET'])
 @login_required
+@read_replica
 def download_cover_letter(app_id):
     """Download the cover letter."""
     try:
-        application = JobApplication.query.get(app_id)
-        if not application or not application.cover_letter_path:
-            return jsonify({'error': 'Cover letter not found'}), 404
-        
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
-            
-        if not os.path.exists(application.cover_letter_path):
-            return jsonify({'error': 'File not found on server'}), 404
-            
-        return send_file(
-            application.cover_letter_path,
-            as_attachment=True,
-            download_name=application.cover_letter_filename
-        )
+        return download_document(app_id, 'cover_letter', 'Cover letter')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -375,23 +940,10 @@ def download_cover_letter(app_id):
 def delete_cover_letter(app_id):
     """Delete the cover letter."""
     try:
-        application = JobApplication.query.get(app_id)
-        if not application:
-            return jsonify({'error': 'Application not found'}), 404
-        
-        if application.user_id != session['user_id']:
-            return jsonify({'error': 'Unauthorized'}), 403
-            
-        if application.cover_letter_path and os.path.exists(application.cover_letter_path):
-            try:
-                os.remove(application.cover_letter_path)
-            except OSError:
-                pass
-                
-        application.cover_letter_path = None
-        application.cover_letter_filename = None
-        db.session.commit()
-        
+        error = remove_document(app_id, 'cover_letter')
+        if error:
+            return error
         return jsonify({'message': 'Cover letter deleted'}), 200
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
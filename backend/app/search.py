@@ -0,0 +1,72 @@
+from sqlalchemy import DDL, event, func, literal, literal_column, or_
+
+from .database import db
+from .models import JobApplication, Document, DocumentText
+
+# Text search configuration used for both the stored vector and queries
+SEARCH_CONFIG = 'english'
+
+# Generated tsvector column plus its GIN index, and a trigram index for fuzzy
+# company matching. Mirrors migrations/v6_add_search.sql for fresh databases.
+SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """ALTER TABLE job_applications ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(company_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(position_title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(notes, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(job_description, '')), 'C')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_job_applications_search ON job_applications USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_job_applications_company_trgm ON job_applications USING GIN (lower(company_name) gin_trgm_ops)",
+]
+
+# Extracted document text; mirrors migrations/v12_add_document_texts.sql
+DOCUMENT_SEARCH_DDL = [
+    """ALTER TABLE document_texts ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', content)) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_document_texts_search ON document_texts USING GIN (search_vector)",
+]
+
+for table, statements in ((JobApplication.__table__, SEARCH_DDL), (DocumentText.__table__, DOCUMENT_SEARCH_DDL)):
+    for statement in statements:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+
+def _document_match(condition):
+    """EXISTS clause: the application's resume or cover letter text satisfies `condition`."""
+    return db.session.query(Document.id).join(
+        DocumentText, DocumentText.sha256 == Document.sha256
+    ).filter(
+        or_(Document.id == JobApplication.resume_document_id,
+            Document.id == JobApplication.cover_letter_document_id),
+        condition
+    ).exists()
+
+
+def apply_search(query, q):
+    """Filter and rank `query` by full-text match on `q`, best matches first.
+
+    Returns the query with a `rank` column added. On PostgreSQL this uses the
+    GIN-indexed search_vector plus trigram similarity on the company name;
+    other databases fall back to a case-insensitive substring match. Text
+    extracted from attached documents also matches, without adding to rank.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        pattern = f"%{q.lower()}%"
+        columns = [JobApplication.company_name, JobApplication.position_title,
+                   JobApplication.notes, JobApplication.job_description]
+        return query.add_columns(literal(0.0).label('rank')).filter(
+            or_(*[func.lower(column).like(pattern) for column in columns],
+                _document_match(func.lower(DocumentText.content).like(pattern)))
+        ).order_by(JobApplication.id.desc())
+
+    vector = literal_column('job_applications.search_vector')
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    company = func.lower(JobApplication.company_name)
+    rank = (func.ts_rank_cd(vector, tsquery) + func.similarity(company, q.lower())).label('rank')
+
+    return query.add_columns(rank).filter(
+        or_(vector.op('@@')(tsquery), company.op('%')(q.lower()),
+            _document_match(literal_column('document_texts.search_vector').op('@@')(tsquery)))
+    ).order_by(rank.desc(), JobApplication.id.desc())
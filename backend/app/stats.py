@@ -0,0 +1,137 @@
+from datetime import datetime
+from sqlalchemy import case, func, literal, update
+
+from .database import db, dialect_insert
+from .models import ApplicationStatusEvent, JobApplication, User, UserStatsCache
+
+# Statuses that mean the employer replied to the application
+RESPONDED_STATUSES = ('Interviewing', 'Offered', 'Rejected')
+
+# Number of most recent weeks returned in the weekly series
+WEEKS = 26
+
+
+def _week_start(column):
+    """SQL expression for the Monday starting the week of a date column."""
+    if db.engine.dialect.name == 'postgresql':
+        return func.date(func.date_trunc('week', column))
+    return func.date(column, 'weekday 0', '-6 days')
+
+
+def days_between(start, end):
+    """SQL expression for the days elapsed between two timestamps (column or datetime)."""
+    if isinstance(end, datetime):
+        end = literal(end)
+    if db.engine.dialect.name == 'postgresql':
+        return func.extract('epoch', end - start) / 86400.0
+    return func.julianday(end) - func.julianday(start)
+
+
+def events_with_end(filter_clause):
+    """Subquery of events with the time each stage ended (the next event, or now)."""
+    ended_at = func.lead(ApplicationStatusEvent.occurred_at, type_=db.DateTime).over(
+        partition_by=ApplicationStatusEvent.application_id,
+        order_by=(ApplicationStatusEvent.occurred_at, ApplicationStatusEvent.id)
+    )
+    return db.session.query(
+        ApplicationStatusEvent.id,
+        ApplicationStatusEvent.application_id,
+        ApplicationStatusEvent.from_status,
+        ApplicationStatusEvent.to_status,
+        ApplicationStatusEvent.occurred_at,
+        ended_at.label('ended_at')
+    ).filter(filter_clause).subquery()
+
+
+def _response_rates(user_id, column):
+    """Total and responded counts grouped by `column`."""
+    responded = func.sum(case((JobApplication.status.in_(RESPONDED_STATUSES), 1), else_=0))
+    rows = db.session.query(
+        column, func.count(JobApplication.id), responded
+    ).filter(JobApplication.user_id == user_id).group_by(column).all()
+    return [
+        {
+            'value': value,
+            'total': total,
+            'responded': int(answered or 0),
+            'rate': round((answered or 0) / total, 4) if total else 0.0
+        }
+        for value, total, answered in rows
+    ]
+
+
+def compute_stats(user_id):
+    """Run the pipeline aggregations for a user in the database."""
+    now = datetime.utcnow()
+    base = db.session.query(JobApplication).filter(JobApplication.user_id == user_id)
+
+    by_status = dict(
+        base.with_entities(JobApplication.status, func.count(JobApplication.id))
+        .group_by(JobApplication.status).all()
+    )
+
+    week = _week_start(JobApplication.application_date).label('week')
+    per_week = base.with_entities(week, func.count(JobApplication.id)) \
+        .group_by(week).order_by(week.desc()).limit(WEEKS).all()
+
+    # Time since each application entered its current status: its open (latest) stage
+    events = events_with_end(ApplicationStatusEvent.user_id == user_id)
+    age = days_between(events.c.occurred_at, now)
+    time_in_status = db.session.query(
+        JobApplication.status, func.avg(age), func.max(age)
+    ).join(
+        JobApplication, JobApplication.id == events.c.application_id
+    ).filter(events.c.ended_at.is_(None)).group_by(JobApplication.status).all()
+
+    total = sum(by_status.values())
+    responded = sum(count for status, count in by_status.items() if status in RESPONDED_STATUSES)
+
+    return {
+        'total': total,
+        'response_rate': round(responded / total, 4) if total else 0.0,
+        'by_status': by_status,
+        'per_week': [{'week': str(start), 'count': count} for start, count in reversed(per_week)],
+        'response_rate_by_job_type': _response_rates(user_id, JobApplication.job_type),
+        'response_rate_by_job_level': _response_rates(user_id, JobApplication.job_level),
+        'time_in_status': [
+            {'status': status, 'avg_days': round(float(avg_days or 0), 2), 'max_days': round(float(max_days or 0), 2)}
+            for status, avg_days, max_days in time_in_status
+        ],
+        'computed_at': now.isoformat()
+    }
+
+
+def get_stats(user_id):
+    """Return the cached summary for a user, computing and storing it on a miss.
+
+    Writes bump User.stats_version in their transaction. The cached row
+    records the version read before computing and is only served while it
+    still matches, so a summary computed alongside a write is not kept.
+    """
+    row = db.session.query(User.stats_version, UserStatsCache.version, UserStatsCache.payload).outerjoin(
+        UserStatsCache, UserStatsCache.user_id == User.id
+    ).filter(User.id == user_id).one()
+    if row.payload is not None and row.version == row.stats_version:
+        return row.payload
+
+    payload = compute_stats(user_id)
+    now = datetime.utcnow()
+    db.session.execute(
+        dialect_insert()(UserStatsCache)
+        .values(user_id=user_id, payload=payload, version=row.stats_version, computed_at=now)
+        .on_conflict_do_update(
+            index_elements=['user_id'],
+            set_={'payload': payload, 'version': row.stats_version, 'computed_at': now}
+        )
+    )
+    db.session.commit()
+    return payload
+
+
+def invalidate_stats(user_id):
+    """Mark a user's cached summary stale; call inside the mutating transaction."""
+    db.session.execute(
+        update(User).where(User.id == user_id)
+        .values(stats_version=User.stats_version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,82 @@
+import logging
+import traceback
+from datetime import datetime, timedelta
+from flask import current_app
+
+from .database import db
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# Task kind -> handler(**payload); registered with @handler
+HANDLERS = {}
+
+
+def handler(kind):
+    """Register a function as the handler for tasks of `kind`."""
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind, run_at=None, **payload):
+    """Add a task to the current transaction; workers only see it once committed."""
+    task = Task(kind=kind, payload=payload, run_at=run_at or datetime.utcnow())
+    db.session.add(task)
+    return task
+
+
+def claim_next():
+    """Lock the next due task, skipping rows other workers hold; None if idle."""
+    return Task.query.filter(
+        Task.status == 'pending',
+        Task.run_at <= datetime.utcnow()
+    ).order_by(Task.run_at, Task.id).with_for_update(skip_locked=True).first()
+
+
+def run_next():
+    """Run one due task inside the transaction that locks it.
+
+    Success deletes the task; failure schedules a retry with exponential
+    backoff, and after TASK_MAX_ATTEMPTS the task is kept as 'failed'. A worker
+    that dies mid-task releases its lock, so the task is simply run again;
+    handlers must therefore be idempotent. Returns False when nothing was due.
+    """
+    task = claim_next()
+    if task is None:
+        db.session.rollback()
+        return False
+
+    try:
+        HANDLERS[task.kind](**task.payload)
+    except Exception:
+        # Discard the handler's partial work but keep the lock on the task row
+        db.session.rollback()
+        task = claim_by_id(task.id)
+        if task is None:
+            return True
+        task.attempts += 1
+        task.last_error = traceback.format_exc(limit=5)
+        if task.attempts >= current_app.config['TASK_MAX_ATTEMPTS']:
+            task.status = 'failed'
+            logger.error('Task %s (%s) failed permanently', task.id, task.kind)
+        else:
+            delay = current_app.config['TASK_RETRY_DELAY'] * 2 ** (task.attempts - 1)
+            task.run_at = datetime.utcnow() + timedelta(seconds=delay)
+            logger.warning('Task %s (%s) failed, retrying in %ss', task.id, task.kind, delay)
+    else:
+        db.session.delete(task)
+    db.session.commit()
+    return True
+
+
+def claim_by_id(task_id):
+    """Re-lock a task after a rollback; None if another worker took it meanwhile."""
+    return Task.query.filter_by(id=task_id).with_for_update(skip_locked=True).first()
+
+
+def schedule_once(kind, run_at=None, **payload):
+    """Enqueue `kind` unless a pending task of that kind already exists."""
+    if not db.session.query(Task.id).filter_by(kind=kind, status='pending').first():
+        enqueue(kind, run_at=run_at, **payload)
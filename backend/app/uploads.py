@@ -0,0 +1,158 @@
+import hashlib
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete
+
+from .database import db, dialect_insert
+from .models import UploadSession, UploadChunk
+from .documents import CHUNK_SIZE, temp_dir, commit_blob, acquire_document
+
+
+def temp_path(upload):
+    """Partial file that chunks of `upload` are written into."""
+    return os.path.join(temp_dir(), f'upload-{upload.id}')
+
+
+def create_upload(user_id, application_id, doc_type, filename, size):
+    """Start a resumable upload and preallocate its partial file."""
+    max_size = current_app.config['MAX_CONTENT_LENGTH']
+    if not isinstance(size, int) or size <= 0:
+        raise ValueError('size must be a positive integer')
+    if max_size and size > max_size:
+        raise ValueError(f'File exceeds the {max_size} byte limit')
+
+    now = datetime.utcnow()
+    upload = UploadSession(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        application_id=application_id,
+        doc_type=doc_type,
+        filename=filename,
+        size=size,
+        chunk_size=current_app.config['UPLOAD_CHUNK_SIZE'],
+        created_at=now,
+        expires_at=now + timedelta(hours=current_app.config['UPLOAD_SESSION_TTL_HOURS'])
+    )
+    with open(temp_path(upload), 'wb') as partial:
+        partial.truncate(size)
+    db.session.add(upload)
+    db.session.commit()
+    return upload
+
+
+def write_chunk(upload, offset, stream, length, expected_sha256=None):
+    """Stream one chunk into the partial file at `offset` and record it.
+
+    Chunks may arrive in any order and be retried; each lands at its own
+    offset, so parallel writers never overlap.
+    """
+    if offset % upload.chunk_size or not 0 <= offset < upload.size:
+        raise ValueError('offset must be a chunk boundary within the file')
+    expected_length = min(upload.chunk_size, upload.size - offset)
+    if length != expected_length:
+        raise ValueError(f'Chunk at offset {offset} must be {expected_length} bytes')
+
+    digest = hashlib.sha256()
+    fd = os.open(temp_path(upload), os.O_WRONLY)
+    try:
+        position = offset
+        remaining = length
+        while remaining:
+            data = stream.read(min(CHUNK_SIZE, remaining))
+            if not data:
+                raise ValueError('Chunk body ended early')
+            digest.update(data)
+            os.pwrite(fd, data, position)
+            position += len(data)
+            remaining -= len(data)
+    finally:
+        os.close(fd)
+
+    if expected_sha256 and digest.hexdigest() != expected_sha256.lower():
+        raise ValueError('Chunk checksum mismatch')
+
+    db.session.execute(
+        dialect_insert()(UploadChunk)
+        .values(upload_id=upload.id, chunk_index=offset // upload.chunk_size)
+        .on_conflict_do_nothing()
+    )
+    db.session.commit()
+
+
+def received_chunks(upload):
+    """Sorted indices of the chunks received so far."""
+    rows = db.session.query(UploadChunk.chunk_index).filter_by(upload_id=upload.id).all()
+    return sorted(row.chunk_index for row in rows)
+
+
+def finalize_upload(upload):
+    """Hash the completed file, move it into the blob store and drop the session.
+
+    Returns the acquired document; the caller attaches it and commits.
+    """
+    received = set(received_chunks(upload))
+    missing = [index for index in range(upload.chunk_count) if index not in received]
+    if missing:
+        raise ValueError(f'Missing chunks: {missing[:20]}')
+
+    digest = hashlib.sha256()
+    path = temp_path(upload)
+    with open(path, 'rb') as partial:
+        for data in iter(lambda: partial.read(CHUNK_SIZE), b''):
+            digest.update(data)
+    sha256 = digest.hexdigest()
+
+    document = acquire_document(sha256, upload.size, commit_blob(path, sha256))
+    _delete_sessions([upload.id])
+    return document
+
+
+def abort_upload(upload):
+    """Cancel an upload and remove its partial file."""
+    path = temp_path(upload)
+    _delete_sessions([upload.id])
+    db.session.commit()
+    _remove(path)
+
+
+def expire_uploads():
+    """Delete sessions past their expiry along with their partial files.
+
+    Partial files untouched for longer than the TTL are swept too; they belong
+    to sessions removed with their application. The deletes are only flushed:
+    the caller's task commits them, so its row lock is held until then. If
+    that commit fails, the expired sessions are deleted on the next run.
+    """
+    now = datetime.utcnow()
+    expired = db.session.query(UploadSession.id).filter(UploadSession.expires_at < now).all()
+    if expired:
+        ids = [row.id for row in expired]
+        _delete_sessions(ids)
+        db.session.flush()
+        for upload_id in ids:
+            _remove(os.path.join(temp_dir(), f'upload-{upload_id}'))
+
+    cutoff = time.time() - current_app.config['UPLOAD_SESSION_TTL_HOURS'] * 3600
+    with os.scandir(temp_dir()) as entries:
+        for entry in entries:
+            if entry.name.startswith('upload-') and entry.stat().st_mtime < cutoff:
+                _remove(entry.path)
+
+
+def _delete_sessions(ids):
+    """Delete session rows and their chunk records."""
+    db.session.execute(delete(UploadChunk).where(UploadChunk.upload_id.in_(ids)))
+    db.session.execute(
+        delete(UploadSession).where(UploadSession.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
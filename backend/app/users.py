@@ -0,0 +1,48 @@
+"""Per-worker cache of user profiles.
+
+`/api/auth/me` runs on every SPA load, so User.to_dict() is cached in each
+process for USER_CACHE_TTL seconds, keeping the USER_CACHE_SIZE most recently
+used users. auth.callback invalidates the entry in the process that handled
+the login; other workers pick up the change when their entry expires.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+from .database import db
+from .models import User
+
+_cache = OrderedDict()  # user_id -> (expires_at, to_dict())
+_lock = threading.Lock()
+
+
+def get_user_dict(user_id):
+    """User.to_dict() for `user_id`, or None if the user does not exist."""
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(user_id)
+        if entry and entry[0] > now:
+            _cache.move_to_end(user_id)
+            return entry[1]
+
+    user = db.session.get(User, user_id)
+    if not user:
+        invalidate_user(user_id)
+        return None
+    data = user.to_dict()
+
+    ttl = current_app.config['USER_CACHE_TTL']
+    if ttl > 0:
+        with _lock:
+            _cache[user_id] = (now + ttl, data)
+            _cache.move_to_end(user_id)
+            while len(_cache) > current_app.config['USER_CACHE_SIZE']:
+                _cache.popitem(last=False)
+    return data
+
+
+def invalidate_user(user_id):
+    """Drop a user's cached profile in this process."""
+    with _lock:
+        _cache.pop(user_id, None)
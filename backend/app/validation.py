@@ -0,0 +1,88 @@
+from datetime import datetime, date
+
+from .duplicates import fingerprint
+
+
+def application_values(data):
+    """Validate a create payload and return the JobApplication column values.
+
+    Raises ValueError with a client-facing message when the payload is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
+
+    # Validate required fields
+    if not data.get('company_name'):
+        raise ValueError('company_name is required')
+    if not data.get('position_title'):
+        raise ValueError('position_title is required')
+    for name in ('company_name', 'position_title'):
+        if not isinstance(data[name], str):
+            raise ValueError(f'{name} must be a string')
+    
+    # Parse application_date if provided
+    application_date = date.today()
+    if data.get('application_date'):
+        try:
+            application_date = datetime.fromisoformat(data['application_date']).date()
+        except (TypeError, ValueError):
+            raise ValueError('Invalid date format. Use YYYY-MM-DD')
+    
+    return {
+        'company_name': data['company_name'],
+        'position_title': data['position_title'],
+        'location': data.get('location'),
+        'job_type': data.get('job_type'),
+        'job_level': data.get('job_level'),
+        'application_date': application_date,
+        'status': data.get('status', 'Applied'),
+        'job_description': data.get('job_description'),
+        'notes': data.get('notes'),
+        'fingerprint': fingerprint(data['company_name'], data['position_title'])
+    }
+
+
+# Pipeline statuses offered by the frontend
+STATUSES = ('Applied', 'Interviewing', 'Offered', 'Rejected', 'Withdrawn')
+
+# Fields a batch patch may set on many applications at once
+BATCH_PATCH_FIELDS = ('status', 'job_type', 'job_level', 'location', 'application_date')
+
+# Maximum ids accepted by one batch request
+MAX_BATCH_IDS = 1000
+
+
+def batch_ids(data):
+    """Validate the `ids` list of a batch request."""
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('ids must be a non-empty list')
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValueError(f'At most {MAX_BATCH_IDS} ids per batch')
+    if not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        raise ValueError('ids must be integers')
+    return list(set(ids))
+
+
+def batch_patch_values(patch):
+    """Validate a batch patch and return the column values to set."""
+    if not isinstance(patch, dict) or not patch:
+        raise ValueError('patch must be a non-empty object')
+    unknown = [key for key in patch if key not in BATCH_PATCH_FIELDS]
+    if unknown:
+        raise ValueError(f"Fields cannot be batch updated: {', '.join(unknown)}")
+    if 'status' in patch and not patch['status']:
+        raise ValueError('status cannot be empty')
+    if 'status' in patch and patch['status'] not in STATUSES:
+        raise ValueError(f"status must be one of: {', '.join(STATUSES)}")
+    for name in ('job_type', 'job_level', 'location'):
+        if patch.get(name) is not None and not isinstance(patch[name], str):
+            raise ValueError(f'{name} must be a string or null')
+
+    values = dict(patch)
+    if 'application_date' in values:
+        try:
+            values['application_date'] = datetime.fromisoformat(values['application_date']).date()
+        except (TypeError, ValueError):
+            raise ValueError('Invalid date format. Use YYYY-MM-DD')
+    return values
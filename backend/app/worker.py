@@ -0,0 +1,63 @@
+"""Background task worker.
+
+Run with `python -m app.worker`; any number of workers can share the queue.
+"""
+import logging
+import signal
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+
+from . import app
+from .database import db
+from .tasks import handler, enqueue, run_next, schedule_once
+from .documents import sweep_blobs
+from .uploads import expire_uploads
+from .extraction import prune_texts
+from .migrate import run_migrations
+
+logger = logging.getLogger(__name__)
+
+
+@handler('sweep_orphans')
+def sweep_orphans():
+    """Expire stale upload sessions and remove unreferenced files and text, then reschedule."""
+    expire_uploads()
+    grace = current_app.config['ORPHAN_GRACE_PERIOD']
+    removed = sweep_blobs(grace)
+    if removed:
+        logger.info('Removed %s orphaned files', removed)
+    prune_texts(grace)
+    interval = timedelta(seconds=current_app.config['ORPHAN_SWEEP_INTERVAL'])
+    enqueue('sweep_orphans', run_at=datetime.utcnow() + interval)
+
+
+def run_worker():
+    """Process tasks until SIGTERM/SIGINT, polling while the queue is empty."""
+    stopping = []
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stopping.append(True))
+
+    with app.app_context():
+        # Safe alongside gunicorn's run; the advisory lock serialises them
+        run_migrations()
+        schedule_once('sweep_orphans')
+        db.session.commit()
+
+        poll_interval = current_app.config['WORKER_POLL_INTERVAL']
+        logger.info('Worker started')
+        while not stopping:
+            try:
+                if run_next():
+                    continue
+            except Exception:
+                # Database unavailable or similar; back off and retry
+                db.session.rollback()
+                logger.exception('Worker loop error')
+            time.sleep(poll_interval)
+        logger.info('Worker stopped')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    run_worker()
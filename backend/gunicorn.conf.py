@@ -1,9 +1,76 @@
 # Gunicorn configuration file
+import glob
+import os
+import shutil
+import subprocess
+import sys
+
+# Workers write Prometheus samples here so /api/metrics can aggregate them; must be
+# set before prometheus_client is imported
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
 
 bind = "0.0.0.0:5000"
-workers = 4
-worker_class = "sync"
-timeout = 30
+
+# Worker model: "gevent" (default) runs many cooperative greenlets per process,
+# "gthread" serves GUNICORN_THREADS requests per process, "sync" handles one at a
+# time. Slow uploads and the OAuth callback's outbound call only hold a greenlet
+# (or thread) instead of a whole process. Keep DB_POOL_SIZE in line with the
+# concurrency per process (see config.py).
+# /api/events is only served under gevent: a stream stays open for
+# EVENTS_MAX_SECONDS, which would pin a sync worker past `timeout` (and get it
+# killed) or use up gthread's few threads. Other worker classes answer it with 503.
+workers = int(os.environ.get("GUNICORN_WORKERS", 4))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+# Gunicorn silently turns "sync" into "gthread" when threads > 1
+threads = int(os.environ.get("GUNICORN_THREADS", 8)) if worker_class == "gthread" else 1
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 100))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
+
+
+def on_starting(server):
+    """Reset metrics from the last run, then apply pending migrations before any worker forks.
+
+    Migrations run in a child process: importing the app here would load ssl
+    into the master before gevent workers monkey-patch it after forking, which
+    breaks outbound HTTPS (e.g. the OAuth callback) in every worker.
+    """
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+    if os.environ.get("MIGRATE_ON_START", "1") != "1":
+        return
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", "migrate"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        check=True
+    )
+
+
+def post_fork(server, worker):
+    """Tell the app its worker class; make psycopg2 cooperative under gevent."""
+    # The command line may override worker_class, so use the resolved setting
+    os.environ["SERVER_WORKER_CLASS"] = server.cfg.worker_class_str
+    if server.cfg.worker_class_str == "gevent":
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            # psycopg2 is absent when running against SQLite
+            return
+        patch_psycopg()
+
+
+def child_exit(server, worker):
+    """Stop aggregating live-only samples from a dead worker.
+
+    Same as prometheus_client.multiprocess.mark_process_dead, which the master
+    cannot import: prometheus_client pulls in ssl (see on_starting).
+    """
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    for path in glob.glob(os.path.join(metrics_dir, f"gauge_live*_{worker.pid}.db")):
+        os.remove(path)
@@ -0,0 +1,20 @@
+-- Resumable chunked uploads
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    id VARCHAR(32) PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    application_id INTEGER NOT NULL REFERENCES job_applications(id) ON DELETE CASCADE,
+    doc_type VARCHAR(20) NOT NULL,
+    filename VARCHAR(200) NOT NULL,
+    size BIGINT NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc'),
+    expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_expires_at ON upload_sessions(expires_at);
+
+CREATE TABLE IF NOT EXISTS upload_chunks (
+    upload_id VARCHAR(32) NOT NULL REFERENCES upload_sessions(id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    PRIMARY KEY (upload_id, chunk_index)
+);
@@ -0,0 +1,18 @@
+-- Text extracted from uploaded documents, keyed by content hash and searchable
+CREATE TABLE IF NOT EXISTS document_texts (
+    sha256 VARCHAR(64) PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,
+    content TEXT NOT NULL DEFAULT '',
+    extracted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc')
+);
+
+ALTER TABLE document_texts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', content)) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_document_texts_search ON document_texts USING GIN (search_vector);
+
+-- Existing documents are queued for extraction
+INSERT INTO tasks (kind, payload)
+SELECT 'extract_text', json_build_object('sha256', d.sha256)
+FROM documents d
+WHERE NOT EXISTS (SELECT 1 FROM document_texts t WHERE t.sha256 = d.sha256);
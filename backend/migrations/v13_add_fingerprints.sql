@@ -0,0 +1,15 @@
+-- Normalized company/position key for duplicate detection and upserts
+ALTER TABLE job_applications ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(400);
+
+CREATE INDEX IF NOT EXISTS ix_job_applications_user_fingerprint ON job_applications(user_id, fingerprint);
+
+-- Trigram similarity within one user's rows; btree_gin lets user_id share the GIN index
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+CREATE INDEX IF NOT EXISTS ix_job_applications_user_fingerprint_trgm
+    ON job_applications USING GIN (user_id, fingerprint gin_trgm_ops);
+
+-- Existing rows are fingerprinted by the worker, which owns the normalization rules
+INSERT INTO tasks (kind, payload)
+SELECT 'backfill_fingerprints', '{}'
+WHERE NOT EXISTS (SELECT 1 FROM tasks WHERE kind = 'backfill_fingerprints');
@@ -0,0 +1,2 @@
+-- Collection validator the cached summary was computed from; rows without one are recomputed
+ALTER TABLE user_stats_cache ADD COLUMN IF NOT EXISTS version VARCHAR(40);
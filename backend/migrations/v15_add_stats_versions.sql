@@ -0,0 +1,6 @@
+-- Per-user counter bumped by every write that affects /api/stats; the cached
+-- summary records the counter it was computed at instead of a collection ETag
+ALTER TABLE users ADD COLUMN IF NOT EXISTS stats_version INTEGER NOT NULL DEFAULT 0;
+
+DELETE FROM user_stats_cache;
+ALTER TABLE user_stats_cache ALTER COLUMN version TYPE INTEGER USING NULL;
@@ -0,0 +1,8 @@
+-- Composite indexes backing keyset pagination and server-side filters
+CREATE INDEX IF NOT EXISTS ix_job_applications_user_date_id ON job_applications(user_id, application_date, id);
+CREATE INDEX IF NOT EXISTS ix_job_applications_user_status_date_id ON job_applications(user_id, status, application_date, id);
+CREATE INDEX IF NOT EXISTS ix_job_applications_user_updated_id ON job_applications(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS ix_job_applications_user_company_id ON job_applications(user_id, company_name, id);
+
+-- Case-insensitive company prefix search (LIKE 'acme%')
+CREATE INDEX IF NOT EXISTS ix_job_applications_user_company_prefix ON job_applications(user_id, lower(company_name) text_pattern_ops);
@@ -0,0 +1,8 @@
+-- Tombstones for deleted applications, read by GET /api/applications/changes
+CREATE TABLE IF NOT EXISTS deleted_applications (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id),
+    deleted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc')
+);
+
+CREATE INDEX IF NOT EXISTS ix_deleted_applications_user_deleted_at ON deleted_applications(user_id, deleted_at);
@@ -0,0 +1,15 @@
+-- Full-text search over company, position, notes and description
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE job_applications ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(company_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(position_title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(notes, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(job_description, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_job_applications_search ON job_applications USING GIN (search_vector);
+
+-- Trigram index for fuzzy company name matching
+CREATE INDEX IF NOT EXISTS ix_job_applications_company_trgm ON job_applications USING GIN (lower(company_name) gin_trgm_ops);
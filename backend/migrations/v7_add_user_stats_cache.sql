@@ -0,0 +1,6 @@
+-- Cached per-user pipeline summary served by GET /api/stats
+CREATE TABLE IF NOT EXISTS user_stats_cache (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id),
+    payload JSON NOT NULL,
+    computed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc')
+);
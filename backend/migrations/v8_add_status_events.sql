@@ -0,0 +1,20 @@
+-- Append-only status history for time-in-stage analytics
+CREATE TABLE IF NOT EXISTS application_status_events (
+    id SERIAL PRIMARY KEY,
+    application_id INTEGER NOT NULL REFERENCES job_applications(id) ON DELETE CASCADE,
+    user_id INTEGER REFERENCES users(id),
+    from_status VARCHAR(50),
+    to_status VARCHAR(50) NOT NULL,
+    occurred_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc')
+);
+
+CREATE INDEX IF NOT EXISTS ix_application_status_events_user_occurred ON application_status_events(user_id, occurred_at);
+CREATE INDEX IF NOT EXISTS ix_application_status_events_application ON application_status_events(application_id);
+
+-- Seed history with each existing application's current status
+INSERT INTO application_status_events (application_id, user_id, from_status, to_status, occurred_at)
+SELECT ja.id, ja.user_id, NULL, ja.status, ja.created_at
+FROM job_applications ja
+WHERE NOT EXISTS (
+    SELECT 1 FROM application_status_events e WHERE e.application_id = ja.id
+);
@@ -0,0 +1,15 @@
+-- Content-addressed, reference-counted document store
+CREATE TABLE IF NOT EXISTS documents (
+    id SERIAL PRIMARY KEY,
+    sha256 VARCHAR(64) UNIQUE NOT NULL,
+    size BIGINT NOT NULL,
+    path VARCHAR(500) NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc')
+);
+
+ALTER TABLE job_applications ADD COLUMN IF NOT EXISTS resume_document_id INTEGER REFERENCES documents(id);
+ALTER TABLE job_applications ADD COLUMN IF NOT EXISTS cover_letter_document_id INTEGER REFERENCES documents(id);
+
+CREATE INDEX IF NOT EXISTS ix_job_applications_resume_document ON job_applications(resume_document_id);
+CREATE INDEX IF NOT EXISTS ix_job_applications_cover_letter_document ON job_applications(cover_letter_document_id);
@@ -0,0 +1,47 @@
+import itertools
+import os
+import tempfile
+
+import pytest
+
+_data_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_data_dir, 'test.sqlite')
+os.environ['UPLOAD_DIR'] = os.path.join(_data_dir, 'uploads')
+
+from app import app  # noqa: E402
+from app.database import db  # noqa: E402
+from app.migrate import run_migrations  # noqa: E402
+from app.models import User  # noqa: E402
+
+_user_ids = itertools.count(1)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def database():
+    app.config['TESTING'] = True
+    with app.app_context():
+        run_migrations()
+    return db
+
+
+@pytest.fixture
+def make_client():
+    """Return a function creating a new user and a test client logged in as them."""
+    def make():
+        number = next(_user_ids)
+        with app.app_context():
+            user = User(google_id=f'g{number}', email=f'user{number}@example.com', name=f'User {number}')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['user_id'] = user_id
+        client.user_id = user_id
+        return client
+    return make
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
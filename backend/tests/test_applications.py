@@ -0,0 +1,392 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import app, exporter, stats
+from app.database import db
+from app.models import ApplicationStatusEvent, JobApplication
+
+
+@pytest.mark.parametrize('name', ['company_name', 'position_title'])
+def test_create_rejects_non_string_fields(client, name):
+    payload = {'company_name': 'Acme', 'position_title': 'Engineer', name: 42}
+    response = client.post('/api/applications', json=payload)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == f'{name} must be a string'
+
+
+def test_update_rejects_non_string_fields(client):
+    created = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'})
+    assert created.status_code == 201
+    response = client.put(f"/api/applications/{created.get_json()['id']}", json={'company_name': True})
+    assert response.status_code == 400
+
+
+def test_import_reports_non_string_row(client):
+    body = '{"company_name": 7, "position_title": "Engineer"}\n{"company_name": "Acme", "position_title": "Engineer"}\n'
+    response = client.post('/api/applications/import?format=ndjson', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report['imported'] == 1
+    assert report['errors'] == [{'row': 1, 'error': 'company_name must be a string'}]
+
+
+def test_import_strips_byte_order_mark(client):
+    body = '﻿company_name,position_title\nBomCo,Engineer\n'.encode('utf-8')
+    response = client.post('/api/applications/import?format=csv', data=body, content_type='text/csv')
+    assert response.status_code == 200
+    assert response.get_json()['imported'] == 1
+    with app.app_context():
+        assert JobApplication.query.filter_by(company_name='BomCo').count() == 1
+
+
+def test_import_reports_progress_when_body_breaks_off(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'IMPORT_BATCH_SIZE', 2)
+    rows = ''.join(f'Broken {i},Engineer\n' for i in range(3)).encode('utf-8')
+    body = b'company_name,position_title\n' + rows + b'\xff\xfe,Engineer\n'
+    response = client.post('/api/applications/import?format=csv', data=body, content_type='text/csv')
+    assert response.status_code == 400
+    report = response.get_json()
+    assert report['imported'] == 3
+    assert report['row'] == 5
+    assert 'utf-8' in report['error']
+
+
+def test_import_saves_every_batch_and_reports_bad_rows(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'IMPORT_BATCH_SIZE', 2)
+    body = ''.join(
+        f'{{"company_name": "Imported {i}", "position_title": "Engineer", "application_date": "2024-02-0{i + 1}"}}\n'
+        for i in range(5)
+    ) + '{"company_name": "Dated", "position_title": "Engineer", "application_date": "soon"}\n'
+    response = client.post('/api/applications/import', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report['imported'] == 5
+    assert report['errors'] == [{'row': 6, 'error': 'Invalid date format. Use YYYY-MM-DD'}]
+    assert len(client.get('/api/applications').get_json()['items']) == 5
+
+
+def test_import_rejects_unknown_format_and_oversized_body(client, monkeypatch):
+    response = client.post('/api/applications/import?format=xlsx', data=b'x')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'format must be csv or ndjson'
+
+    monkeypatch.setitem(app.config, 'IMPORT_MAX_SIZE', 10)
+    response = client.post('/api/applications/import?format=csv', data=b'company_name,position_title\n', content_type='text/csv')
+    assert response.status_code == 413
+
+
+def test_export_streams_filtered_applications(client):
+    for day, status in ((2, 'Applied'), (1, 'Applied'), (3, 'Rejected')):
+        client.post('/api/applications', json={
+            'company_name': f'Export {day}', 'position_title': 'Engineer', 'status': status,
+            'application_date': f'2024-04-0{day}'
+        })
+
+    response = client.get('/api/applications/export?format=csv&status=Applied')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'].startswith('attachment; filename="applications-')
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['company_name'] for row in rows] == ['Export 1', 'Export 2']
+    assert list(rows[0]) == list(exporter.EXPORT_FIELDS)
+
+    ndjson = client.get('/api/applications/export?format=ndjson&include_documents=1').get_data(as_text=True)
+    records = [json.loads(line) for line in ndjson.splitlines()]
+    assert len(records) == 3
+    assert records[0]['resume_filename'] is None
+
+
+def test_export_can_be_imported_again(client, make_client):
+    client.post('/api/applications', json={'company_name': 'Round, "Trip"', 'position_title': 'Engineer', 'notes': 'a\nb'})
+    body = client.get('/api/applications/export?format=csv').data
+
+    other = make_client()
+    assert other.post('/api/applications/import?format=csv', data=body, content_type='text/csv').get_json()['imported'] == 1
+    [item] = other.get('/api/applications?fields=company_name,notes').get_json()['items']
+    assert (item['company_name'], item['notes']) == ('Round, "Trip"', 'a\nb')
+
+
+@pytest.mark.parametrize('query, error', [
+    ('format=xml', 'format must be csv or ndjson'),
+    ('date_to=tomorrow', 'Invalid date_to. Use YYYY-MM-DD'),
+])
+def test_export_rejects_bad_parameters(client, query, error):
+    response = client.get(f'/api/applications/export?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+
+
+def test_list_is_modified_after_delete(client):
+    created = client.post('/api/applications', json={'company_name': 'Gone', 'position_title': 'Engineer'})
+    with app.app_context():
+        # Back-date every row so the delete lands in a later second
+        JobApplication.query.update({'updated_at': datetime.utcnow() - timedelta(minutes=1)})
+        db.session.commit()
+    last_modified = client.get('/api/applications').headers['Last-Modified']
+    assert client.get('/api/applications', headers={'If-Modified-Since': last_modified}).status_code == 304
+
+    assert client.delete(f"/api/applications/{created.get_json()['id']}").status_code == 200
+    assert client.get('/api/applications', headers={'If-Modified-Since': last_modified}).status_code == 200
+
+
+def test_stats_are_cached_until_a_write(client):
+    client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'})
+    first = client.get('/api/stats').get_json()
+    assert client.get('/api/stats').get_json()['computed_at'] == first['computed_at']
+
+    client.post('/api/applications', json={'company_name': 'Beta', 'position_title': 'Engineer'})
+    assert client.get('/api/stats').get_json()['total'] == first['total'] + 1
+
+
+def test_stats_computed_alongside_a_write_are_not_served(client, monkeypatch):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    compute_stats = stats.compute_stats
+
+    def compute_then_write(user_id):
+        payload = compute_stats(user_id)
+        # Another request commits a change before this summary is stored
+        monkeypatch.setattr(stats, 'compute_stats', compute_stats)
+        assert client.put(f'/api/applications/{app_id}', json={'status': 'Offered'}).status_code == 200
+        return payload
+    monkeypatch.setattr(stats, 'compute_stats', compute_then_write)
+
+    assert client.get('/api/stats').get_json()['by_status'] == {'Applied': 1}
+    assert client.get('/api/stats').get_json()['by_status'] == {'Offered': 1}
+
+
+def test_stats_aggregate_the_users_pipeline(client, make_client):
+    for status, job_type in (('Applied', 'Full-time'), ('Interviewing', 'Full-time'), ('Rejected', 'Contract')):
+        client.post('/api/applications', json={
+            'company_name': 'Acme', 'position_title': 'Engineer', 'status': status,
+            'job_type': job_type, 'application_date': '2024-03-06'
+        })
+    make_client().post('/api/applications', json={'company_name': 'Other', 'position_title': 'Engineer'})
+
+    summary = client.get('/api/stats').get_json()
+    assert summary['total'] == 3
+    assert summary['response_rate'] == 0.6667
+    assert summary['per_week'] == [{'week': '2024-03-04', 'count': 3}]
+    by_type = {row['value']: (row['total'], row['responded']) for row in summary['response_rate_by_job_type']}
+    assert by_type == {'Full-time': (2, 1), 'Contract': (1, 1)}
+
+
+def test_stats_require_login():
+    response = app.test_client().get('/api/stats')
+    assert response.status_code == 401
+    assert response.get_json()['authenticated'] is False
+
+
+def test_duplicates_groups_matching_applications(client):
+    first = client.post('/api/applications', json={'company_name': 'Acme Inc.', 'position_title': 'Sr. SWE'})
+    second = client.post('/api/applications', json={'company_name': 'ACME', 'position_title': 'Senior Software Engineer'})
+    client.post('/api/applications', json={'company_name': 'Other', 'position_title': 'Designer'})
+
+    response = client.get('/api/applications/duplicates')
+    assert response.status_code == 200
+    groups = response.get_json()['groups']
+    assert [sorted(item['id'] for item in group['items']) for group in groups] == [
+        sorted([first.get_json()['id'], second.get_json()['id']])
+    ]
+
+
+@pytest.mark.parametrize('query, error', [
+    ('limit=abc', 'limit must be an integer'),
+    ('id=foo', 'id must be an integer'),
+    ('threshold=2', 'threshold must be a number between 0 and 1'),
+])
+def test_duplicates_rejects_bad_parameters(client, query, error):
+    response = client.get(f'/api/applications/duplicates?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+
+
+def test_duplicates_of_another_users_application_is_not_found(client, make_client):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    assert make_client().get(f'/api/applications/duplicates?id={app_id}').status_code == 404
+
+
+def test_upsert_updates_the_matching_application(client):
+    created = client.post('/api/applications', json={'company_name': 'Acme LLC', 'position_title': 'Engineer'})
+    upserted = client.post('/api/applications?upsert=1', json={
+        'company_name': 'acme', 'position_title': 'engineer', 'status': 'Interviewing'
+    })
+    assert upserted.status_code == 200
+    assert upserted.get_json()['id'] == created.get_json()['id']
+    assert upserted.get_json()['status'] == 'Interviewing'
+
+
+def create_many(client, count):
+    return [
+        client.post('/api/applications', json={'company_name': f'Batch {i}', 'position_title': 'Engineer'}).get_json()['id']
+        for i in range(count)
+    ]
+
+
+def test_batch_updates_own_applications_only(client, make_client):
+    ids = create_many(client, 2)
+    foreign = create_many(make_client(), 1)
+    response = client.post('/api/applications/batch', json={
+        'ids': ids + foreign, 'patch': {'status': 'Interviewing', 'application_date': '2024-03-01'}
+    })
+    assert response.status_code == 200
+    assert response.get_json() == {'ids': sorted(ids), 'missing': foreign}
+    updated = client.get(f'/api/applications/{ids[0]}').get_json()
+    assert (updated['status'], updated['application_date']) == ('Interviewing', '2024-03-01')
+
+
+def test_batch_delete(client):
+    ids = create_many(client, 2)
+    response = client.post('/api/applications/batch', json={'ids': ids, 'action': 'delete'})
+    assert response.status_code == 200
+    assert response.get_json()['ids'] == sorted(ids)
+    assert client.get(f'/api/applications/{ids[0]}').status_code == 404
+
+
+@pytest.mark.parametrize('patch, error', [
+    ({'status': ['x']}, 'status must be one of'),
+    ({'status': 'Ghosted'}, 'status must be one of'),
+    ({'application_date': 5}, 'Invalid date format'),
+    ({'location': {'city': 'Berlin'}}, 'location must be a string or null'),
+    ({'notes': 'x'}, 'Fields cannot be batch updated: notes'),
+])
+def test_batch_rejects_invalid_values(client, patch, error):
+    ids = create_many(client, 1)
+    response = client.post('/api/applications/batch', json={'ids': ids, 'patch': patch})
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith(error)
+
+
+def test_batch_rejects_bad_ids(client):
+    response = client.post('/api/applications/batch', json={'ids': ['1'], 'patch': {'status': 'Applied'}})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'ids must be integers'
+
+
+def test_time_in_status_counts_from_the_last_status_change(client):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    with app.app_context():
+        ApplicationStatusEvent.query.filter_by(application_id=app_id).update(
+            {'occurred_at': datetime.utcnow() - timedelta(days=10)}
+        )
+        db.session.commit()
+    # Editing notes does not restart the stage
+    assert client.put(f'/api/applications/{app_id}', json={'notes': 'Followed up'}).status_code == 200
+
+    [applied] = client.get('/api/stats').get_json()['time_in_status']
+    assert applied['status'] == 'Applied'
+    assert 9.9 < applied['avg_days'] < 10.1
+
+
+def test_list_pages_through_every_application(client):
+    for day in (3, 1, 2, 2):
+        client.post('/api/applications', json={
+            'company_name': f'Day {day}', 'position_title': 'Engineer', 'application_date': f'2024-05-0{day}'
+        })
+    seen, cursor = [], None
+    while True:
+        page = client.get('/api/applications', query_string={'limit': 3, 'sort': 'application_date', 'cursor': cursor or ''})
+        assert page.status_code == 200
+        body = page.get_json()
+        seen += [item['application_date'] for item in body['items']]
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    assert seen == ['2024-05-01', '2024-05-02', '2024-05-02', '2024-05-03']
+
+
+def test_list_filters_on_the_server(client):
+    client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer', 'status': 'Offered'})
+    client.post('/api/applications', json={'company_name': 'Acme_Labs', 'position_title': 'Engineer'})
+    client.post('/api/applications', json={'company_name': 'AcmeXLabs', 'position_title': 'Engineer'})
+
+    offered = client.get('/api/applications?status=Offered,Rejected').get_json()['items']
+    assert [item['company_name'] for item in offered] == ['Acme']
+    # LIKE wildcards in the prefix match literally
+    labs = client.get('/api/applications?company=acme_').get_json()['items']
+    assert [item['company_name'] for item in labs] == ['Acme_Labs']
+
+
+@pytest.mark.parametrize('query, error', [
+    ('cursor=nonsense', 'Invalid cursor'),
+    ('sort=salary', 'Invalid sort. Use one of: application_date, updated_at, company_name'),
+    ('date_from=May', 'Invalid date_from. Use YYYY-MM-DD'),
+])
+def test_list_rejects_bad_parameters(client, query, error):
+    response = client.get(f'/api/applications?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+
+
+def test_fields_limit_the_returned_columns(client):
+    app_id = client.post('/api/applications', json={
+        'company_name': 'Acme', 'position_title': 'Engineer', 'job_description': 'x' * 1000
+    }).get_json()['id']
+
+    [item] = client.get('/api/applications?fields=company_name,status').get_json()['items']
+    assert item == {'id': app_id, 'company_name': 'Acme', 'status': 'Applied'}
+    summary = client.get(f'/api/applications/{app_id}?view=summary').get_json()
+    assert set(summary) == set(JobApplication.SUMMARY_FIELDS)
+    assert 'job_description' in client.get(f'/api/applications/{app_id}').get_json()
+
+
+def test_fields_rejects_unknown_columns(client):
+    response = client.get('/api/applications?fields=company_name,salary,password')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Unknown fields: salary, password'
+
+
+def test_application_etag_changes_with_the_row_and_representation(client):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    etag = client.get(f'/api/applications/{app_id}').headers['ETag']
+    assert client.get(f'/api/applications/{app_id}', headers={'If-None-Match': etag}).status_code == 304
+    # Flask-Compress suffixes the tag it sends with the encoding
+    assert client.get(f'/api/applications/{app_id}', headers={'If-None-Match': etag[:-1] + ':br"'}).status_code == 304
+    assert client.get(f'/api/applications/{app_id}?view=summary', headers={'If-None-Match': etag}).status_code == 200
+
+    assert client.put(f'/api/applications/{app_id}', json={'status': 'Offered'}).status_code == 200
+    response = client.get(f'/api/applications/{app_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+
+def test_list_etag_answers_unchanged_polls(client, make_client):
+    client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'})
+    etag = client.get('/api/applications').headers['ETag']
+    # Another user's writes do not change this user's list
+    make_client().post('/api/applications', json={'company_name': 'Other', 'position_title': 'Engineer'})
+    assert client.get('/api/applications', headers={'If-None-Match': etag}).status_code == 304
+
+    client.post('/api/applications', json={'company_name': 'Beta', 'position_title': 'Engineer'})
+    assert client.get('/api/applications', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_conditional_get_of_another_users_application_is_not_found(client, make_client):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    etag = client.get(f'/api/applications/{app_id}').headers['ETag']
+    assert make_client().get(f'/api/applications/{app_id}', headers={'If-None-Match': etag}).status_code == 404
+
+
+def test_timeline_records_each_status_change(client):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    client.put(f'/api/applications/{app_id}', json={'status': 'Interviewing'})
+    client.put(f'/api/applications/{app_id}', json={'status': 'Interviewing', 'notes': 'Same stage'})
+    client.put(f'/api/applications/{app_id}', json={'status': 'Offered'})
+
+    timeline = client.get(f'/api/applications/{app_id}/timeline').get_json()
+    assert [(event['from_status'], event['to_status']) for event in timeline] == [
+        (None, 'Applied'), ('Applied', 'Interviewing'), ('Interviewing', 'Offered')
+    ]
+    assert timeline[0]['ended_at'] == timeline[1]['occurred_at']
+    assert timeline[-1]['ended_at'] is None
+
+    stages = {row['status']: (row['count'], row['completed']) for row in client.get('/api/stats/stages').get_json()}
+    assert stages == {'Applied': (1, 1), 'Interviewing': (1, 1), 'Offered': (1, 0)}
+
+
+def test_timeline_of_another_users_application_is_not_found(client, make_client):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    assert make_client().get(f'/api/applications/{app_id}/timeline').status_code == 404
@@ -0,0 +1,50 @@
+import json
+import os
+import runpy
+import subprocess
+import sys
+
+BENCHMARK = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts', 'benchmark.py'
+)
+
+
+def run_benchmark(*args):
+    # A clean environment, so the script seeds its own scratch database
+    env = {key: value for key, value in os.environ.items() if key not in ('DATABASE_URL', 'UPLOAD_DIR')}
+    return subprocess.run([sys.executable, BENCHMARK, *args], env=env, capture_output=True, text=True, timeout=300)
+
+
+def test_benchmark_reports_every_scenario_without_errors(tmp_path):
+    output = tmp_path / 'bench.json'
+    result = run_benchmark(
+        '--users', '2', '--applications', '20', '--description-size', '200', '--documents', '2',
+        '--document-size', '1024', '--requests', '5', '--output', str(output)
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(output.read_text())
+    assert report['meta']['mode'] == 'test_client'
+    assert report['meta']['seed']['applications_per_user'] == 20
+    assert {'list_filtered', 'duplicates', 'download_resume'} <= set(report['results'])
+    for name, scenario in report['results'].items():
+        assert scenario['errors'] == 0, name
+        assert scenario['p50_ms'] <= scenario['p99_ms']
+
+    compared = run_benchmark('--compare', str(output), str(output))
+    assert compared.returncode == 0, compared.stderr
+    assert '+0.0%' in compared.stdout
+
+
+def test_failed_requests_are_counted_as_errors():
+    benchmark = runpy.run_path(BENCHMARK)
+
+    class Driver:
+        def request(self, method, path, body):
+            if path == 'refused':
+                raise ConnectionRefusedError
+            return 500 if path == 'broken' else 200
+
+    paths = iter(['ok', 'broken', 'refused', 'ok'])
+    summary = benchmark['run_scenario'](Driver(), 'GET', lambda: next(paths), None, requests=4, concurrency=1)
+    assert (summary['requests'], summary['errors']) == (4, 2)
+    assert 'p50_ms' in summary
@@ -0,0 +1,48 @@
+import importlib
+import os
+import runpy
+
+import pytest
+
+# app.config is shadowed by the `config` dict exported from the package
+config = importlib.import_module('app.config')
+
+GUNICORN_CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gunicorn.conf.py')
+
+
+@pytest.fixture
+def load_config(monkeypatch):
+    """Return a function re-reading app.config under the given environment."""
+    def load(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(config).Config
+    yield load
+    monkeypatch.undo()
+    importlib.reload(config)
+
+
+def test_postgres_pool_and_timeouts_come_from_the_environment(load_config):
+    Config = load_config(
+        DATABASE_URL='postgresql://user:secret@db/jobs', DB_POOL_SIZE='12', DB_MAX_OVERFLOW='0',
+        DB_POOL_TIMEOUT='3', DB_STATEMENT_TIMEOUT='2000', DB_LOCK_TIMEOUT='500'
+    )
+    options = Config.SQLALCHEMY_ENGINE_OPTIONS
+    assert (options['pool_size'], options['max_overflow'], options['pool_timeout']) == (12, 0, 3)
+    assert options['pool_pre_ping'] is True
+    assert options['connect_args'] == {'options': '-c statement_timeout=2000 -c lock_timeout=500'}
+
+
+def test_pool_size_follows_gunicorn_threads_and_sqlite_skips_pool_options(load_config, monkeypatch):
+    monkeypatch.delenv('DB_POOL_SIZE', raising=False)
+    assert load_config(DATABASE_URL='postgresql://db/jobs', GUNICORN_THREADS='6').DB_POOL_SIZE == 6
+    options = load_config(DATABASE_URL='sqlite://').SQLALCHEMY_ENGINE_OPTIONS
+    assert 'pool_size' not in options and 'connect_args' not in options
+
+
+@pytest.mark.parametrize('worker_class, threads', [('gthread', 6), ('gevent', 1), ('sync', 1)])
+def test_gunicorn_only_uses_threads_with_gthread(monkeypatch, worker_class, threads):
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', worker_class)
+    monkeypatch.setenv('GUNICORN_THREADS', '6')
+    settings = runpy.run_path(GUNICORN_CONF)
+    assert (settings['worker_class'], settings['threads']) == (worker_class, threads)
@@ -0,0 +1,163 @@
+import hashlib
+import io
+import os
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+from app import app, documents
+from app.database import db
+from app.documents import blob_path, collect_blobs
+from app.models import Document, JobApplication
+
+
+def create_application(client, company='Acme'):
+    response = client.post('/api/applications', json={'company_name': company, 'position_title': 'Engineer'})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def upload(client, app_id, content, filename='cv.pdf', doc_type='resume'):
+    return client.post(
+        f'/api/applications/{app_id}/{doc_type.replace("_", "-")}',
+        data={'file': (io.BytesIO(content), filename)},
+        content_type='multipart/form-data'
+    )
+
+
+def ref_count(sha256):
+    with app.app_context():
+        document = Document.query.filter_by(sha256=sha256).first()
+        return document.ref_count if document else 0
+
+
+def test_upload_stores_one_blob_per_content(client):
+    content = os.urandom(64)
+    sha256 = hashlib.sha256(content).hexdigest()
+    first, second = create_application(client), create_application(client)
+
+    assert upload(client, first, content).status_code == 200
+    assert upload(client, second, content, filename='copy.pdf').status_code == 200
+    assert ref_count(sha256) == 2
+
+    download = client.get(f'/api/applications/{second}/resume')
+    assert download.status_code == 200
+    assert download.data == content
+    assert client.get(f'/api/applications/{second}/resume', headers={'If-None-Match': f'"{sha256}"'}).status_code == 304
+
+
+def test_upload_rejects_disallowed_extension(client):
+    response = upload(client, create_application(client), b'#!/bin/sh', filename='run.sh')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'File type not allowed'
+
+
+def test_reuse_without_filename_keeps_previous_name(client):
+    content = os.urandom(64)
+    sha256 = hashlib.sha256(content).hexdigest()
+    source, target = create_application(client), create_application(client)
+    assert upload(client, source, content, filename='my_resume.pdf').status_code == 200
+
+    response = client.post(f'/api/applications/{target}/cover-letter/reuse', json={'sha256': sha256})
+    assert response.status_code == 200
+    assert response.get_json()['cover_letter_filename'] == 'my_resume.pdf'
+    assert ref_count(sha256) == 2
+
+    assert client.delete(f'/api/applications/{target}/cover-letter').status_code == 200
+    assert ref_count(sha256) == 1
+
+
+def test_reuse_with_filename(client):
+    content = os.urandom(64)
+    sha256 = hashlib.sha256(content).hexdigest()
+    source, target = create_application(client), create_application(client)
+    assert upload(client, source, content).status_code == 200
+
+    response = client.post(f'/api/applications/{target}/resume/reuse', json={'sha256': sha256, 'filename': 'renamed.pdf'})
+    assert response.status_code == 200
+    assert response.get_json()['resume_filename'] == 'renamed.pdf'
+
+
+def test_reuse_of_another_users_document_is_not_found(client, make_client):
+    content = os.urandom(64)
+    sha256 = hashlib.sha256(content).hexdigest()
+    assert upload(client, create_application(client), content).status_code == 200
+
+    other = make_client()
+    response = other.post(f'/api/applications/{create_application(other)}/resume/reuse', json={'sha256': sha256})
+    assert response.status_code == 404
+    assert ref_count(sha256) == 1
+
+
+def test_collect_blobs_checks_and_removes_under_the_blob_lock(client, monkeypatch):
+    content = os.urandom(64)
+    app_id = create_application(client)
+    assert upload(client, app_id, content).status_code == 200
+    with app.app_context():
+        kept = Document.query.filter_by(sha256=hashlib.sha256(content).hexdigest()).one().path
+        released = blob_path('f' * 64)
+        os.makedirs(os.path.dirname(released), exist_ok=True)
+        open(released, 'wb').close()
+
+        events = []
+        monkeypatch.setattr(documents, 'lock_blob', lambda sha256: events.append(('lock', sha256)))
+        real_remove = os.remove
+        monkeypatch.setattr(documents.os, 'remove', lambda path: (events.append(('remove', path)), real_remove(path)))
+        collect_blobs([released, kept])
+
+    assert os.path.exists(kept)
+    assert not os.path.exists(released)
+    assert ('lock', os.path.basename(kept)) in events
+    assert events.index(('lock', 'f' * 64)) < events.index(('remove', released))
+    assert ('remove', kept) not in events
+
+
+def test_download_last_modified_follows_the_attachment(client):
+    old, new = os.urandom(64), os.urandom(64)
+    app_id = create_application(client)
+    assert upload(client, create_application(client), old).status_code == 200
+    with app.app_context():
+        # The reused blob was first uploaded long ago
+        Document.query.filter_by(sha256=hashlib.sha256(old).hexdigest()).update(
+            {'created_at': datetime.utcnow() - timedelta(days=30)}
+        )
+        db.session.commit()
+    assert upload(client, app_id, new).status_code == 200
+    with app.app_context():
+        # Move the replacement back so the re-attach lands in a later second
+        JobApplication.query.filter_by(id=app_id).update({'updated_at': datetime.utcnow() - timedelta(minutes=1)})
+        db.session.commit()
+    replaced_at = client.get(f'/api/applications/{app_id}/resume').headers['Last-Modified']
+
+    reuse = client.post(f'/api/applications/{app_id}/resume/reuse', json={'sha256': hashlib.sha256(old).hexdigest()})
+    assert reuse.status_code == 200
+    response = client.get(f'/api/applications/{app_id}/resume', headers={'If-Modified-Since': replaced_at})
+    assert response.status_code == 200
+    assert response.data == old
+    assert parsedate_to_datetime(response.headers['Last-Modified']) >= parsedate_to_datetime(replaced_at)
+
+
+def test_accelerated_download_sets_headers_once(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'DOWNLOAD_ACCEL_PREFIX', '/protected-uploads/')
+    content = os.urandom(64)
+    app_id = create_application(client)
+    assert upload(client, app_id, content, filename='cv.pdf').status_code == 200
+
+    response = client.get(f'/api/applications/{app_id}/resume')
+    assert response.status_code == 200
+    assert response.headers['X-Accel-Redirect'].startswith('/protected-uploads/blobs/')
+    assert response.headers.getlist('Cache-Control') == ['private, no-cache']
+    assert response.headers['ETag'] == f'"{hashlib.sha256(content).hexdigest()}"'
+
+
+def test_download_serves_byte_ranges(client):
+    content = os.urandom(64)
+    app_id = create_application(client)
+    assert upload(client, app_id, content).status_code == 200
+
+    partial = client.get(f'/api/applications/{app_id}/resume', headers={'Range': 'bytes=10-19'})
+    assert partial.status_code == 206
+    assert partial.data == content[10:20]
+    assert partial.headers['Content-Range'] == 'bytes 10-19/64'
+    unsatisfiable = client.get(f'/api/applications/{app_id}/resume', headers={'Range': 'bytes=100-'})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers['Content-Range'] == 'bytes */64'
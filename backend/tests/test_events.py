@@ -0,0 +1,36 @@
+import os
+import runpy
+from types import SimpleNamespace
+
+from app import app
+
+GUNICORN_CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gunicorn.conf.py')
+
+
+def test_stream_starts_with_ready_and_delivers_changes(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'EVENTS_ENABLED', True)
+    monkeypatch.setitem(app.config, 'EVENTS_HEARTBEAT_SECONDS', 1)
+    monkeypatch.setitem(app.config, 'EVENTS_MAX_SECONDS', 5)
+    response = client.get('/api/events', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    chunks = iter(response.response)
+    assert 'event: ready' in next(chunks).decode()
+
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    assert next(chunks).decode() == f'event: created\ndata: {{"type": "created", "ids": [{app_id}]}}\n\n'
+    response.close()
+
+
+def test_stream_is_refused_when_disabled(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'EVENTS_ENABLED', False)
+    response = client.get('/api/events')
+    assert response.status_code == 503
+
+
+def test_gunicorn_reports_the_resolved_worker_class(monkeypatch):
+    monkeypatch.setenv('SERVER_WORKER_CLASS', 'unset')
+    config = runpy.run_path(GUNICORN_CONF)
+    server = SimpleNamespace(cfg=SimpleNamespace(worker_class_str='sync'))
+    config['post_fork'](server, None)
+    assert os.environ['SERVER_WORKER_CLASS'] == 'sync'
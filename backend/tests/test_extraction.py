@@ -0,0 +1,85 @@
+import hashlib
+import io
+import os
+import time
+
+import docx
+
+from app import app, extraction
+from app.database import db
+from app.documents import blob_path
+from app.extraction import extract_document_text, extract_file
+from app.models import Document, DocumentText, Task
+
+
+def _hang(path):
+    time.sleep(60)
+
+
+def add_document(sha256, content):
+    path = blob_path(sha256)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    db.session.add(Document(sha256=sha256, size=len(content), path=path, ref_count=1))
+    db.session.commit()
+
+
+def test_extract_file_reports_unsupported_and_failed(tmp_path):
+    legacy = tmp_path / 'old.doc'
+    legacy.write_bytes(b'\xd0\xcf\x11\xe0 legacy word')
+    broken = tmp_path / 'broken.pdf'
+    broken.write_bytes(b'%PDF-1.4 not really a pdf')
+    assert extract_file(str(legacy)) == ('unsupported', '')
+    assert extract_file(str(broken)) == ('failed', '')
+
+
+def test_timeout_kills_the_parse_and_is_cached(monkeypatch):
+    monkeypatch.setattr(extraction, 'extract_file', _hang)
+    monkeypatch.setitem(app.config, 'EXTRACT_TIMEOUT', 1)
+    monkeypatch.setitem(app.config, 'EXTRACT_PROCESSES', 1)
+    sha256 = 'e' * 64
+    with app.app_context():
+        add_document(sha256, b'%PDF-1.4 slow')
+        processes = []
+        real_reset = extraction.reset_pool
+
+        def reset():
+            processes.extend(extraction._pool._processes.values())
+            real_reset()
+        monkeypatch.setattr(extraction, 'reset_pool', reset)
+
+        started = time.monotonic()
+        extract_document_text(sha256)
+        db.session.commit()
+
+        assert time.monotonic() - started < 30
+        assert db.session.get(DocumentText, sha256).status == 'timeout'
+        assert extraction._pool is None
+        assert processes and not any(process.is_alive() for process in processes)
+        # Cached, so a retried task does not parse the file again
+        assert not extraction.needs_extraction(sha256)
+
+
+def test_uploaded_resume_text_is_searchable(client, tmp_path):
+    resume = docx.Document()
+    resume.add_paragraph('Maintained the Haskell compiler backend')
+    resume.save(tmp_path / 'cv.docx')
+    content = (tmp_path / 'cv.docx').read_bytes()
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    response = client.post(
+        f'/api/applications/{app_id}/resume',
+        data={'file': (io.BytesIO(content), 'cv.docx')},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 200
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    with app.app_context():
+        assert Task.query.filter_by(kind='extract_text').filter(Task.payload['sha256'].as_string() == sha256).count() == 1
+        extract_document_text(sha256)
+        db.session.commit()
+        assert db.session.get(DocumentText, sha256).status == 'extracted'
+
+    items = client.get('/api/applications/search?q=haskell').get_json()['items']
+    assert [item['id'] for item in items] == [app_id]
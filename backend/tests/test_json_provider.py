@@ -0,0 +1,48 @@
+from datetime import date, datetime
+
+import pytest
+from flask import Flask
+
+from app import app, json_provider
+from app.json_provider import IsoJSONProvider, OrjsonProvider, init_json
+
+PAYLOAD = {
+    'day': date(2024, 2, 29),
+    'moment': datetime(2024, 2, 29, 13, 5, 9, 120),
+    'whole_second': datetime(2024, 2, 29, 13, 5, 9),
+    'text': 'Café',
+    'nested': [{'count': 3, 'missing': None}],
+}
+
+
+@pytest.mark.parametrize('provider', [IsoJSONProvider, OrjsonProvider])
+def test_providers_encode_dates_like_to_dict(provider):
+    encoded = provider(app).loads(provider(app).dumps(PAYLOAD))
+    assert encoded == {
+        'day': '2024-02-29',
+        'moment': '2024-02-29T13:05:09.000120',
+        'whole_second': '2024-02-29T13:05:09',
+        'text': 'Café',
+        'nested': [{'count': 3, 'missing': None}],
+    }
+
+
+def test_list_rows_and_orm_objects_serialize_the_same(client):
+    app_id = client.post('/api/applications', json={
+        'company_name': 'Acme', 'position_title': 'Engineer', 'application_date': '2024-02-29'
+    }).get_json()['id']
+    [listed] = client.get('/api/applications').get_json()['items']
+    assert listed == client.get(f'/api/applications/{app_id}').get_json()
+    assert listed['application_date'] == '2024-02-29'
+
+
+def test_unknown_provider_is_rejected_and_missing_orjson_falls_back(monkeypatch):
+    flask_app = Flask(__name__)
+    flask_app.config['JSON_PROVIDER'] = 'ujson'
+    with pytest.raises(ValueError, match='JSON_PROVIDER must be one of: default, orjson'):
+        init_json(flask_app)
+
+    monkeypatch.setattr(json_provider, 'orjson', None)
+    flask_app.config['JSON_PROVIDER'] = 'orjson'
+    init_json(flask_app)
+    assert type(flask_app.json) is IsoJSONProvider
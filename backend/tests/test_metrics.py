@@ -0,0 +1,54 @@
+import io
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app import app
+
+
+@pytest.fixture(autouse=True)
+def in_process_registry(monkeypatch):
+    # Loading gunicorn.conf.py in other tests points metrics at a shared directory
+    monkeypatch.delenv('PROMETHEUS_MULTIPROC_DIR', raising=False)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_timed_by_route_with_their_sql_queries(client):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    endpoint = '/api/applications/<int:app_id>'
+    labels = {'method': 'GET', 'endpoint': endpoint, 'status': '200'}
+    requests = sample('http_request_duration_seconds_count', **labels)
+    queries = sample('http_request_sql_queries_sum', endpoint=endpoint)
+
+    assert client.get(f'/api/applications/{app_id}').status_code == 200
+    assert sample('http_request_duration_seconds_count', **labels) == requests + 1
+    assert sample('http_request_sql_queries_sum', endpoint=endpoint) >= queries + 2
+
+    response = app.test_client().get('/api/metrics')
+    assert response.status_code == 200
+    assert f'http_request_duration_seconds_count{{endpoint="{endpoint}",method="GET",status="200"}}' in response.get_data(as_text=True)
+
+
+def test_unmatched_and_failed_requests_share_bounded_labels(client):
+    labels = {'method': 'GET', 'endpoint': 'unmatched', 'status': '404'}
+    before = sample('http_request_duration_seconds_count', **labels)
+    client.get('/api/no-such-route/1')
+    client.get('/api/no-such-route/2')
+    assert sample('http_request_duration_seconds_count', **labels) == before + 2
+
+    unauthorized = {'method': 'GET', 'endpoint': '/api/stats', 'status': '401'}
+    before = sample('http_request_duration_seconds_count', **unauthorized)
+    app.test_client().get('/api/stats')
+    assert sample('http_request_duration_seconds_count', **unauthorized) == before + 1
+
+
+def test_document_bytes_are_counted(client):
+    before = sample('document_transfer_bytes_total', direction='download')
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    client.post(f'/api/applications/{app_id}/resume', data={'file': (io.BytesIO(b'%PDF-1.4 tiny'), 'cv.pdf')},
+                content_type='multipart/form-data')
+    assert client.get(f'/api/applications/{app_id}/resume').status_code == 200
+    assert sample('document_transfer_bytes_total', direction='download') == before + len(b'%PDF-1.4 tiny')
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import IntegrityError
+
+from app import app, migrate
+from app.database import db
+from app.migrate import MIGRATION_LOCK_ID, available_migrations, run_migrations, schema_version
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def exec_driver_sql(self, sql):
+        self.statements.append(sql)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def test_timeouts_are_lifted_before_locking_and_restored(monkeypatch):
+    connection = RecordingConnection()
+    engine = SimpleNamespace(dialect=SimpleNamespace(name='postgresql'), connect=lambda: connection)
+    monkeypatch.setattr(migrate, 'db', SimpleNamespace(engine=engine))
+
+    def stop(conn):
+        raise RuntimeError('stop after locking')
+    monkeypatch.setattr(migrate, 'inspect', stop)
+
+    with pytest.raises(RuntimeError):
+        run_migrations()
+
+    assert connection.statements == [
+        'SET statement_timeout = 0',
+        'SET lock_timeout = 0',
+        f'SELECT pg_advisory_lock({MIGRATION_LOCK_ID})',
+        f'SELECT pg_advisory_unlock({MIGRATION_LOCK_ID})',
+        'RESET statement_timeout',
+        'RESET lock_timeout',
+    ]
+
+
+def test_fresh_database_is_stamped_with_every_migration():
+    with app.app_context():
+        assert run_migrations() == []
+        applied = db.session.execute(select(schema_version.c.version)).scalars().all()
+    assert sorted(applied) == [version for version, _, _ in available_migrations()]
+
+
+def test_migrations_are_ordered_by_number(tmp_path, monkeypatch):
+    for filename in ('v10_later.sql', 'v9_earlier.sql', 'notes.txt', 'v2_draft.sql.bak'):
+        (tmp_path / filename).write_text('')
+    monkeypatch.setattr(migrate, 'MIGRATIONS_DIR', str(tmp_path))
+    assert [(version, name) for version, name, _ in available_migrations()] == [(9, 'earlier'), (10, 'later')]
+
+
+def test_failed_migration_is_rolled_back_and_not_recorded(tmp_path):
+    first, second = tmp_path / 'v1_add_notes.sql', tmp_path / 'v2_broken.sql'
+    first.write_text('CREATE TABLE notes (id INTEGER PRIMARY KEY)')
+    second.write_text('INSERT INTO notes (id) VALUES (1)')
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.sqlite'}")
+    with engine.connect() as conn:
+        schema_version.create(conn)
+        conn.commit()
+        migrate._apply(conn, (1, 'add_notes', str(first)))
+        # Recording the migration fails after its SQL ran
+        with pytest.raises(IntegrityError):
+            migrate._apply(conn, (1, 'broken', str(second)))
+        assert conn.execute(select(schema_version.c.name)).scalars().all() == ['add_notes']
+        assert conn.exec_driver_sql('SELECT count(*) FROM notes').scalar() == 0
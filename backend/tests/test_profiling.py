@@ -0,0 +1,51 @@
+import json
+import pstats
+
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.database import db
+from app.models import User
+
+
+@pytest.fixture
+def profiled_client(tmp_path, monkeypatch, client):
+    """A client of an app built with profiling on, logged in as a profiling admin."""
+    monkeypatch.setattr(Config, 'PROFILE_DIR', str(tmp_path))
+    profiled = create_app()
+    profiled.config['TESTING'] = True
+    with profiled.app_context():
+        email = db.session.get(User, client.user_id).email
+    profiled.config['PROFILE_ADMIN_EMAILS'] = {email}
+    test_client = profiled.test_client()
+    with test_client.session_transaction() as session:
+        session['user_id'] = client.user_id
+    return test_client
+
+
+def test_admin_request_writes_a_profile(profiled_client, tmp_path):
+    response = profiled_client.get('/api/applications', headers={'X-Profile': '1'})
+    assert response.status_code == 200
+    stem = response.headers['X-Profile-Id']
+    assert stem.endswith('ms') and '-GET-api_applications-' in stem
+
+    meta = json.loads((tmp_path / f'{stem}.json').read_text())
+    assert (meta['endpoint'], meta['status'], meta['reason']) == ('/api/applications', 200, 'requested')
+    assert meta['sql_queries'] >= 2
+    functions = pstats.Stats(str(tmp_path / f'{stem}.pstats')).stats
+    assert any(name == 'get_applications' for _, _, name in functions)
+
+
+def test_requests_are_not_profiled_without_admin_or_sampling(profiled_client, make_client, tmp_path):
+    assert 'X-Profile-Id' not in profiled_client.get('/api/applications').headers
+    with profiled_client.session_transaction() as session:
+        session['user_id'] = make_client().user_id
+    assert 'X-Profile-Id' not in profiled_client.get('/api/applications?profile=1').headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sampled_requests_are_profiled(profiled_client, tmp_path):
+    profiled_client.application.config['PROFILE_SAMPLE_RATE'] = 1.0
+    stem = profiled_client.get('/api/health').headers['X-Profile-Id']
+    assert json.loads((tmp_path / f'{stem}.json').read_text())['reason'] == 'sampled'
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app, sync
+from app.config import Config
+from app.database import REPLICA_BIND, db
+from app.models import JobApplication
+from app.replicas import STICKY_KEY
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """An app whose replica bind is a separate SQLite database with the same schema."""
+    monkeypatch.setattr(Config, 'SQLALCHEMY_BINDS', {REPLICA_BIND: f"sqlite:///{tmp_path / 'replica.sqlite'}"})
+    replica_app = create_app()
+    replica_app.config['TESTING'] = True
+    with replica_app.app_context():
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+    return replica_app
+
+
+@pytest.fixture
+def replica_client(replica_app, client):
+    test_client = replica_app.test_client()
+    with test_client.session_transaction() as session:
+        session['user_id'] = client.user_id
+    test_client.user_id = client.user_id
+    return test_client
+
+
+def add_to_replica(replica_app, user_id, company):
+    with replica_app.app_context(), db.engines[REPLICA_BIND].begin() as conn:
+        conn.execute(JobApplication.__table__.insert().values(
+            user_id=user_id, company_name=company, position_title='Engineer', status='Applied'
+        ))
+
+
+def companies(client):
+    return [item['company_name'] for item in client.get('/api/applications').get_json()['items']]
+
+
+def test_reads_use_the_replica_until_the_user_writes(replica_app, replica_client):
+    add_to_replica(replica_app, replica_client.user_id, 'Replicated')
+    assert companies(replica_client) == ['Replicated']
+
+    created = replica_client.post('/api/applications', json={'company_name': 'Written', 'position_title': 'Engineer'})
+    assert created.status_code == 201
+    # The write went to the primary, and the user's reads follow it there
+    assert companies(replica_client) == ['Written']
+
+    with replica_client.session_transaction() as session:
+        session[STICKY_KEY] = 0
+    assert companies(replica_client) == ['Replicated']
+
+
+def test_unmarked_handlers_and_writes_stay_on_the_primary(replica_app, replica_client):
+    add_to_replica(replica_app, replica_client.user_id, 'Replicated')
+    # The duplicates report is not marked @read_replica
+    assert replica_client.get('/api/applications/duplicates').get_json() == {'groups': []}
+    [replicated_id] = [item['id'] for item in replica_client.get('/api/applications').get_json()['items']]
+    assert replica_client.put(f'/api/applications/{replicated_id}', json={'notes': 'x'}).status_code == 404
+
+
+def test_sync_token_marks_how_far_the_replica_has_replayed(replica_client, monkeypatch):
+    lagging = datetime.utcnow() - timedelta(minutes=5)
+    replica_horizon = sync.replica_horizon
+    monkeypatch.setattr(sync, 'replica_horizon', lambda: lagging)
+    token = replica_client.get('/api/applications').get_json()['sync_token']
+    assert sync.decode_sync_token(token) == lagging
+
+    # A SQLite stand-in has no replay position; the server time is used
+    monkeypatch.setattr(sync, 'replica_horizon', replica_horizon)
+    token = replica_client.get('/api/applications').get_json()['sync_token']
+    assert sync.decode_sync_token(token) > lagging
@@ -0,0 +1,44 @@
+import pytest
+
+
+def create(client, **values):
+    response = client.post('/api/applications', json={'position_title': 'Engineer', **values})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def test_search_matches_text_fields_of_own_applications(client, make_client):
+    by_notes = create(client, company_name='Acme', notes='Met the Kubernetes team')
+    by_company = create(client, company_name='Kubernetes Inc', status='Rejected')
+    create(client, company_name='Other', job_description='Frontend role')
+    make_client().post('/api/applications', json={'company_name': 'Kubernetes', 'position_title': 'Engineer'})
+
+    response = client.get('/api/applications/search?q=kubernetes')
+    assert response.status_code == 200
+    items = response.get_json()['items']
+    assert sorted(item['id'] for item in items) == sorted([by_notes, by_company])
+    # Summaries by default, each with its rank
+    assert 'notes' not in items[0] and 'rank' in items[0]
+
+    filtered = client.get('/api/applications/search?q=kubernetes&status=Rejected').get_json()['items']
+    assert [item['id'] for item in filtered] == [by_company]
+
+
+def test_search_pages_by_offset(client):
+    ids = [create(client, company_name=f'Paged {i}') for i in range(3)]
+    first = client.get('/api/applications/search?q=paged&limit=2').get_json()
+    assert first['next_offset'] == 2
+    second = client.get(f"/api/applications/search?q=paged&limit=2&offset={first['next_offset']}").get_json()
+    assert second['next_offset'] is None
+    assert sorted(item['id'] for item in first['items'] + second['items']) == sorted(ids)
+
+
+@pytest.mark.parametrize('query, error', [
+    ('q=', 'q is required'),
+    ('q=acme&offset=x', 'offset must be an integer'),
+    ('q=acme&fields=salary', 'Unknown fields: salary'),
+])
+def test_search_rejects_bad_parameters(client, query, error):
+    response = client.get(f'/api/applications/search?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import app
+from app.database import db
+from app.models import JobApplication
+from app.sync import encode_sync_token
+
+
+def create(client, company):
+    response = client.post('/api/applications', json={'company_name': company, 'position_title': 'Engineer'})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def test_changes_returns_updates_and_tombstones_since_the_token(client, make_client):
+    create(client, 'Unchanged')
+    edited, deleted = create(client, 'Edited'), create(client, 'Deleted')
+    with app.app_context():
+        # Back-date every row past the overlap window of the token below
+        JobApplication.query.update({'updated_at': datetime.utcnow() - timedelta(minutes=1)})
+        db.session.commit()
+    token = client.get('/api/applications').get_json()['sync_token']
+
+    assert client.put(f'/api/applications/{edited}', json={'notes': 'Called back'}).status_code == 200
+    assert client.delete(f'/api/applications/{deleted}').status_code == 200
+    added = create(client, 'Added')
+    make_client().post('/api/applications', json={'company_name': 'Other', 'position_title': 'Engineer'})
+
+    response = client.get('/api/applications/changes', query_string={'since': token, 'fields': 'notes'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['reset'] is False
+    assert body['changed'] == [{'id': edited, 'notes': 'Called back'}, {'id': added, 'notes': None}]
+    assert body['deleted'] == [deleted]
+    assert body['sync_token']
+
+
+def test_changes_asks_for_a_reload_past_tombstone_retention(client):
+    token = encode_sync_token(datetime.utcnow() - timedelta(days=app.config['SYNC_TOMBSTONE_TTL_DAYS'] + 1))
+    body = client.get('/api/applications/changes', query_string={'since': token}).get_json()
+    assert body['reset'] is True
+    assert 'changed' not in body
+
+
+@pytest.mark.parametrize('query, error', [
+    ('', 'since is required'),
+    ('since=@@@', 'Invalid sync token'),
+])
+def test_changes_rejects_bad_tokens(client, query, error):
+    response = client.get(f'/api/applications/changes?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
@@ -0,0 +1,99 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import app, tasks, worker
+from app.database import db
+from app.models import Task, UploadSession, User
+from app.uploads import temp_path
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """An app context with an empty queue and the test handlers registered."""
+    monkeypatch.setitem(tasks.HANDLERS, 'rename', rename)
+    monkeypatch.setitem(tasks.HANDLERS, 'rename_then_fail', rename_then_fail)
+    with app.app_context():
+        Task.query.delete()
+        db.session.commit()
+        yield
+        db.session.rollback()
+        Task.query.delete()
+        db.session.commit()
+
+
+def rename(user_id, name):
+    db.session.get(User, user_id).name = name
+
+
+def rename_then_fail(user_id, name):
+    rename(user_id, name)
+    db.session.flush()
+    raise RuntimeError('disk full')
+
+
+def user_name(user_id):
+    db.session.expire_all()
+    return db.session.get(User, user_id).name
+
+
+def test_task_runs_once_committed(client, queue):
+    tasks.enqueue('rename', user_id=client.user_id, name='Renamed')
+    tasks.enqueue('rename', run_at=datetime.utcnow() + timedelta(hours=1), user_id=client.user_id, name='Later')
+    db.session.commit()
+
+    assert tasks.run_next() is True
+    assert user_name(client.user_id) == 'Renamed'
+    # The other task is not due yet
+    assert tasks.run_next() is False
+    assert Task.query.count() == 1
+
+
+def test_failed_task_is_rolled_back_and_retried_with_backoff(client, queue, monkeypatch):
+    monkeypatch.setitem(app.config, 'TASK_MAX_ATTEMPTS', 2)
+    monkeypatch.setitem(app.config, 'TASK_RETRY_DELAY', 60)
+    original = user_name(client.user_id)
+    tasks.enqueue('rename_then_fail', user_id=client.user_id, name='Partial')
+    db.session.commit()
+
+    assert tasks.run_next() is True
+    assert user_name(client.user_id) == original
+    task = Task.query.one()
+    assert (task.status, task.attempts) == ('pending', 1)
+    assert 'disk full' in task.last_error
+    assert task.run_at > datetime.utcnow() + timedelta(seconds=50)
+
+    task.run_at = datetime.utcnow()
+    db.session.commit()
+    assert tasks.run_next() is True
+    task = Task.query.one()
+    assert (task.status, task.attempts) == ('failed', 2)
+    assert tasks.run_next() is False
+
+
+def test_schedule_once_skips_pending_duplicates(queue):
+    tasks.schedule_once('sweep_orphans')
+    db.session.commit()
+    tasks.schedule_once('sweep_orphans')
+    db.session.commit()
+    assert Task.query.filter_by(kind='sweep_orphans').count() == 1
+
+
+def test_sweep_removes_expired_uploads_and_reschedules(client, queue):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    upload_id = client.post('/api/uploads', json={
+        'application_id': app_id, 'doc_type': 'resume', 'filename': 'cv.pdf', 'size': 10
+    }).get_json()['upload_id']
+    upload = db.session.get(UploadSession, upload_id)
+    path = temp_path(upload)
+    upload.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    tasks.enqueue('sweep_orphans')
+    db.session.commit()
+
+    assert tasks.HANDLERS['sweep_orphans'] is worker.sweep_orphans
+    assert tasks.run_next() is True
+    assert db.session.get(UploadSession, upload_id) is None
+    assert not os.path.exists(path)
+    [next_sweep] = Task.query.all()
+    assert (next_sweep.kind, next_sweep.run_at > datetime.utcnow()) == ('sweep_orphans', True)
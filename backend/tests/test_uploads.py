@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+import pytest
+
+from app import app
+from app.database import db
+from app.models import UploadSession
+from app.uploads import temp_path
+
+
+@pytest.fixture
+def application_id(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'UPLOAD_CHUNK_SIZE', 4)
+    response = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'})
+    return response.get_json()['id']
+
+
+def start(client, application_id, size, filename='cv.pdf'):
+    return client.post('/api/uploads', json={
+        'application_id': application_id, 'doc_type': 'resume', 'filename': filename, 'size': size
+    })
+
+
+def put_chunk(client, upload_id, offset, data, **headers):
+    return client.put(f'/api/uploads/{upload_id}?offset={offset}', data=data, headers=headers)
+
+
+def test_chunks_in_any_order_are_assembled(client, application_id):
+    content = os.urandom(10)
+    started = start(client, application_id, len(content))
+    assert started.status_code == 201
+    upload = started.get_json()
+    assert (upload['chunks'], upload['missing']) == (3, [0, 1, 2])
+
+    for offset in (8, 0, 0):
+        assert put_chunk(client, upload['upload_id'], offset, content[offset:offset + 4]).status_code == 200
+    assert client.get(f"/api/uploads/{upload['upload_id']}").get_json()['missing'] == [1]
+    chunk = content[4:8]
+    response = put_chunk(client, upload['upload_id'], 4, chunk, **{'X-Chunk-SHA256': hashlib.sha256(chunk).hexdigest()})
+    assert response.get_json() == {'received': 1}
+
+    finalized = client.post(f"/api/uploads/{upload['upload_id']}/finalize")
+    assert finalized.status_code == 200
+    assert finalized.get_json()['resume_filename'] == 'cv.pdf'
+    assert client.get(f'/api/applications/{application_id}/resume').data == content
+    assert client.get(f"/api/uploads/{upload['upload_id']}").status_code == 404
+
+
+def test_finalize_reports_missing_chunks(client, application_id):
+    upload_id = start(client, application_id, 10).get_json()['upload_id']
+    put_chunk(client, upload_id, 0, b'abcd')
+    response = client.post(f'/api/uploads/{upload_id}/finalize')
+    assert response.status_code == 409
+    assert response.get_json()['error'] == 'Missing chunks: [1, 2]'
+
+
+@pytest.mark.parametrize('offset, data, headers, error', [
+    (2, b'abcd', {}, 'offset must be a chunk boundary within the file'),
+    (8, b'abcd', {}, 'Chunk at offset 8 must be 2 bytes'),
+    (0, b'abcd', {'X-Chunk-SHA256': '0' * 64}, 'Chunk checksum mismatch'),
+])
+def test_bad_chunks_are_rejected(client, application_id, offset, data, headers, error):
+    upload_id = start(client, application_id, 10).get_json()['upload_id']
+    response = put_chunk(client, upload_id, offset, data, **headers)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+    assert client.get(f'/api/uploads/{upload_id}').get_json()['received'] == []
+
+
+@pytest.mark.parametrize('payload, error', [
+    ({'size': 0}, 'size must be a positive integer'),
+    ({'filename': 'run.sh'}, 'File type not allowed'),
+    ({'doc_type': 'photo'}, 'doc_type must be one of: resume, cover_letter'),
+])
+def test_start_rejects_bad_requests(client, application_id, payload, error):
+    response = client.post('/api/uploads', json={
+        'application_id': application_id, 'doc_type': 'resume', 'filename': 'cv.pdf', 'size': 10, **payload
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+
+
+def test_uploads_are_private_and_can_be_cancelled(client, make_client, application_id):
+    upload_id = start(client, application_id, 10).get_json()['upload_id']
+    other = make_client()
+    assert other.get(f'/api/uploads/{upload_id}').status_code == 404
+    assert put_chunk(other, upload_id, 0, b'abcd').status_code == 404
+    assert start(other, application_id, 10).status_code == 404
+
+    with app.app_context():
+        path = temp_path(db.session.get(UploadSession, upload_id))
+    assert os.path.exists(path)
+    assert client.delete(f'/api/uploads/{upload_id}').status_code == 200
+    assert not os.path.exists(path)
+    assert client.get(f'/api/uploads/{upload_id}').status_code == 404
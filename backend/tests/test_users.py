@@ -0,0 +1,65 @@
+import pytest
+
+from app import app, users
+from app.database import db
+from app.models import User
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    users._cache.clear()
+    yield
+    users._cache.clear()
+
+
+def rename(user_id, name):
+    with app.app_context():
+        db.session.get(User, user_id).name = name
+        db.session.commit()
+
+
+def me(client):
+    return client.get('/api/auth/me').get_json()
+
+
+def test_profile_is_cached_until_invalidated(client):
+    rename(client.user_id, 'Before')
+    assert me(client)['user']['name'] == 'Before'
+    rename(client.user_id, 'After')
+    assert me(client)['user']['name'] == 'Before'
+
+    users.invalidate_user(client.user_id)
+    assert me(client)['user']['name'] == 'After'
+
+
+def test_cache_is_bounded_and_can_be_disabled(make_client, monkeypatch):
+    monkeypatch.setitem(app.config, 'USER_CACHE_SIZE', 2)
+    clients = [make_client() for _ in range(3)]
+    for client in clients:
+        me(client)
+    assert list(users._cache) == [clients[1].user_id, clients[2].user_id]
+
+    monkeypatch.setitem(app.config, 'USER_CACHE_TTL', 0)
+    users._cache.clear()
+    rename(clients[0].user_id, 'Uncached')
+    assert me(clients[0])['user']['name'] == 'Uncached'
+    assert not users._cache
+
+
+def test_deleted_user_is_logged_out(client):
+    me(client)
+    with app.app_context():
+        db.session.delete(db.session.get(User, client.user_id))
+        db.session.commit()
+    users.invalidate_user(client.user_id)
+    assert me(client) == {'authenticated': False}
+    with client.session_transaction() as session:
+        assert 'user_id' not in session
+
+
+def test_other_users_applications_cannot_be_changed(client, make_client):
+    app_id = client.post('/api/applications', json={'company_name': 'Acme', 'position_title': 'Engineer'}).get_json()['id']
+    other = make_client()
+    assert other.put(f'/api/applications/{app_id}', json={'status': 'Rejected'}).status_code == 404
+    assert other.delete(f'/api/applications/{app_id}').status_code == 404
+    assert client.get(f'/api/applications/{app_id}').get_json()['status'] == 'Applied'
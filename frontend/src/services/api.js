@@ -18,23 +18,182 @@ apiClient.interceptors.response.use(
     }
 )
 
+// Last response body per GET URL, revalidated with If-None-Match
+const etagCache = new Map()
+
+/**
+ * GET that reuses the cached body when the server answers 304 Not Modified
+ */
+async function conditionalGet(url, params = {}) {
+    const key = `${url}?${new URLSearchParams(params)}`
+    const cached = etagCache.get(key)
+    const response = await apiClient.get(url, {
+        params,
+        headers: cached ? { 'If-None-Match': cached.etag } : {},
+        validateStatus: status => (status >= 200 && status < 300) || status === 304
+    })
+    if (response.status === 304 && cached) {
+        return cached.data
+    }
+    if (response.headers.etag) {
+        etagCache.set(key, { etag: response.headers.etag, data: response.data })
+    }
+    return response.data
+}
+
+/**
+ * Hex SHA-256 of a file, or null where Web Crypto is unavailable (non-HTTPS)
+ */
+async function hashFile(file) {
+    if (!window.crypto?.subtle) return null
+    const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer())
+    return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('')
+}
+
+// Chunks sent at once during a resumable upload, and attempts per chunk
+const UPLOAD_CONCURRENCY = 3
+const CHUNK_RETRIES = 3
+
+/**
+ * Find or start the upload session for a file; a session left by an
+ * interrupted attempt is resumed, sending only the chunks it is missing
+ */
+async function openUploadSession(id, docType, file) {
+    const key = `upload:${id}:${docType}:${file.name}:${file.size}:${file.lastModified}`
+    const previous = localStorage.getItem(key)
+    if (previous) {
+        try {
+            const response = await apiClient.get(`/uploads/${previous}`)
+            return { key, session: response.data }
+        } catch (error) {
+            if (error.response?.status !== 404) throw error
+        }
+    }
+    const response = await apiClient.post('/uploads', {
+        application_id: id,
+        doc_type: docType,
+        filename: file.name,
+        size: file.size
+    })
+    localStorage.setItem(key, response.data.upload_id)
+    return { key, session: response.data }
+}
+
+async function sendChunk(uploadId, file, offset, chunkSize) {
+    const body = file.slice(offset, offset + chunkSize)
+    for (let attempt = 1; ; attempt++) {
+        try {
+            await apiClient.put(`/uploads/${uploadId}`, body, {
+                params: { offset },
+                headers: { 'Content-Type': 'application/octet-stream' }
+            })
+            return
+        } catch (error) {
+            // Client errors will not succeed on retry
+            const status = error.response?.status
+            if (attempt >= CHUNK_RETRIES || (status >= 400 && status < 500)) throw error
+        }
+    }
+}
+
+/**
+ * Upload a file in parallel chunks, then have the server assemble it
+ */
+async function uploadChunked(id, docType, file, onProgress) {
+    const { key, session } = await openUploadSession(id, docType, file)
+    const pending = [...session.missing]
+    let done = session.chunks - pending.length
+    onProgress?.(done / session.chunks)
+
+    const worker = async () => {
+        while (pending.length) {
+            const index = pending.shift()
+            await sendChunk(session.upload_id, file, index * session.chunk_size, session.chunk_size)
+            onProgress?.(++done / session.chunks)
+        }
+    }
+    await Promise.all(Array.from({ length: UPLOAD_CONCURRENCY }, worker))
+
+    const response = await apiClient.post(`/uploads/${session.upload_id}/finalize`)
+    localStorage.removeItem(key)
+    return response.data
+}
+
+/**
+ * Attach a document, skipping the upload when the server already stores
+ * identical content for this user
+ */
+async function uploadDocument(id, docType, file, onProgress) {
+    const sha256 = await hashFile(file)
+    if (sha256) {
+        try {
+            const response = await apiClient.post(`/applications/${id}/${docType}/reuse`, {
+                sha256,
+                filename: file.name
+            })
+            onProgress?.(1)
+            return response.data
+        } catch (error) {
+            if (error.response?.status !== 404) throw error
+        }
+    }
+
+    return uploadChunked(id, docType.replace('-', '_'), file, onProgress)
+}
+
 export default {
     /**
-     * Get all job applications
+     * Get one page of job applications
+     * @param {Object} params - filters (status, job_type, job_level, date_from,
+     *   date_to, company), sort, limit, the cursor from the previous page and
+     *   an optional `fields` or `view: 'summary'` projection
+     * @returns {Promise<{items: Array, next_cursor: string|null}>}
      */
-    async getApplications() {
-        const response = await apiClient.get('/applications')
+    async getApplications(params = {}) {
+        return conditionalGet('/applications', params)
+    },
+
+    /**
+     * Bulk import applications from a CSV or NDJSON file
+     * @returns {Promise<{imported: number, failed: number, errors: Array}>}
+     */
+    async importApplications(file) {
+        const format = /\.(nd)?jsonl?$/i.test(file.name) ? 'ndjson' : 'csv'
+        const response = await apiClient.post('/applications/import', file, {
+            params: { format },
+            headers: { 'Content-Type': format === 'csv' ? 'text/csv' : 'application/x-ndjson' },
+            timeout: 0
+        })
         return response.data
     },
 
     /**
-     * Get a single job application by ID
+     * Ranked full-text search over company, position, description and notes
+     * @param {Object} params - `q`, list filters, limit and offset
+     * @returns {Promise<{items: Array, next_offset: number|null}>}
      */
-    async getApplication(id) {
-        const response = await apiClient.get(`/applications/${id}`)
+    async searchApplications(params) {
+        const response = await apiClient.get('/applications/search', { params })
         return response.data
     },
 
+    /**
+     * Get applications changed and ids deleted since a sync token
+     * @returns {Promise<{reset: boolean, changed: Array, deleted: Array, sync_token: string}>}
+     */
+    async getChanges(since, params = {}) {
+        const response = await apiClient.get('/applications/changes', { params: { ...params, since } })
+        return response.data
+    },
+
+    /**
+     * Get a single job application by ID
+     * @param {Object} params - optional `fields` or `view: 'summary'` projection
+     */
+    async getApplication(id, params = {}) {
+        return conditionalGet(`/applications/${id}`, params)
+    },
+
     /**
      * Create a new job application
      */
@@ -59,29 +218,79 @@ export default {
         return response.data
     },
 
-    // --- Document Management ---
+    /**
+     * Get the pipeline summary (counts by status, weekly volume, response rates)
+     */
+    async getStats() {
+        const response = await apiClient.get('/stats')
+        return response.data
+    },
 
-    async uploadResume(id, file) {
-        const formData = new FormData()
-        formData.append('file', file)
-        const response = await apiClient.post(`/applications/${id}/resume`, formData, {
-            headers: { 'Content-Type': 'multipart/form-data' }
-        })
+    /**
+     * Get average and max days spent in each status
+     */
+    async getStageDurations() {
+        const response = await apiClient.get('/stats/stages')
+        return response.data
+    },
+
+    /**
+     * Get the status transitions of one application with time spent in each
+     */
+    async getTimeline(id) {
+        const response = await apiClient.get(`/applications/${id}/timeline`)
+        return response.data
+    },
+
+    /**
+     * Apply one patch to many applications in a single request
+     * @returns {Promise<{ids: Array, missing: Array}>}
+     */
+    async batchUpdate(ids, patch) {
+        const response = await apiClient.post('/applications/batch', { ids, patch })
         return response.data
     },
 
+    /**
+     * Delete many applications in a single request
+     */
+    async batchDelete(ids) {
+        const response = await apiClient.post('/applications/batch', { ids, action: 'delete' })
+        return response.data
+    },
+
+    /**
+     * Open the Server-Sent Events feed of the user's application changes
+     * @param {Function} onChange - called with the event type ('ready', 'created',
+     *   'updated', 'deleted' or 'reset') and its data
+     * @returns {EventSource|null} close() it when done; null if unsupported
+     */
+    subscribeChanges(onChange) {
+        if (!window.EventSource) return null
+        const source = new EventSource('/api/events', { withCredentials: true })
+        for (const type of ['ready', 'created', 'updated', 'deleted', 'reset']) {
+            source.addEventListener(type, event => onChange(type, JSON.parse(event.data || '{}')))
+        }
+        return source
+    },
+
+    // --- Document Management ---
+
+    /**
+     * Upload a resume in resumable chunks
+     * @param {Function} [onProgress] - called with the fraction sent (0..1)
+     */
+    async uploadResume(id, file, onProgress) {
+        return uploadDocument(id, 'resume', file, onProgress)
+    },
+
     async deleteResume(id) {
         const response = await apiClient.delete(`/applications/${id}/resume`)
         return response.data
     },
 
-    async uploadCoverLetter(id, file) {
-        const formData = new FormData()
-        formData.append('file', file)
-        const response = await apiClient.post(`/applications/${id}/cover-letter`, formData, {
-            headers: { 'Content-Type': 'multipart/form-data' }
-        })
-        return response.data
+    async uploadCoverLetter(id, file, onProgress) {
+        return uploadDocument(id, 'cover-letter', file, onProgress)
     },
 
     async deleteCoverLetter(id) {
@@ -89,6 +298,22 @@ export default {
         return response.data
     },
 
+    /**
+     * URL that streams the (filtered) applications as a CSV or NDJSON download
+     */
+    getExportUrl(params = {}, format = 'csv') {
+        const query = new URLSearchParams({ ...params, format })
+        return `/api/applications/export?${query}`
+    },
+
+    /**
+     * List the user's stored documents, most recently used first
+     */
+    async getDocuments() {
+        const response = await apiClient.get('/documents')
+        return response.data
+    },
+
     getResumeUrl(id) {
         return `/api/applications/${id}/resume`
     },
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of list-response encoding and compression.
+
+Compares the ORM + to_dict() + stdlib json path with plain rows + orjson for
+a page of applications, then compression levels on the resulting body.
+Brotli 4 and gzip 6 are Flask-Compress's own defaults, which config.py keeps;
+gzip only serves clients that do not accept br.
+
+    python scripts/bench_json.py --rows 200 --description-size 2000
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import date, datetime
+
+import brotli
+import orjson
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+from app.models import JobApplication  # noqa: E402
+
+
+WORDS = ('python', 'distributed', 'systems', 'team', 'experience', 'cloud', 'postgres', 'latency', 'design',
+         'ownership', 'customers', 'mentor', 'services', 'scale', 'reliability', 'years', 'remote', 'benefits')
+
+
+def description(rng, size):
+    text = []
+    while sum(len(word) + 1 for word in text) < size:
+        text.append(rng.choice(WORDS))
+    return ' '.join(text)[:size]
+
+
+def make_rows(count, description_size):
+    """Synthetic rows in JobApplication.FIELDS order."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        values = {
+            'id': i, 'user_id': 1, 'company_name': f'Company {i}', 'position_title': 'Backend Engineer',
+            'location': 'Remote', 'job_type': 'Full-time', 'job_level': 'Senior',
+            'application_date': date(2024, 1, 1 + i % 28), 'status': 'Interview',
+            'job_description': description(rng, description_size),
+            'notes': 'Referred by a former colleague', 'resume_path': None, 'resume_filename': 'cv.pdf',
+            'cover_letter_path': None, 'cover_letter_filename': None, 'created_at': now, 'updated_at': now,
+        }
+        rows.append(tuple(values[name] for name in JobApplication.FIELDS))
+    return rows
+
+
+def time_per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--description-size', type=int, default=2000)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.description_size)
+    objects = [JobApplication(**dict(zip(JobApplication.FIELDS, row))) for row in rows]
+
+    def orm_stdlib():
+        return json.dumps({'items': [application.to_dict() for application in objects]}).encode()
+
+    def rows_orjson():
+        return orjson.dumps({'items': [dict(zip(JobApplication.FIELDS, row)) for row in rows]})
+
+    assert json.loads(orm_stdlib()) == json.loads(rows_orjson())
+    body = rows_orjson()
+
+    print(f'{args.rows} rows, {len(body) / 1024:.0f} KiB JSON')
+    print('Encoding')
+    baseline = time_per_call(orm_stdlib, args.number)
+    fast = time_per_call(rows_orjson, args.number)
+    print(f'  ORM to_dict + json.dumps   {baseline:8.2f} ms')
+    print(f'  rows + orjson              {fast:8.2f} ms  ({baseline / fast:.1f}x faster)')
+
+    print('Compression')
+    for label, compress in (
+        ('brotli level 4 (default)', lambda: brotli.compress(body, quality=4)),
+        ('brotli level 6', lambda: brotli.compress(body, quality=6)),
+        ('brotli level 1', lambda: brotli.compress(body, quality=1)),
+        ('gzip level 6 (fallback)', lambda: gzip.compress(body, 6)),
+        ('gzip level 1', lambda: gzip.compress(body, 1)),
+    ):
+        size = len(compress())
+        print(f'  {label:<26} {time_per_call(compress, args.number):8.2f} ms  {size / 1024:7.1f} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Benchmark the backend API against a seeded synthetic dataset.
+
+Seeds users, applications (with large job descriptions) and attached
+documents, then times each scenario and writes p50/p95/p99 latency,
+throughput and peak RSS to a JSON file for comparison between commits.
+
+    # In-process through the Flask test client, on a throwaway SQLite database
+    python scripts/benchmark.py --output bench.json
+
+    # Against a running server (same DATABASE_URL and SECRET_KEY), 8 clients
+    python scripts/benchmark.py --url http://localhost:5000 --concurrency 8 \\
+        --server-pid $(pgrep -of 'gunicorn') --output bench.json
+
+    # Compare two runs
+    python scripts/benchmark.py --compare before.json after.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+# Values the frontend offers; statuses come from app.validation.STATUSES
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+JOB_LEVELS = ['Junior', 'Mid', 'Senior', 'Lead']
+# A small pool, so (company, title) repeats as it does for real users and the
+# duplicates report has groups to find
+TITLES = ['Software Engineer', 'Sr. Software Engineer', 'Backend Developer', 'Data Engineer',
+          'Site Reliability Engineer', 'Engineering Manager', 'Product Manager', 'ML Engineer']
+WORDS = ('python flask postgres distributed systems latency kubernetes team ownership '
+         'customer platform reliability design review mentoring roadmap').split()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _status_kb(pid, field):
+    """A /proc/<pid>/status memory field in KiB, or 0 if unreadable."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class PeakRss:
+    """Peak RSS of the measured processes during one scenario, in MB.
+
+    VmHWM is a lifetime high-water mark, so it is reset by writing 5 to
+    /proc/<pid>/clear_refs before the scenario. Where that is not permitted,
+    VmRSS is sampled while the scenario runs instead. The peak is the largest
+    single process: this process, or the largest of a server's workers.
+    """
+
+    def __init__(self, server_pid=None, interval=0.05):
+        self.server_pid = server_pid
+        self.interval = interval
+
+    def pids(self):
+        if self.server_pid is None:
+            return [os.getpid()]
+        pids = [self.server_pid]
+        try:
+            with open(f'/proc/{self.server_pid}/task/{self.server_pid}/children') as f:
+                pids += [int(pid) for pid in f.read().split()]
+        except OSError:
+            pass
+        return pids
+
+    def __enter__(self):
+        self.reset = True
+        for pid in self.pids():
+            try:
+                with open(f'/proc/{pid}/clear_refs', 'w') as f:
+                    f.write('5')
+            except OSError:
+                self.reset = False
+        self.sampled = 0
+        self.stopping = threading.Event()
+        self.sampler = threading.Thread(target=self._sample, daemon=True)
+        self.sampler.start()
+        return self
+
+    def _sample(self):
+        while not self.stopping.wait(self.interval):
+            self.sampled = max([self.sampled] + [_status_kb(pid, 'VmRSS') for pid in self.pids()])
+
+    def __exit__(self, *exc):
+        self.stopping.set()
+        self.sampler.join()
+        peak = self.sampled
+        if self.reset:
+            peak = max([peak] + [_status_kb(pid, 'VmHWM') for pid in self.pids()])
+        self.mb = round(peak / 1024, 1)
+        return False
+
+
+# --- Seeding ---
+
+def seed(app, users, applications, description_size, documents, document_size):
+    """Insert users and applications in bulk; attach a shared pool of documents."""
+    from sqlalchemy import insert
+    from app.database import db
+    from app.models import User, JobApplication, ApplicationStatusEvent
+    from app.documents import store_stream, acquire_document
+    from app.duplicates import fingerprint
+    from app.validation import STATUSES
+
+    rng = random.Random(42)
+    with app.app_context():
+        user_ids = db.session.execute(insert(User).returning(User.id), [
+            {'google_id': f'bench-{datetime.utcnow().timestamp()}-{i}', 'email': f'bench{i}-{rng.random()}@example.com',
+             'name': f'Bench User {i}'}
+            for i in range(users)
+        ]).scalars().all()
+
+        blobs = []
+        for i in range(documents):
+            content = b'%PDF-1.4\n' + rng.randbytes(document_size)
+            blobs.append(store_stream(io.BytesIO(content)))
+
+        today = date.today()
+        for user_id in user_ids:
+            rows = []
+            for i in range(applications):
+                description = ' '.join(rng.choice(WORDS) for _ in range(description_size // 8))
+                company = f'Company {rng.randint(1, 500)}'
+                title = rng.choice(TITLES)
+                rows.append({
+                    'user_id': user_id,
+                    'company_name': company,
+                    'position_title': title,
+                    'fingerprint': fingerprint(company, title),
+                    'location': 'Remote',
+                    'job_type': rng.choice(JOB_TYPES),
+                    'job_level': rng.choice(JOB_LEVELS),
+                    'application_date': today - timedelta(days=rng.randint(0, 365)),
+                    'status': rng.choice(STATUSES),
+                    'job_description': description,
+                    'notes': 'Seeded by scripts/benchmark.py',
+                    'created_at': datetime.utcnow(),
+                    'updated_at': datetime.utcnow(),
+                })
+            inserted = db.session.execute(
+                insert(JobApplication).returning(JobApplication.id, JobApplication.status), rows
+            ).all()
+            db.session.execute(insert(ApplicationStatusEvent), [
+                {'application_id': app_id, 'user_id': user_id, 'from_status': None,
+                 'to_status': status, 'occurred_at': datetime.utcnow()}
+                for app_id, status in inserted
+            ])
+            if blobs:
+                for app_id, _ in inserted[:len(inserted) // 2]:
+                    sha256, size, path = rng.choice(blobs)
+                    document = acquire_document(sha256, size, path)
+                    application = db.session.get(JobApplication, app_id)
+                    application.resume_document_id = document.id
+                    application.resume_path = document.path
+                    application.resume_filename = 'resume.pdf'
+            db.session.commit()
+        return user_ids
+
+
+def pick_ids(app, user_id):
+    from app.database import db
+    from app.models import JobApplication
+    with app.app_context():
+        app_ids = [row.id for row in db.session.query(JobApplication.id).filter_by(user_id=user_id)]
+        with_resume = [row.id for row in db.session.query(JobApplication.id).filter(
+            JobApplication.user_id == user_id, JobApplication.resume_path.isnot(None))]
+    return app_ids, with_resume
+
+
+# --- Scenarios ---
+
+def scenarios(app_ids, with_resume):
+    """(name, method, path factory, upload body) for each benchmarked endpoint."""
+    from app.validation import STATUSES as statuses
+    rng = random.Random(7)
+    upload_body = b'%PDF-1.4\n' + rng.randbytes(256 * 1024)
+    return [
+        ('list_page', 'GET', lambda: '/api/applications?limit=50', None),
+        ('list_summary', 'GET', lambda: '/api/applications?limit=200&view=summary', None),
+        ('get_application', 'GET', lambda: f'/api/applications/{rng.choice(app_ids)}', None),
+        ('list_filtered', 'GET', lambda: f'/api/applications?limit=50&status={rng.choice(statuses)}', None),
+        ('search', 'GET', lambda: f'/api/applications/search?q={rng.choice(WORDS)}', None),
+        ('duplicates', 'GET', lambda: '/api/applications/duplicates', None),
+        ('stats', 'GET', lambda: '/api/stats', None),
+        ('stage_durations', 'GET', lambda: '/api/stats/stages', None),
+        ('export_csv', 'GET', lambda: '/api/applications/export?format=csv', None),
+        ('download_resume', 'GET', lambda: f'/api/applications/{rng.choice(with_resume)}/resume', None),
+        ('upload_resume', 'POST', lambda: f'/api/applications/{rng.choice(app_ids)}/resume', upload_body),
+    ]
+
+
+class ClientDriver:
+    """Runs requests in-process through the Flask test client."""
+
+    def __init__(self, app, user_id):
+        self.local = threading.local()
+        self.app = app
+        self.user_id = user_id
+
+    def client(self):
+        if not hasattr(self.local, 'client'):
+            self.local.client = self.app.test_client()
+            with self.local.client.session_transaction() as sess:
+                sess['user_id'] = self.user_id
+        return self.local.client
+
+    def request(self, method, path, body):
+        client = self.client()
+        if body is None:
+            response = client.open(path, method=method)
+        else:
+            response = client.open(path, method=method, data={'file': (io.BytesIO(body), 'bench.pdf')})
+        response.get_data()
+        return response.status_code
+
+
+class HttpDriver:
+    """Runs requests against a live server with a signed session cookie."""
+
+    def __init__(self, app, user_id, url):
+        self.url = url.rstrip('/')
+        serializer = app.session_interface.get_signing_serializer(app)
+        self.cookie = f"{app.config['SESSION_COOKIE_NAME']}={serializer.dumps({'user_id': user_id})}"
+
+    def request(self, method, path, body):
+        headers = {'Cookie': self.cookie}
+        data = None
+        if body is not None:
+            boundary = 'benchboundary'
+            data = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="bench.pdf"\r\n'
+                    f'Content-Type: application/pdf\r\n\r\n').encode() + body + f'\r\n--{boundary}--\r\n'.encode()
+            headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+        req = urllib.request.Request(self.url + path, data=data, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def run_scenario(driver, method, make_path, body, requests, concurrency):
+    def one(_):
+        path = make_path()
+        started = time.perf_counter()
+        try:
+            status = driver.request(method, path, body)
+        except OSError:
+            status = None
+        return time.perf_counter() - started, status is not None and status < 400
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, ok in results if ok)
+    summary = {'requests': requests, 'errors': requests - len(latencies),
+               'throughput_rps': round(len(latencies) / elapsed, 2)}
+    if latencies:
+        summary.update(
+            p50_ms=round(statistics.median(latencies) * 1000, 3),
+            p95_ms=round(percentile(latencies, 0.95) * 1000, 3),
+            p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+        )
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- Comparison ---
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    for label, report in (('before', before), ('after', after)):
+        meta = report['meta']
+        print(f"{label}: commit {meta['commit']}, {meta['mode']} on {meta['database']}, concurrency {meta['concurrency']}")
+    print(f"{'scenario':<18}{'metric':<16}{'before':>12}{'after':>12}{'change':>10}")
+    for name, result in after['results'].items():
+        old = before['results'].get(name)
+        if not old:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'peak_rss_mb'):
+            if metric in old and metric in result and old[metric]:
+                change = (result[metric] - old[metric]) / old[metric] * 100
+                print(f'{name:<18}{metric:<16}{old[metric]:>12}{result[metric]:>12}{change:>+9.1f}%')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--applications', type=int, default=500, help='per user')
+    parser.add_argument('--description-size', type=int, default=4000, help='job_description bytes')
+    parser.add_argument('--documents', type=int, default=20, help='distinct attached files')
+    parser.add_argument('--document-size', type=int, default=200 * 1024)
+    parser.add_argument('--requests', type=int, default=200, help='per scenario')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--url', help='benchmark a running server instead of the test client')
+    parser.add_argument('--server-pid', type=int, help='gunicorn master pid, for server peak RSS')
+    parser.add_argument('--only', help='comma-separated scenario names')
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if not os.environ.get('DATABASE_URL') and not args.url:
+        scratch = tempfile.mkdtemp(prefix='bench-')
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(scratch, 'bench.sqlite')}"
+        os.environ.setdefault('UPLOAD_DIR', os.path.join(scratch, 'uploads'))
+    os.environ.setdefault('FLASK_ENV', 'production')
+    sys.path.insert(0, BACKEND_DIR)
+    from app import app
+    from app.database import db
+    from app.migrate import run_migrations
+
+    with app.app_context():
+        run_migrations()
+        dialect = db.engine.dialect.name
+
+    started = time.perf_counter()
+    user_ids = seed(app, args.users, args.applications, args.description_size, args.documents, args.document_size)
+    seed_seconds = time.perf_counter() - started
+    print(f'Seeded {args.users} users x {args.applications} applications in {seed_seconds:.1f}s ({dialect})')
+
+    app_ids, with_resume = pick_ids(app, user_ids[0])
+    driver = HttpDriver(app, user_ids[0], args.url) if args.url else ClientDriver(app, user_ids[0])
+    only = set(args.only.split(',')) if args.only else None
+
+    results = {}
+    for name, method, make_path, body in scenarios(app_ids, with_resume):
+        if only and name not in only:
+            continue
+        if name == 'download_resume' and not with_resume:
+            continue
+        with PeakRss(args.server_pid if args.url else None) as rss:
+            result = run_scenario(driver, method, make_path, body, args.requests, args.concurrency)
+        result['peak_rss_mb'] = rss.mb
+        results[name] = result
+        print(f"{name:<18} p50 {result.get('p50_ms', '-'):>9} ms  p95 {result.get('p95_ms', '-'):>9} ms  "
+              f"p99 {result.get('p99_ms', '-'):>9} ms  {result['throughput_rps']:>8} req/s  "
+              f"rss {result['peak_rss_mb']} MB  errors {result['errors']}")
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'database': dialect,
+            'mode': 'http' if args.url else 'test_client',
+            'concurrency': args.concurrency,
+            'requests_per_scenario': args.requests,
+            'seed': {
+                'users': args.users, 'applications_per_user': args.applications,
+                'description_size': args.description_size, 'documents': args.documents,
+                'document_size': args.document_size, 'seconds': round(seed_seconds, 2),
+            },
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Measure how slow clients affect cheap requests.
+
+Opens --slow connections that send their request a few bytes per second, as
+an upload over a poor link would, and meanwhile times --requests calls to a
+cheap JSON endpoint from --concurrency threads. With sync workers the slow
+connections pin every process and the cheap requests queue or time out; with
+gthread or gevent workers they keep answering.
+
+    python scripts/loadtest.py --url http://localhost:5000 --slow 8
+
+Compare worker modes by restarting the backend with GUNICORN_WORKER_CLASS set
+to sync, gthread and gevent.
+"""
+import argparse
+import socket
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def slow_client(host, port, stop, interval):
+    """Hold a connection open by trickling request headers until `stop` is set."""
+    try:
+        sock = socket.create_connection((host, port), timeout=5)
+    except OSError:
+        return
+    try:
+        sock.sendall(b'POST /api/health HTTP/1.1\r\nHost: loadtest\r\n')
+        count = 0
+        while not stop.is_set():
+            sock.sendall(b'X-Trickle-%d: 1\r\n' % count)
+            count += 1
+            stop.wait(interval)
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+
+def timed_get(url, timeout):
+    """Return the latency of one GET in seconds, or None on error/timeout."""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+    except OSError:
+        return None
+    return time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--path', default='/api/health', help='cheap endpoint to time')
+    parser.add_argument('--slow', type=int, default=8, help='slow connections held open')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--timeout', type=float, default=5.0)
+    parser.add_argument('--trickle-interval', type=float, default=0.5)
+    args = parser.parse_args()
+
+    target = urlsplit(args.url)
+    stop = threading.Event()
+    slow_threads = [
+        threading.Thread(
+            target=slow_client,
+            args=(target.hostname, target.port or 80, stop, args.trickle_interval),
+            daemon=True
+        )
+        for _ in range(args.slow)
+    ]
+    for thread in slow_threads:
+        thread.start()
+    # Let the slow connections reach the workers
+    time.sleep(1)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(
+            lambda _: timed_get(args.url + args.path, args.timeout), range(args.requests)
+        ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+
+    latencies = sorted(r for r in results if r is not None)
+    failed = len(results) - len(latencies)
+    print(f'slow connections: {args.slow}')
+    print(f'requests: {len(results)}  failed/timed out: {failed}  throughput: {len(latencies) / elapsed:.1f} req/s')
+    if latencies:
+        print(
+            f'latency ms  p50: {statistics.median(latencies) * 1000:.1f}  '
+            f'p95: {percentile(latencies, 0.95) * 1000:.1f}  max: {latencies[-1] * 1000:.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
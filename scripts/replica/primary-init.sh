@@ -0,0 +1,14 @@
+#!/bin/sh
+# Allow streaming replication from the compose network. Runs from
+# /docker-entrypoint-initdb.d on a fresh primary; for an existing volume run
+#   docker compose exec postgres sh /docker-entrypoint-initdb.d/replication.sh
+set -e
+
+psql -v ON_ERROR_STOP=1 -v password="$POSTGRES_PASSWORD" -U "$POSTGRES_USER" -d "$POSTGRES_DB" <<'SQL'
+SELECT format('CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD %L', :'password')
+WHERE NOT EXISTS (SELECT FROM pg_roles WHERE rolname = 'replicator') \gexec
+SQL
+
+grep -q '^host replication replicator' "$PGDATA/pg_hba.conf" || \
+    echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
+psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -c "SELECT pg_reload_conf()"
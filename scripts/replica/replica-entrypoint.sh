@@ -0,0 +1,14 @@
+#!/bin/sh
+# Clone the primary on first start, then run as a read-only hot standby
+set -e
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until PGPASSWORD="$POSTGRES_PASSWORD" pg_basebackup -h postgres -U replicator -D "$PGDATA" -R -X stream; do
+        echo "Waiting for the primary..."
+        rm -rf "${PGDATA:?}"/*
+        sleep 2
+    done
+    chmod 700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on